@@ -0,0 +1,54 @@
+"""
+Benchmark scraping ulang dengan ResponseCache: run pertama (cache kosong)
+vs run berikutnya terhadap katalog yang tidak berubah (304 + hasil parsing
+dari cache).
+
+Contoh:
+    python -m benchmark.bench_cache --pages 50 --workers 8 --parser html.parser
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmark.fixture_server import serve_catalog
+from utils.cache import ResponseCache
+from utils.extract import scrape_web
+
+
+def timed_scrape(base_url, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = scrape_web(base_url, delay=0, **kwargs)
+    return data, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--cards', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='latensi server per request (detik)')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--parser', default=None, help='backend parser HTML')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir, \
+            ResponseCache(os.path.join(tmpdir, 'cache.sqlite')) as cache, \
+            serve_catalog(args.pages, args.cards, latency=args.latency) as server:
+        uncached, base_time = timed_scrape(server['base_url'], workers=args.workers, parser=args.parser)
+        cold, cold_time = timed_scrape(server['base_url'], workers=args.workers, parser=args.parser, cache=cache)
+        warm, warm_time = timed_scrape(server['base_url'], workers=args.workers, parser=args.parser, cache=cache)
+        not_modified = server['catalog']['not_modified']
+
+    assert uncached == cold == warm, "Hasil scraping dengan cache berbeda"
+    print(f"Halaman: {args.pages}, kartu: {len(warm)}, latensi: {args.latency}s, workers: {args.workers}")
+    print(f"Tanpa cache          : {base_time:8.3f} s")
+    print(f"Cache kosong         : {cold_time:8.3f} s")
+    print(f"Cache hangat         : {warm_time:8.3f} s  ({base_time / warm_time:.1f}x)")
+    print(f"Respons 304          : {not_modified}, hasil parsing dari cache: {cache.stats['parsed_hits']}")
+
+
+if __name__ == '__main__':
+    main()
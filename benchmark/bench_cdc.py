@@ -0,0 +1,89 @@
+"""
+Benchmark diff snapshot CDC (hash kunci + digest baris) vs perbandingan
+seluruh frame (merge pada kunci lalu bandingkan setiap kolom).
+
+Contoh:
+    python -m benchmark.bench_cdc --rows 1000000 2000000 --change-share 0.01
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmark.synthetic import GENDERS, SIZES
+from utils.cdc import diff_snapshots, with_digests
+
+
+def snapshot(rows, seed=0):
+    """Snapshot bersih sintetis dengan judul unik."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'title': pd.array('Product ' + pd.Series(np.arange(rows)).astype(str), dtype='string'),
+        'price': np.round(rng.uniform(1, 500, rows), 2) * 16000,
+        'rating': np.round(rng.uniform(1, 5, rows), 1),
+        'colors': rng.integers(1, 9, rows),
+        'size': pd.array(SIZES[rng.integers(0, len(SIZES), rows)], dtype='string'),
+        'gender': pd.Categorical(GENDERS[rng.integers(0, len(GENDERS), rows)]),
+        'scrape_timestamp': pd.Timestamp('2024-01-01 08:00'),
+    })
+
+
+def next_run(previous, change_share, seed=1):
+    """Run berikutnya: sebagian harga berubah, sebagian produk hilang dan baru."""
+    rng = np.random.default_rng(seed)
+    rows = len(previous)
+    changed = max(1, int(rows * change_share))
+    current = previous.iloc[changed // 2:].copy()
+    updated = rng.choice(len(current), changed, replace=False)
+    current.iloc[updated, current.columns.get_loc('price')] += 1000
+    new = snapshot(changed // 2, seed=seed).assign(
+        title=pd.array('New ' + pd.Series(np.arange(changed // 2)).astype(str), dtype='string'))
+    current = pd.concat([current, new], ignore_index=True)
+    current['scrape_timestamp'] = pd.Timestamp('2024-01-02 08:00')
+    return current, changed
+
+
+def full_frame_diff(previous, current, key='title', exclude=('scrape_timestamp',)):
+    """Pembanding naif: outer merge pada kunci lalu bandingkan setiap kolom isi."""
+    columns = [col for col in previous.columns if col != key and col not in exclude]
+    merged = previous.merge(current, on=key, how='outer', suffixes=('_old', '_new'), indicator=True)
+    both = merged[merged['_merge'] == 'both']
+    changed = np.zeros(len(both), dtype=bool)
+    for col in columns:
+        old, new = both[f'{col}_old'].astype(object), both[f'{col}_new'].astype(object)
+        changed |= ~((old == new) | (old.isna() & new.isna())).to_numpy(dtype=bool)
+    return (merged['_merge'] == 'right_only').sum(), int(changed.sum()), (merged['_merge'] == 'left_only').sum()
+
+
+def timed(func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func()
+        return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000])
+    parser.add_argument('--change-share', type=float, default=0.01, help='porsi baris yang berubah per run')
+    args = parser.parse_args()
+
+    print(f"{'baris':>12}{'perubahan':>12}{'digest (s)':>12}{'diff (s)':>10}{'full frame (s)':>16}")
+    for rows in args.rows:
+        previous = snapshot(rows)
+        current, changed = next_run(previous, args.change_share)
+        # Snapshot tersimpan sudah membawa hash kunci dan digest (SnapshotStore.save)
+        stored, digest_time = timed(lambda: with_digests(previous, ['title']))
+
+        changes, diff_time = timed(lambda: diff_snapshots(stored, current))
+        naive, naive_time = timed(lambda: full_frame_diff(previous, current))
+        assert (len(changes.inserts), len(changes.updates), len(changes.deletes)) == naive
+
+        print(f"{rows:>12,}{changed:>12,}{digest_time:>12.2f}{diff_time:>10.2f}{naive_time:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
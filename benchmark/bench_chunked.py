@@ -0,0 +1,80 @@
+"""
+Puncak memori (RSS) dan waktu: membaca CSV mentah sekaligus lalu
+cleanDataFrame vs transform_csv_chunked. Setiap kasus dijalankan di proses
+terpisah agar puncak RSS-nya tidak saling memengaruhi.
+
+Contoh:
+    python -m benchmark.bench_chunked --rows 2000000 --chunksize 100000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmark.synthetic import generate_raw_frame
+from utils.chunked import transform_csv_chunked
+from utils.transform import cleanDataFrame
+
+
+def write_raw_csv(path, rows, batch=250_000):
+    """Menulis CSV mentah per batch agar pembuatan input juga tidak memakan RAM besar."""
+    for start in range(0, rows, batch):
+        frame = generate_raw_frame(min(batch, rows - start), seed=start)
+        frame['title'] = frame['title'] + f'-{start}'
+        frame.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def run_case(case, input_path, output_path, chunksize):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if case == 'in-memory':
+            df = pd.read_csv(input_path, dtype=str, keep_default_na=False)
+            cleanDataFrame(df)
+            df.to_csv(output_path, index=False)
+            rows = len(df)
+        else:
+            rows = transform_csv_chunked(input_path, output_path, chunksize=chunksize)['rows_out']
+    elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'seconds': elapsed, 'peak_mib': peak_kib / 1024, 'rows': rows}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--case', choices=['in-memory', 'chunked'], help=argparse.SUPPRESS)
+    parser.add_argument('--input', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.input, args.output, args.chunksize)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_path = os.path.join(tmpdir, 'raw.csv')
+        write_raw_csv(input_path, args.rows)
+        print(f"{args.rows:,} baris mentah ({os.path.getsize(input_path) / 2**20:.0f} MiB CSV), "
+              f"chunksize {args.chunksize:,}")
+        print(f"{'mode':<12}{'waktu (s)':>10}{'puncak RSS (MiB)':>18}{'baris':>12}")
+        for case in ('in-memory', 'chunked'):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmark.bench_chunked', '--case', case, '--input', input_path,
+                 '--output', os.path.join(tmpdir, f'{case}.csv'), '--chunksize', str(args.chunksize)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{case:<12}{result['seconds']:>10.2f}{result['peak_mib']:>18.0f}{result['rows']:>12,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Membandingkan jalur dict (parse_page -> transform_to_DataFrame -> cleanDataFrame)
+dengan ekstraksi kolumnar (parse_page_with(..., sink=ColumnarBuilder)) pada
+katalog sintetis: waktu dan puncak alokasi memori.
+
+Contoh:
+    python -m benchmark.bench_columnar --pages 500 --cards 20 --parser selectolax
+"""
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmark.fixture_server import generate_catalog
+from utils.columnar import ColumnarBuilder
+from utils.parser import get_backend, parse_page_with
+from utils.transform import cleanDataFrame, transform_to_DataFrame
+
+
+def dict_path(pages, backend, timestamp):
+    records = [record for content in pages for record in parse_page_with(content, backend)['records']]
+    return cleanDataFrame(transform_to_DataFrame(records), timestamp=timestamp)
+
+
+def columnar_path(pages, backend, timestamp):
+    builder = ColumnarBuilder()
+    for content in pages:
+        parse_page_with(content, backend, sink=builder)
+    return builder.to_frame(timestamp)
+
+
+def measure(func, *args, repeat=3):
+    """Waktu terbaik dari 'repeat' kali, lalu puncak memori pada run terpisah di bawah tracemalloc."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        elapsed = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(*args)
+            duration = time.perf_counter() - start
+            elapsed = duration if elapsed is None else min(elapsed, duration)
+
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--cards', type=int, default=20)
+    parser.add_argument('--bad-share', type=float, default=0.05)
+    parser.add_argument('--parser', default=None, help='backend parser HTML')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    backend = get_backend(args.parser)
+    pages = list(generate_catalog(args.pages, args.cards, bad_share=args.bad_share).values())
+    timestamp = pd.Timestamp.now()
+
+    expected, dict_time, dict_peak = measure(dict_path, pages, backend, timestamp, repeat=args.repeat)
+    result, col_time, col_peak = measure(columnar_path, pages, backend, timestamp, repeat=args.repeat)
+    pd.testing.assert_frame_equal(result, expected)
+
+    print(f"{args.pages * args.cards:,} kartu, backend {backend}")
+    print(f"{'jalur':<12}{'waktu (s)':>10}{'puncak (MiB)':>14}")
+    print(f"{'dict':<12}{dict_time:>10.3f}{dict_peak / 2**20:>14.2f}")
+    print(f"{'kolumnar':<12}{col_time:>10.3f}{col_peak / 2**20:>14.2f}  "
+          f"({dict_time / col_time:.2f}x, memori {col_peak / dict_peak:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark konversi harga multi-mata uang: lookup kurs per baris vs satu
+perkalian vektor lewat kode kategori, dan pembacaan file kurs per batch vs
+RateTable ber-cache TTL.
+
+Contoh:
+    python -m benchmark.bench_currency --rows 1000000 --batches 200
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.currency import RateTable, convert_amounts, load_rate_file, parse_price_currency
+
+RATES = {'USD': 16000, 'EUR': 17500, 'GBP': 20500, 'SGD': 12000, 'MYR': 3500}
+SYMBOLS = np.array(['$', '€', '£', 'S$', 'RM', 'Rp '])
+
+
+def generate_prices(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    symbols = pd.Series(SYMBOLS[rng.integers(0, len(SYMBOLS), rows)])
+    amounts = pd.Series(np.round(rng.uniform(1, 500, rows), 2)).astype(str)
+    return symbols + amounts
+
+
+def timed(func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func()
+        return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batches', type=int, default=200, help='jumlah batch untuk benchmark lookup kurs')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rate_path = os.path.join(tmpdir, 'rates.json')
+        with open(rate_path, 'w', encoding='utf-8') as f:
+            json.dump({'base': 'IDR', 'rates': RATES}, f)
+        table = RateTable(rate_path, ttl=3600)
+        rates = table.rates()
+
+        prices = generate_prices(args.rows)
+        (amount, currency), parse_time = timed(lambda: parse_price_currency(prices))
+
+        per_row, per_row_time = timed(lambda: pd.Series(
+            [value * rates.get(code, np.nan) for value, code in zip(amount, currency.astype(str))]
+        ))
+        vectorized, vector_time = timed(lambda: convert_amounts(amount, currency, table))
+        np.testing.assert_allclose(per_row.to_numpy(), vectorized.to_numpy())
+
+        _, file_time = timed(lambda: [load_rate_file(rate_path) for _ in range(args.batches)])
+        _, cached_time = timed(lambda: [table.rates() for _ in range(args.batches)])
+
+    print(f"{args.rows:,} harga, {currency.nunique()} mata uang")
+    print(f"Deteksi mata uang + parsing jumlah : {parse_time:7.3f} s")
+    print(f"Konversi per baris                 : {per_row_time:7.3f} s")
+    print(f"Konversi vektor (kode kategori)    : {vector_time:7.3f} s ({per_row_time / vector_time:.0f}x)")
+    print(f"Kurs untuk {args.batches} batch: baca file {file_time * 1000:.1f} ms, "
+          f"RateTable ber-cache {cached_time * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Biaya pengecekan satu batch terhadap DedupIndex saat riwayat kunci tumbuh.
+Waktu per batch seharusnya hampir datar (lookup B-tree O(log n)), bukan linear.
+
+Contoh:
+    python -m benchmark.bench_dedup --history 1000000 --batch 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.dedup import DedupIndex
+
+
+def titles(start, count):
+    return pd.DataFrame({'title': [f'Product {number}' for number in range(start, start + count)]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--history', type=int, default=1_000_000, help='jumlah kunci akhir di indeks')
+    parser.add_argument('--batch', type=int, default=10_000, help='ukuran batch yang dicek')
+    parser.add_argument('--checkpoints', type=int, default=5, help='jumlah titik pengukuran')
+    args = parser.parse_args()
+
+    sizes = np.unique(np.geomspace(args.batch, args.history, args.checkpoints).astype(int))
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as tmpdir, DedupIndex(os.path.join(tmpdir, 'dedup.sqlite')) as index:
+        loaded = 0
+        print(f"{'riwayat':>12}{'cek batch (ms)':>16}{'per baris (µs)':>16}")
+        for size in sizes:
+            while loaded < size:
+                step = min(100_000, size - loaded)
+                index.add(titles(loaded, step))
+                loaded += step
+
+            # Separuh batch sudah pernah dimuat, separuh baru
+            seen = titles(int(rng.integers(0, loaded - args.batch // 2 + 1)), args.batch // 2)
+            batch = pd.concat([seen, titles(loaded, args.batch - len(seen))], ignore_index=True)
+            start = time.perf_counter()
+            new = index.filter_new(batch, add=False)
+            elapsed = time.perf_counter() - start
+            assert new.sum() == args.batch - len(seen)
+            print(f"{loaded:>12,}{elapsed * 1000:>16.1f}{elapsed / args.batch * 1e6:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
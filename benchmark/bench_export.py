@@ -0,0 +1,72 @@
+"""
+Membandingkan export_to_csv dengan export_to_parquet/export_to_feather:
+waktu tulis, ukuran file, waktu baca kembali dan apakah dtype terjaga.
+
+Contoh:
+    python -m benchmark.bench_export --rows 1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmark.synthetic import generate_raw_frame
+from utils.load import export_to_csv, export_to_feather, export_to_parquet, read_columnar
+from utils.transform import cleanDataFrame
+
+
+def _size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, files in os.walk(path) for name in files)
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = cleanDataFrame(generate_raw_frame(args.rows, duplicate_share=0.0))
+
+    tmpdir = tempfile.mkdtemp()
+    cases = [
+        ('csv', 'out.csv', lambda path: export_to_csv(df, path), pd.read_csv),
+        ('parquet zstd', 'zstd.parquet', lambda path: export_to_parquet(df, path), read_columnar),
+        ('parquet snappy', 'snappy.parquet',
+         lambda path: export_to_parquet(df, path, compression='snappy'), read_columnar),
+        ('parquet per tanggal', 'by_date',
+         lambda path: export_to_parquet(df, path, partition_by=['scrape_date']), read_columnar),
+        ('feather (mmap)', 'plain.arrow', lambda path: export_to_feather(df, path), read_columnar),
+        ('feather lz4', 'lz4.arrow', lambda path: export_to_feather(df, path, compression='lz4'), read_columnar),
+    ]
+
+    print(f"{len(df):,} baris")
+    print(f"{'format':<22}{'tulis (s)':>10}{'ukuran (MiB)':>14}{'baca (s)':>10}  dtype terjaga")
+    try:
+        for name, filename, write, read in cases:
+            path = os.path.join(tmpdir, filename)
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                write(path)
+                write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = read(path)
+            read_time = time.perf_counter() - start
+
+            same_dtypes = all(result[column].dtype == df[column].dtype for column in df.columns)
+            print(f"{name:<22}{write_time:>10.2f}{_size(path) / 2**20:>14.2f}{read_time:>10.2f}  "
+                  f"{'ya' if same_dtypes else 'tidak'}")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
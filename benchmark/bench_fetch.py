@@ -0,0 +1,58 @@
+"""
+Benchmark latensi per halaman: requests.Session baru per request (perilaku
+lama fetching_content) vs HttpFetcher yang memakai ulang koneksi.
+
+Contoh:
+    python -m benchmark.bench_fetch --requests 200
+"""
+import argparse
+import statistics
+import time
+
+import requests
+
+from benchmark.fixture_server import serve_catalog
+from utils.extract import HEADERS, HttpFetcher, build_page_url
+
+
+def fetch_with_new_session(url):
+    session = requests.Session()
+    response = session.get(url, headers=HEADERS, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def measure(fetch, urls):
+    latencies = []
+    for url in urls:
+        start = time.perf_counter()
+        fetch(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(latencies):7.2f} ms | "
+          f"p50 {statistics.median(latencies):7.2f} ms | p95 {p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--pages', type=int, default=50)
+    args = parser.parse_args()
+
+    with serve_catalog(args.pages) as server:
+        urls = [build_page_url(server['base_url'], (i % args.pages) + 1) for i in range(args.requests)]
+        before = measure(fetch_with_new_session, urls)
+        with HttpFetcher() as fetcher:
+            after = measure(fetcher.get, urls)
+
+    report('Session baru/request', before)
+    report('HttpFetcher (pooled)', after)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Microbenchmark parsing halaman katalog per backend (kartu per detik) atas
+halaman fixture yang tersimpan di benchmark/fixtures.
+
+Contoh:
+    python -m benchmark.bench_parse --repeat 20
+"""
+import argparse
+import glob
+import os
+import time
+
+from utils.parser import available_backends, parse_page_with
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture_pages(directory=FIXTURE_DIR):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench_backend(backend, pages, repeat):
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in pages:
+            cards += len(parse_page_with(content, backend)['records'])
+    elapsed = time.perf_counter() - start
+    return cards, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    pages = load_fixture_pages(args.fixtures)
+    reference = [parse_page_with(content, 'html.parser') for content in pages]
+
+    print(f"{len(pages)} halaman fixture x {args.repeat} ulangan")
+    baseline = None
+    for backend in reversed(available_backends()):
+        assert [parse_page_with(content, backend) for content in pages] == reference, \
+            f"Hasil backend {backend} berbeda dengan html.parser"
+        cards, elapsed = bench_backend(backend, pages, args.repeat)
+        rate = cards / elapsed
+        baseline = baseline or rate
+        print(f"{backend:<12} {rate:12,.0f} kartu/detik  ({rate / baseline:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
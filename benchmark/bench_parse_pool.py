@@ -0,0 +1,46 @@
+"""
+Throughput parsing (kartu per detik) ParsePool terhadap jumlah proses,
+memakai halaman fixture di benchmark/fixtures yang diulang menjadi katalog besar.
+
+Contoh:
+    python -m benchmark.bench_parse_pool --pages 400 --workers 1 2 4 8 --parser html.parser
+"""
+import argparse
+import time
+
+from benchmark.bench_parse import FIXTURE_DIR, load_fixture_pages
+from utils.parse_pool import ParsePool
+from utils.parser import parse_page_with
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=400, help='jumlah halaman katalog')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunksize', type=int, default=4)
+    parser.add_argument('--parser', default='html.parser', help='backend parser HTML')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    fixtures = load_fixture_pages(args.fixtures)
+    contents = [fixtures[index % len(fixtures)] for index in range(args.pages)]
+
+    start = time.perf_counter()
+    reference = [parse_page_with(content, args.parser) for content in contents]
+    baseline = sum(len(page['records']) for page in reference) / (time.perf_counter() - start)
+
+    print(f"{args.pages} halaman, backend {args.parser}, chunksize {args.chunksize}")
+    print(f"{'satu proses':<14} {baseline:12,.0f} kartu/detik")
+    for workers in args.workers:
+        with ParsePool(workers=workers, chunksize=args.chunksize, backend=args.parser) as pool:
+            pool.map(contents[:workers])  # memanaskan proses worker
+            start = time.perf_counter()
+            pages = pool.map(contents)
+            elapsed = time.perf_counter() - start
+        assert pages == reference, "Hasil ParsePool berbeda dengan parsing satu proses"
+        rate = sum(len(page['records']) for page in pages) / elapsed
+        print(f"{workers:>2} proses     {rate:12,.0f} kartu/detik  ({rate / baseline:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Membandingkan memori frame produk bersih dengan skema default vs skema
+ringkas (convertToCompactSchema).
+
+Contoh:
+    python -m benchmark.bench_schema --rows 1000000
+"""
+import argparse
+import contextlib
+import io
+
+from benchmark.synthetic import generate_raw_frame
+from utils.transform import cleanDataFrame, convertToCompactSchema
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = cleanDataFrame(generate_raw_frame(args.rows, duplicate_share=0.0))
+    default_usage = df.memory_usage(deep=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        footprint = convertToCompactSchema(df)
+    compact_usage = df.memory_usage(deep=True)
+
+    print(f"{len(df):,} baris")
+    print(f"{'kolom':<18}{'default (MiB)':>15}{'ringkas (MiB)':>15}  dtype")
+    for column in df.columns:
+        print(f"{column:<18}{default_usage[column] / 2**20:>15.2f}{compact_usage[column] / 2**20:>15.2f}  {df[column].dtype}")
+    print(f"{'total':<18}{footprint['before'] / 2**20:>15.2f}{footprint['after'] / 2**20:>15.2f}  "
+          f"({footprint['after'] / footprint['before']:.0%})")
+
+
+if __name__ == '__main__':
+    main()
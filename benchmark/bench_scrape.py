@@ -0,0 +1,60 @@
+"""
+Benchmark scrape_web sekuensial vs paralel terhadap server katalog lokal.
+
+Contoh:
+    python -m benchmark.bench_scrape --pages 50 --latency 0.2 --workers 8
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+from benchmark.fixture_server import serve_catalog
+from utils.async_extract import aiohttp, scrape_web_async
+from utils.extract import scrape_web
+
+
+def timed_scrape(base_url, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = scrape_web(base_url, delay=0, **kwargs)
+    return data, time.perf_counter() - start
+
+
+def timed_scrape_async(base_url, concurrency):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = asyncio.run(scrape_web_async(base_url, concurrency=concurrency))
+    return data, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--cards', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.1, help='latensi server per request (detik)')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    parser.add_argument('--concurrency', type=int, default=100, help='request bersamaan engine async')
+    args = parser.parse_args()
+
+    with serve_catalog(args.pages, args.cards, latency=args.latency) as server:
+        sequential, seq_time = timed_scrape(server['base_url'])
+        concurrent, con_time = timed_scrape(
+            server['base_url'], workers=args.workers, rate_limit=args.rate_limit
+        )
+        if aiohttp is not None:
+            async_data, async_time = timed_scrape_async(server['base_url'], args.concurrency)
+            assert sequential == async_data, "Hasil engine async berbeda dengan mode sekuensial"
+
+    assert sequential == concurrent, "Hasil mode paralel berbeda dengan mode sekuensial"
+    print(f"Halaman: {args.pages}, kartu: {len(sequential)}, latensi: {args.latency}s")
+    print(f"Sekuensial           : {seq_time:8.3f} s")
+    print(f"Paralel ({args.workers:>2} workers) : {con_time:8.3f} s  ({seq_time / con_time:.1f}x)")
+    if aiohttp is not None:
+        print(f"Async ({args.concurrency:>3} in-flight) : {async_time:8.3f} s  ({seq_time / async_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
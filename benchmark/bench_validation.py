@@ -0,0 +1,53 @@
+"""
+Biaya validasi per aturan (ms per juta baris) dan total Validator.validate
+atas hasil cleanDataFrame dari data sintetis.
+
+Contoh:
+    python -m benchmark.bench_validation --rows 1000000 --bad-share 0.05
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmark.synthetic import generate_raw_frame
+from utils.transform import cleanDataFrame
+from utils.validation import DEFAULT_RULES, Validator
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='baris mentah sebelum pembersihan')
+    parser.add_argument('--bad-share', type=float, default=0.05)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = cleanDataFrame(generate_raw_frame(args.rows, bad_share=args.bad_share, duplicate_share=0.0))
+    per_million = 1e6 / len(df) * 1000
+
+    print(f"{len(df):,} baris bersih")
+    print(f"{'aturan':<28}{'ms / juta baris':>16}")
+    for rule in DEFAULT_RULES:
+        _, elapsed = best_of(lambda: Validator([rule]).evaluate(df), args.repeat)
+        print(f"{rule.name:<28}{elapsed * per_million:>16.1f}")
+
+    validator = Validator(DEFAULT_RULES)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result, elapsed = best_of(lambda: validator.validate(df), args.repeat)
+    print(f"{'total validate()':<28}{elapsed * per_million:>16.1f}  "
+          f"({len(result.quarantine):,} baris dikarantina)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Server HTTP lokal yang menyajikan halaman katalog tiruan dengan struktur
+HTML yang sama seperti fashion-studio.dicoding.dev. Dipakai untuk benchmark
+dan unit test tanpa koneksi internet.
+"""
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PRODUCT_TYPES = ['T-shirt', 'Hoodie', 'Pants', 'Outerwear', 'Jacket', 'Shirt']
+SIZES = ['S', 'M', 'L', 'XL', 'XXL']
+GENDERS = ['Men', 'Women', 'Unisex']
+
+
+def render_card(index, rng, bad_share=0.05):
+    """Membuat satu elemen kartu produk; porsi bad_share berupa kartu rusak."""
+    if rng.random() < bad_share:
+        title = 'Unknown Product'
+        price = '<p class="price">Price Unavailable</p>'
+        rating = 'Rating: ⭐ Invalid Rating / 5'
+    else:
+        title = f"{rng.choice(PRODUCT_TYPES)} {index}"
+        price = f'<div class="price-container"><span class="price">${rng.uniform(10, 500):.2f}</span></div>'
+        rating = f"Rating: ⭐ {rng.uniform(1, 5):.1f} / 5"
+
+    return f'''
+        <div class="collection-card">
+            <div style="position: relative;">
+                <img src="https://picsum.photos/280/350?random={index}" class="collection-image" alt="{title}">
+            </div>
+            <div class="product-details">
+                <h3 class="product-title">{title}</h3>
+                {price}
+                <p style="font-size: 14px; color: #777;">{rating}</p>
+                <p style="font-size: 14px; color: #777;">{rng.randint(1, 8)} Colors</p>
+                <p style="font-size: 14px; color: #777;">Size: {rng.choice(SIZES)}</p>
+                <p style="font-size: 14px; color: #777;">Gender: {rng.choice(GENDERS)}</p>
+            </div>
+        </div>'''
+
+
+def render_catalog_page(page_number, total_pages, cards_per_page=20, seed=0, bad_share=0.05):
+    """Membuat HTML satu halaman katalog beserta navigasi pagination."""
+    rng = random.Random(seed * 100003 + page_number)
+    first_index = (page_number - 1) * cards_per_page + 1
+    cards = ''.join(render_card(first_index + i, rng, bad_share) for i in range(cards_per_page))
+
+    def href(number):
+        return '/' if number == 1 else f'/page{number}.html'
+
+    items = []
+    if page_number > 1:
+        items.append(f'<li class="page-item previous"><a class="page-link" href="{href(page_number - 1)}">Previous</a></li>')
+    # Seperti situs aslinya, pagination hanya menampilkan jendela nomor halaman
+    for number in range(max(1, page_number - 2), min(total_pages, page_number + 2) + 1):
+        active = ' active' if number == page_number else ''
+        items.append(f'<li class="page-item{active}"><a class="page-link" href="{href(number)}">{number}</a></li>')
+    if page_number < total_pages:
+        items.append(f'<li class="page-item next"><a class="page-link" href="{href(page_number + 1)}">Next</a></li>')
+    else:
+        items.append('<li class="page-item next disabled"><span class="page-link">Next</span></li>')
+
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>Fashion Studio</title></head>
+<body>
+    <div class="container">
+        <div id="collectionList" class="collection-grid">{cards}
+        </div>
+        <ul class="pagination">{''.join(items)}</ul>
+    </div>
+</body>
+</html>'''
+
+
+def render_not_found_page():
+    return '<!DOCTYPE html><html><body><h1>404 - Page Not Found</h1></body></html>'
+
+
+class CatalogHandler(BaseHTTPRequestHandler):
+    """Handler yang menyajikan '/', '/pageN.html', dan 404 untuk halaman lain."""
+
+    server_version = 'FixtureCatalog/1.0'
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # keep-alive tanpa jeda delayed-ACK
+
+    def do_GET(self):
+        catalog = self.server.catalog
+        if catalog['latency']:
+            time.sleep(catalog['latency'])
+
+        page_number = None
+        if self.path == '/':
+            page_number = 1
+        elif self.path.startswith('/page') and self.path.endswith('.html'):
+            number = self.path[len('/page'):-len('.html')]
+            page_number = int(number) if number.isdigit() else None
+
+        with catalog['lock']:
+            catalog['requests'] += 1
+            failures_left = catalog['failures'].get(page_number, 0)
+            if failures_left:
+                catalog['failures'][page_number] = failures_left - 1
+
+        etag = None
+        if failures_left:
+            status = 503
+            body = b'Service Unavailable'
+        elif page_number and 1 <= page_number <= catalog['total_pages']:
+            status = 200
+            body = catalog['pages'][page_number]
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        else:
+            status = 404
+            body = render_not_found_page().encode('utf-8')
+
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            with catalog['lock']:
+                catalog['not_modified'] += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def generate_catalog(total_pages=50, cards_per_page=20, seed=0, bad_share=0.05):
+    """HTML (bytes) seluruh halaman katalog sintetis, dipetakan per nomor halaman."""
+    return {
+        number: render_catalog_page(number, total_pages, cards_per_page, seed, bad_share).encode('utf-8')
+        for number in range(1, total_pages + 1)
+    }
+
+
+@contextmanager
+def serve_catalog(total_pages=50, cards_per_page=20, latency=0.0, seed=0, failures=None, bad_share=0.05):
+    """
+    Menjalankan server katalog lokal pada port acak di thread terpisah.
+    'failures' memetakan nomor halaman ke jumlah respons 503 sebelum sukses;
+    'bad_share' adalah porsi kartu rusak (Unknown Product/Price Unavailable).
+
+    Yields:
+    - dict berisi 'base_url' (pola URL untuk scrape_web), 'server' dan
+      'catalog' (state server, termasuk jumlah request yang diterima dan
+      jumlah respons 304). Halaman katalog menyertakan ETag dan menjawab
+      If-None-Match yang cocok dengan 304.
+    """
+    catalog = {
+        'total_pages': total_pages,
+        'latency': latency,
+        'requests': 0,
+        'not_modified': 0,
+        'failures': dict(failures or {}),
+        'lock': threading.Lock(),
+        'pages': generate_catalog(total_pages, cards_per_page, seed, bad_share),
+    }
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CatalogHandler)
+    server.daemon_threads = True
+    server.catalog = catalog
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        yield {
+            'base_url': f'http://{host}:{port}/page{{}}.html',
+            'server': server,
+            'catalog': catalog,
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
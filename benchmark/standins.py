@@ -0,0 +1,65 @@
+"""
+Pengganti (stand-in) untuk tujuan load eksternal agar loader bisa diukur dan
+diuji tanpa kredensial maupun koneksi jaringan:
+- InMemoryWorksheet: pengganti gspread.Worksheet untuk sync_worksheet.
+- sqlite_engine: engine SQLAlchemy SQLite pengganti PostgreSQL.
+"""
+from gspread.utils import a1_range_to_grid_range
+from sqlalchemy import create_engine
+
+
+class InMemoryWorksheet:
+    """Worksheet tiruan yang menyimpan grid dan menghitung panggilan API serta sel yang ditulis."""
+
+    def __init__(self, rows=1000, cols=26):
+        self.grid = {}
+        self.row_count = rows
+        self.col_count = cols
+        self.calls = {'get_all_values': 0, 'batch_update': 0, 'batch_clear': 0}
+        self.cells_written = 0
+
+    def get_all_values(self):
+        self.calls['get_all_values'] += 1
+        if not self.grid:
+            return []
+        height = max(row for row, _ in self.grid) + 1
+        width = max(col for _, col in self.grid) + 1
+        values = [[self.grid.get((row, col), '') for col in range(width)] for row in range(height)]
+        while values and not any(values[-1]):
+            values.pop()
+        return values
+
+    def _set(self, row, col, value):
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)  # Sheets menampilkan 150000.0 sebagai 150000
+        if value == '':
+            self.grid.pop((row, col), None)
+        else:
+            self.grid[(row, col)] = str(value)
+
+    def batch_update(self, data, value_input_option=None):
+        self.calls['batch_update'] += 1
+        for item in data:
+            grid = a1_range_to_grid_range(item['range'])
+            for offset, row in enumerate(item['values']):
+                for col_offset, value in enumerate(row):
+                    self._set(grid['startRowIndex'] + offset, grid['startColumnIndex'] + col_offset, value)
+                    self.cells_written += 1
+
+    def batch_clear(self, ranges):
+        self.calls['batch_clear'] += 1
+        for a1 in ranges:
+            grid = a1_range_to_grid_range(a1)
+            for key in [key for key in self.grid if key[0] >= grid['startRowIndex']]:
+                del self.grid[key]
+
+    def add_rows(self, rows):
+        self.row_count += rows
+
+    def add_cols(self, cols):
+        self.col_count += cols
+
+
+def sqlite_engine(path=None):
+    """Engine SQLite (file atau in-memory) untuk write_df_to_sql/upsert_df_to_sql."""
+    return create_engine(f"sqlite:///{path}" if path else "sqlite://")
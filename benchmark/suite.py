@@ -0,0 +1,272 @@
+"""
+Suite benchmark offline yang bisa direproduksi: extract, setiap fungsi
+transform, dan setiap loader, dengan data sintetis dan server katalog lokal.
+Tujuan eksternal diganti stand-in (SQLite untuk PostgreSQL, worksheet
+in-memory untuk Google Sheets). Hasil disimpan sebagai JSON agar run bisa
+dibandingkan.
+
+Contoh:
+    python -m benchmark.suite --pages 50 --cards 20 --rows 200000 --bad-share 0.05
+    python -m benchmark.suite --compare benchmark/results/suite-20240101-080000.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmark.fixture_server import generate_catalog, serve_catalog
+from benchmark.standins import InMemoryWorksheet, sqlite_engine
+from benchmark.synthetic import generate_raw_records
+from utils.extract import parse_page, scrape_web
+from utils.load import (
+    export_to_csv, export_to_feather, export_to_parquet, sync_worksheet, upsert_df_to_sql,
+    write_df_to_sql
+)
+from utils.parser import available_backends
+from utils.pipeline import default_pipeline
+from utils.transform import (
+    addScrapeTimestamp, cleanDataFrame, convertPriceToRupiah,
+    convertToCompactSchema, deleteDuplicate, deletePriceUnavailable, deleteUnknownProduct,
+    transformData, transform_stream, transform_to_DataFrame
+)
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def measure(func, setup=lambda: None, repeat=3):
+    """Waktu terbaik dari 'repeat' kali func(setup()); waktu setup tidak dihitung."""
+    best = None
+    for _ in range(repeat):
+        arg = setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(arg)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _result(group, name, seconds, items, unit):
+    return {
+        'group': group,
+        'name': name,
+        'seconds': round(seconds, 6),
+        'items': items,
+        'unit': unit,
+        'per_second': round(items / seconds, 2) if seconds else None,
+    }
+
+
+def bench_extract(args):
+    results = []
+    with serve_catalog(args.pages, args.cards, latency=args.latency, bad_share=args.bad_share) as server:
+        cards = args.pages * args.cards
+        for workers in (1, args.workers):
+            seconds = measure(lambda _: scrape_web(server['base_url'], delay=0, workers=workers),
+                              repeat=args.repeat)
+            results.append(_result('extract', f'scrape_web[workers={workers}]', seconds, cards, 'kartu'))
+
+    pages = list(generate_catalog(args.pages, args.cards, bad_share=args.bad_share).values())
+    for backend in available_backends():
+        seconds = measure(lambda _: [parse_page(content, backend) for content in pages], repeat=args.repeat)
+        results.append(_result('extract', f'parse_page[{backend}]', seconds, cards, 'kartu'))
+    return results
+
+
+def bench_transform(args):
+    records = generate_raw_records(args.rows, bad_share=args.bad_share)
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Input tiap fungsi adalah keluaran fungsi sebelumnya pada rantai main()
+        raw = transform_to_DataFrame(records)
+        no_unknown = raw.copy()
+        deleteUnknownProduct(no_unknown)
+        filtered = no_unknown.copy()
+        deletePriceUnavailable(filtered)
+        parsed = filtered.copy()
+        transformData(parsed)
+        deduped = parsed.copy()
+        deleteDuplicate(deduped)
+        converted = deduped.copy()
+        convertPriceToRupiah(converted)
+        clean = converted.copy()
+        addScrapeTimestamp(clean)
+
+    rows = len(raw)
+    steps = [
+        ('transform_to_DataFrame', transform_to_DataFrame, lambda: records),
+        ('deleteUnknownProduct', deleteUnknownProduct, raw.copy),
+        ('deletePriceUnavailable', deletePriceUnavailable, no_unknown.copy),
+        ('transformData', transformData, filtered.copy),
+        ('deleteDuplicate', deleteDuplicate, parsed.copy),
+        ('convertPriceToRupiah', convertPriceToRupiah, deduped.copy),
+        ('addScrapeTimestamp', addScrapeTimestamp, converted.copy),
+        # cleanDataFrame mengubah input, TransformPipeline menyalin sendiri:
+        # keduanya diukur termasuk satu salinan input agar sebanding
+        ('cleanDataFrame', lambda df: cleanDataFrame(df.copy()), lambda: raw),
+        ('TransformPipeline', default_pipeline().execute, lambda: raw),
+        ('convertToCompactSchema', convertToCompactSchema, clean.copy),
+    ]
+    results = [_result('transform', name, measure(func, setup, args.repeat), rows, 'baris')
+               for name, func, setup in steps]
+
+    pages = [records[start:start + args.cards] for start in range(0, len(records), args.cards)]
+    seconds = measure(lambda _: list(transform_stream(iter(pages))), repeat=args.repeat)
+    results.append(_result('transform', 'transform_stream', seconds, rows, 'baris'))
+    return results, clean
+
+
+def bench_load(args, clean):
+    df = clean.head(args.load_rows).reset_index(drop=True)
+    rows = len(df)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        def path(name):
+            return os.path.join(tmpdir, name)
+
+        exports = [
+            ('export_to_csv', lambda _: export_to_csv(df, path('out.csv'))),
+            ('export_to_parquet', lambda _: export_to_parquet(df, path('out.parquet'))),
+            ('export_to_feather', lambda _: export_to_feather(df, path('out.arrow'))),
+        ]
+        for name, func in exports:
+            results.append(_result('load', name, measure(func, repeat=args.repeat), rows, 'baris'))
+
+        # SQLite menggantikan PostgreSQL; setiap ulangan memakai database baru
+        counter = iter(range(10 ** 6))
+
+        def fresh_engine():
+            return sqlite_engine(path(f'db{next(counter)}.sqlite'))
+
+        seconds = measure(lambda engine: write_df_to_sql(df, engine, 'produk_fashion', if_exists='replace'),
+                          fresh_engine, args.repeat)
+        results.append(_result('load', 'write_df_to_sql[sqlite]', seconds, rows, 'baris'))
+
+        seconds = measure(lambda engine: upsert_df_to_sql(df, engine, 'produk_fashion'),
+                          fresh_engine, args.repeat)
+        results.append(_result('load', 'upsert_df_to_sql[sqlite]', seconds, rows, 'baris'))
+
+        def populated_engine():
+            engine = fresh_engine()
+            with contextlib.redirect_stdout(io.StringIO()):
+                upsert_df_to_sql(df, engine, 'produk_fashion')
+            return engine
+
+        seconds = measure(lambda engine: upsert_df_to_sql(df, engine, 'produk_fashion'),
+                          populated_engine, args.repeat)
+        results.append(_result('load', 'upsert_df_to_sql[sqlite, tanpa perubahan]', seconds, rows, 'baris'))
+
+    # Worksheet in-memory menggantikan Google Sheets
+    seconds = measure(lambda worksheet: sync_worksheet(worksheet, df), InMemoryWorksheet, args.repeat)
+    results.append(_result('load', 'sync_worksheet[penuh]', seconds, rows, 'baris'))
+
+    def synced_worksheet():
+        worksheet = InMemoryWorksheet()
+        sync_worksheet(worksheet, df)
+        return worksheet
+
+    seconds = measure(lambda worksheet: sync_worksheet(worksheet, df), synced_worksheet, args.repeat)
+    results.append(_result('load', 'sync_worksheet[tanpa perubahan]', seconds, rows, 'baris'))
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold, min_seconds=0.01):
+    """
+    Mencetak rasio waktu terhadap run sebelumnya dan mengembalikan daftar regresi.
+    Benchmark yang lebih cepat dari min_seconds tidak dianggap regresi (noise).
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(item['group'], item['name']): item for item in json.load(f)['results']}
+
+    regressions = []
+    print(f"\nPerbandingan dengan {baseline_path}")
+    for item in results:
+        previous = baseline.get((item['group'], item['name']))
+        if not previous:
+            continue
+        ratio = item['seconds'] / previous['seconds'] if previous['seconds'] else float('inf')
+        regressed = ratio > threshold and item['seconds'] >= min_seconds
+        flag = '  ⚠️ regresi' if regressed else ''
+        print(f"{item['group']:<10}{item['name']:<44}{previous['seconds']:>10.4f}{item['seconds']:>10.4f}"
+              f"{ratio:>8.2f}x{flag}")
+        if regressed:
+            regressions.append(item['name'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=50, help='jumlah halaman katalog')
+    parser.add_argument('--cards', type=int, default=20, help='kartu per halaman')
+    parser.add_argument('--bad-share', type=float, default=0.05, help='porsi baris/kartu rusak')
+    parser.add_argument('--rows', type=int, default=200_000, help='baris mentah untuk benchmark transform')
+    parser.add_argument('--load-rows', type=int, default=20_000, help='baris bersih untuk benchmark loader')
+    parser.add_argument('--latency', type=float, default=0.0, help='latensi server per request (detik)')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=3, help='ulangan per benchmark (diambil yang tercepat)')
+    parser.add_argument('--only', nargs='+', choices=['extract', 'transform', 'load'],
+                        default=['extract', 'transform', 'load'])
+    parser.add_argument('--output', default=None, help='file JSON hasil (default benchmark/results/suite-<waktu>.json)')
+    parser.add_argument('--compare', default=None, help='file JSON run sebelumnya sebagai pembanding')
+    parser.add_argument('--threshold', type=float, default=1.2, help='rasio waktu yang dianggap regresi')
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help='benchmark di bawah durasi ini tidak dinilai regresi')
+    args = parser.parse_args()
+
+    results = []
+    if 'extract' in args.only:
+        results += bench_extract(args)
+    if 'transform' in args.only or 'load' in args.only:
+        transform_results, clean = bench_transform(args)
+        if 'transform' in args.only:
+            results += transform_results
+        if 'load' in args.only:
+            results += bench_load(args, clean)
+
+    print(f"{'grup':<10}{'benchmark':<44}{'detik':>10}{'per detik':>14}")
+    for item in results:
+        print(f"{item['group']:<10}{item['name']:<44}{item['seconds']:>10.4f}"
+              f"{item['per_second']:>14,.0f} {item['unit']}")
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'params': {key: value for key, value in vars(args).items() if key not in ('output', 'compare', 'threshold', 'min_seconds')},
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"suite-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📁 Hasil disimpan di '{output}'.")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold, args.min_seconds)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} benchmark melambat lebih dari {args.threshold}x")
+
+
+if __name__ == '__main__':
+    main()
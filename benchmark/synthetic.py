@@ -0,0 +1,54 @@
+"""
+Generator data mentah sintetis dengan format yang sama seperti hasil
+extractWebElement, dibuat secara vektor dengan numpy agar cepat untuk
+jutaan baris.
+"""
+import numpy as np
+import pandas as pd
+
+PRODUCT_TYPES = np.array(['T-shirt', 'Hoodie', 'Pants', 'Outerwear', 'Jacket', 'Shirt'])
+SIZES = np.array(['S', 'M', 'L', 'XL', 'XXL'])
+GENDERS = np.array(['Men', 'Women', 'Unisex'])
+
+
+def generate_raw_frame(rows, bad_share=0.05, duplicate_share=0.1, seed=0):
+    """
+    Membuat DataFrame mentah (kolom string seperti hasil scraping).
+
+    Parameters:
+    - rows (int): Jumlah baris.
+    - bad_share (float): Porsi baris 'Unknown Product' / 'Price Unavailable'
+      / rating tidak valid.
+    - duplicate_share (float): Perkiraan porsi judul yang berulang.
+    - seed (int): Seed random agar hasil bisa direproduksi.
+    """
+    rng = np.random.default_rng(seed)
+    unique_titles = max(1, int(rows * (1 - duplicate_share)))
+
+    title = pd.Series(PRODUCT_TYPES[rng.integers(0, len(PRODUCT_TYPES), rows)]) + ' ' + \
+        pd.Series(rng.integers(0, unique_titles, rows)).astype(str)
+    price = '$' + pd.Series(np.round(rng.uniform(1, 500, rows), 2)).astype(str)
+    rating = 'Rating: ⭐ ' + pd.Series(np.round(rng.uniform(1, 5, rows), 1)).astype(str) + ' / 5'
+    colors = pd.Series(rng.integers(1, 9, rows)).astype(str) + ' Colors'
+    size = 'Size: ' + pd.Series(SIZES[rng.integers(0, len(SIZES), rows)])
+    gender = 'Gender: ' + pd.Series(GENDERS[rng.integers(0, len(GENDERS), rows)])
+
+    bad = rng.random(rows) < bad_share
+    kind = rng.integers(0, 3, rows)
+    title[bad & (kind == 0)] = 'Unknown Product'
+    price[bad & (kind == 1)] = 'Price Unavailable'
+    rating[bad & (kind == 2)] = 'Rating: ⭐ Invalid Rating / 5'
+
+    return pd.DataFrame({
+        'title': title,
+        'price': price,
+        'rating': rating,
+        'colors': colors,
+        'size': size,
+        'gender': gender,
+    })
+
+
+def generate_raw_records(rows, bad_share=0.05, duplicate_share=0.1, seed=0):
+    """Sama seperti generate_raw_frame tetapi dalam bentuk list dict."""
+    return generate_raw_frame(rows, bad_share, duplicate_share, seed).to_dict('records')
@@ -1,55 +1,552 @@
-from utils.extract import scrape_web
-from utils.transform import (
-    transform_to_DataFrame, deleteUnknownProduct, deletePriceUnavailable,
-    transformData, deleteDuplicate, convertPriceToRupiah, addScrapeTimestamp
+"""
+Runner ETL fashion-studio: extract -> transform -> load.
+
+Pengaturan dibaca dari DEFAULT_CONFIG, ditimpa file JSON (--config), lalu
+ditimpa flag baris perintah. Password PostgreSQL tidak disimpan di kode:
+isi load.postgresql.password di file config atau variabel lingkungan PGPASSWORD.
+
+Contoh:
+    python main.py                                          # semua stage, semua sink
+    python main.py --config etl_config.json --workers 8 --parse-workers 4
+    python main.py --stages extract transform --save-extract raw.json --save-clean clean.parquet
+    python main.py --stages transform load --input raw.json --sinks csv parquet
+    python main.py --stages load --input clean.parquet --sinks postgresql
+    python main.py --dry-run
+"""
+import argparse
+import contextlib
+import copy
+import json
+import os
+import sys
+
+import pandas as pd
+
+from utils.cache import ResponseCache
+from utils.cdc import SnapshotStore, capture_changes, change_log
+from utils.checkpoint import CheckpointStore
+from utils.currency import get_rate_table, load_rate_file
+from utils.chunked import HISTORICAL_DTYPES
+from utils.extract import scrape_web, iter_scrape_web
+from utils.metrics import MetricsRecorder, set_recorder
+from utils.parse_pool import ParsePool
+from utils.transform import transform_to_DataFrame, cleanDataFrame, transform_stream
+from utils.load import (
+    export_to_csv, export_to_parquet, read_columnar, upload_df_to_gsheet, load_df_to_postgresql,
+    load_changes_to_postgresql, load_batches
 )
-from utils.load import export_to_csv, upload_df_to_gsheet, load_df_to_postgresql
+from utils.orchestrator import make_sink, run_sinks
+from utils.validation import Validator, rules_from_config, validateDataFrame
+
+STAGES = ('extract', 'transform', 'load')
+SINKS = ('csv', 'parquet', 'gsheet', 'postgresql')
+CACHE_MODES = ('use', 'refresh', 'off')
+
+DEFAULT_CONFIG = {
+    'url': 'https://fashion-studio.dicoding.dev/page{}.html',
+    'start_page': 1,
+    'delay': 2,
+    'exchange_rate': 16000,
+    'rate_file': None,               # file kurs multi-mata uang (utils.currency), menggantikan exchange_rate
+    'rate_ttl': 3600,
+    'metrics_path': 'etl_metrics.json',
+    'profile_dir': 'profiles',
+    'extract': {
+        'workers': 1,
+        'parse_workers': 0,          # > 0: parsing HTML di ParsePool multi-proses
+        'rate_limit': None,
+        'parser': None,              # backend parser, None = tercepat yang terpasang
+        'cache': 'use',              # 'use', 'refresh' (kosongkan dulu) atau 'off'
+        'cache_path': '.scrape_cache.sqlite',
+        'checkpoint': True,
+        'checkpoint_path': '.scrape_checkpoint.sqlite',
+    },
+    'transform': {
+        'batch_size': 500,           # ukuran micro-batch mode --streaming
+    },
+    'validation': {
+        'enabled': False,
+        'rules': None,               # list aturan (utils.validation.rules_from_config), None = DEFAULT_RULES
+        'quarantine_path': 'fashion_studio_quarantine.csv',
+    },
+    'cdc': {
+        'enabled': False,            # PostgreSQL hanya menerima perubahan sejak snapshot terakhir
+        'snapshot_dir': '.snapshots',
+        'name': 'produk_fashion',
+        'key_columns': ['title'],
+        'changes_path': 'fashion_studio_changes',   # dataset Parquet log perubahan per run
+    },
+    'load': {
+        'sinks': list(SINKS),
+        'csv': {'filename': 'fashion_studio.csv', 'timeout': 60, 'retries': 0},
+        'parquet': {'path': 'fashion_studio_parquet', 'partition_by': ['scrape_date'], 'timeout': 60,
+                    'retries': 0},
+        'gsheet': {
+            'service_file': 'C:/Users/ASUS/Downloads/DATA_PIPELINE/google-sheet-API.json',
+            'spreadsheet_id': '1ey13qZUTxmIlBt82PKOZgRXMENc0LUy46z7cFnnWVgE',
+            'sheet_name': 'Sheet1',
+            'timeout': 300,
+            'retries': 2,
+        },
+        'postgresql': {
+            'db_name': 'shopscrap',
+            'user': 'postgres',
+            'password': None,        # atau env PGPASSWORD
+            'host': 'localhost',
+            'port': 5432,
+            'table_name': 'produk_fashion',
+            'if_exists': 'append',   # 'upsert' (butuh key_columns) atau 'replace'
+            'key_columns': ['title'],
+            'chunksize': 10000,
+            'timeout': 300,
+            'retries': 1,
+        },
+    },
+}
+
+
+class ConfigError(ValueError):
+    """Konfigurasi atau kombinasi flag yang tidak valid."""
+
+
+def _merge(base, override):
+    """Menggabungkan dict bersarang; nilai di override menang."""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default=None, help='file JSON yang menimpa DEFAULT_CONFIG')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=None,
+                        help='stage yang dijalankan (berurutan, default semua)')
+    parser.add_argument('--input', default=None,
+                        help='input stage pertama jika extract dilewati: hasil extract (.json) untuk transform, '
+                             'data bersih (.parquet/.arrow/.csv/direktori dataset) untuk load')
+    parser.add_argument('--save-extract', default=None, help='simpan hasil extract sebagai JSON')
+    parser.add_argument('--save-clean', default=None, help='simpan hasil transform sebagai Parquet')
+    parser.add_argument('--streaming', action='store_true',
+                        help='extract, transform dan load per micro-batch (run_streaming_pipeline)')
+    parser.add_argument('--dry-run', action='store_true', help='tampilkan rencana run tanpa menjalankannya')
+
+    extract = parser.add_argument_group('extract')
+    extract.add_argument('--url', default=None, help="pola URL halaman, misal 'https://.../page{}.html'")
+    extract.add_argument('--start-page', type=int, default=None)
+    extract.add_argument('--delay', type=float, default=None, help='jeda antar halaman mode sekuensial (detik)')
+    extract.add_argument('--workers', type=int, default=None, help='thread pengambil halaman')
+    extract.add_argument('--parse-workers', type=int, default=None, help='proses parser HTML (0 = tanpa pool)')
+    extract.add_argument('--rate-limit', type=float, default=None, help='request per detik per host')
+    extract.add_argument('--parser', default=None, help="backend parser: 'selectolax', 'lxml', 'html.parser'")
+    extract.add_argument('--cache', choices=CACHE_MODES, default=None, help='mode cache respons')
+    extract.add_argument('--no-checkpoint', action='store_true', help='jangan pakai checkpoint halaman')
+
+    transform = parser.add_argument_group('transform')
+    transform.add_argument('--exchange-rate', type=float, default=None)
+    transform.add_argument('--rate-file', default=None, help='file kurs JSON/CSV untuk harga multi-mata uang')
+    transform.add_argument('--batch-size', type=int, default=None, help='ukuran micro-batch mode --streaming')
+    transform.add_argument('--validate', action='store_true',
+                           help='validasi hasil transform; baris gagal dikirim ke file karantina')
+
+    load = parser.add_argument_group('load')
+    load.add_argument('--sinks', nargs='+', choices=SINKS, default=None, help='sink tujuan')
+    load.add_argument('--db-chunksize', type=int, default=None, help='baris per chunk ke PostgreSQL')
+    load.add_argument('--cdc', action='store_true',
+                      help='bandingkan dengan snapshot terakhir; PostgreSQL hanya menerima perubahan')
+
+    parser.add_argument('--profile', nargs='+', default=None, help='stage yang dibungkus cProfile')
+    parser.add_argument('--metrics', default=None, help='file JSON metrik run')
+    return parser
+
+
+def load_config(path=None, args=None):
+    """
+    DEFAULT_CONFIG yang ditimpa file JSON 'path' lalu flag 'args' (argparse.Namespace).
+    Password PostgreSQL kosong diambil dari env PGPASSWORD.
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path:
+        with open(path, encoding='utf-8') as f:
+            config = _merge(config, json.load(f))
 
-def main():
+    if args is not None:
+        overrides = {
+            ('url',): args.url,
+            ('start_page',): args.start_page,
+            ('delay',): args.delay,
+            ('exchange_rate',): args.exchange_rate,
+            ('rate_file',): args.rate_file,
+            ('metrics_path',): args.metrics,
+            ('extract', 'workers'): args.workers,
+            ('extract', 'parse_workers'): args.parse_workers,
+            ('extract', 'rate_limit'): args.rate_limit,
+            ('extract', 'parser'): args.parser,
+            ('extract', 'cache'): args.cache,
+            ('extract', 'checkpoint'): False if args.no_checkpoint else None,
+            ('transform', 'batch_size'): args.batch_size,
+            ('validation', 'enabled'): True if args.validate else None,
+            ('load', 'sinks'): args.sinks,
+            ('load', 'postgresql', 'chunksize'): args.db_chunksize,
+            ('cdc', 'enabled'): True if args.cdc else None,
+        }
+        for keys, value in overrides.items():
+            if value is None:
+                continue
+            section = config
+            for key in keys[:-1]:
+                section = section[key]
+            section[keys[-1]] = value
+
+    postgresql = config['load']['postgresql']
+    if not postgresql.get('password'):
+        postgresql['password'] = os.environ.get('PGPASSWORD')
+    return config
+
+
+def validate(config, stages, input_path, streaming=False):
+    """Memastikan kombinasi stage, input dan sink bisa dijalankan; ConfigError jika tidak."""
+    if streaming:
+        if config['cdc']['enabled']:
+            raise ConfigError("--cdc tidak didukung mode --streaming: diff membutuhkan snapshot lengkap.")
+        if 'parquet' in config['load']['sinks'] and not config['load']['parquet']['partition_by']:
+            raise ConfigError("Sink parquet mode --streaming membutuhkan load.parquet.partition_by "
+                              "(setiap micro-batch ditambahkan sebagai file baru di dataset).")
+    stages = [stage for stage in STAGES if stage in stages]
+    if stages != list(STAGES[STAGES.index(stages[0]):STAGES.index(stages[0]) + len(stages)]):
+        raise ConfigError(f"Stage harus berurutan tanpa celah, misal 'extract transform'; didapat {stages}.")
+    if stages[0] != 'extract' and not input_path:
+        raise ConfigError(f"Stage '{stages[0]}' tanpa extract membutuhkan --input.")
+    if stages[0] == 'transform' and not input_path.endswith('.json'):
+        raise ConfigError("Input stage transform harus hasil --save-extract (.json).")
+    if stages[0] == 'load' and input_path.endswith('.json'):
+        raise ConfigError("Input stage load harus data bersih (.parquet/.arrow/.csv); jalankan juga stage transform.")
+    if 'transform' in stages and config['rate_file']:
+        try:
+            load_rate_file(config['rate_file'])
+        except (OSError, ValueError, KeyError) as e:
+            raise ConfigError(f"File kurs '{config['rate_file']}' tidak bisa dibaca: {e}")
+    if config['validation']['enabled'] and config['validation']['rules']:
+        try:
+            rules_from_config(config['validation']['rules'])
+        except (TypeError, ValueError) as e:
+            raise ConfigError(f"Aturan validasi tidak valid: {e}")
+    if config['extract']['cache'] not in CACHE_MODES:
+        raise ConfigError(f"Mode cache tidak dikenal: {config['extract']['cache']}")
+    unknown = [name for name in config['load']['sinks'] if name not in SINKS]
+    if unknown:
+        raise ConfigError(f"Sink tidak dikenal: {unknown}")
+    if 'load' in stages and 'postgresql' in config['load']['sinks'] and not config['load']['postgresql']['password']:
+        raise ConfigError("Password PostgreSQL belum diisi (load.postgresql.password di config atau env PGPASSWORD).")
+    return stages
+
+
+def describe_plan(config, stages, input_path, args):
+    """Ringkasan rencana run untuk --dry-run; password disamarkan."""
+    shown = copy.deepcopy(config)
+    if shown['load']['postgresql'].get('password'):
+        shown['load']['postgresql']['password'] = '***'
+    lines = [
+        f"Stage   : {' -> '.join(stages)}",
+        f"Input   : {input_path or '-'}",
+        f"Simpan  : extract={args.save_extract or '-'}, clean={args.save_clean or '-'}",
+    ]
+    if 'extract' in stages:
+        lines.append(f"Extract : {json.dumps(shown['extract'])}")
+    if 'transform' in stages:
+        rate = f"rate_file={shown['rate_file']}" if shown['rate_file'] else f"exchange_rate={shown['exchange_rate']}"
+        lines.append(f"Transform: {rate}, {json.dumps(shown['transform'])}")
+        if shown['validation']['enabled']:
+            lines.append(f"Validasi : {json.dumps(shown['validation'])}")
+    if 'load' in stages:
+        if shown['cdc']['enabled']:
+            lines.append(f"CDC     : {json.dumps(shown['cdc'])}")
+        for name in shown['load']['sinks']:
+            lines.append(f"Sink {name}: {json.dumps(shown['load'][name])}")
+    return '\n'.join(lines)
+
+
+def read_extract(path):
+    """Membaca hasil extract yang disimpan dengan --save-extract."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_extract(records, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+    print(f"✅ {len(records)} record hasil extract disimpan di '{path}'.")
+
+
+def read_clean(path):
+    """Membaca data bersih (hasil --save-clean atau sink csv/parquet) dengan dtype aslinya."""
+    if path.endswith('.csv'):
+        df = pd.read_csv(path, dtype=HISTORICAL_DTYPES)
+        df['scrape_timestamp'] = pd.to_datetime(df['scrape_timestamp']).astype('datetime64[ns]')
+        return df
+    df = read_columnar(path)
+    # Kolom partisi turunan dari export_to_parquet(partition_by=['scrape_date'])
+    return df.drop(columns=['scrape_date'], errors='ignore')
+
+
+@contextlib.contextmanager
+def scrape_options(config):
+    """
+    Argumen scrape_web/iter_scrape_web dari config (tanpa base_url), dipakai
+    jalur batch maupun --streaming. Cache, checkpoint dan pool parser ditutup saat keluar.
+    """
+    options = config['extract']
+    cache = None
+    if options['cache'] != 'off':
+        cache = ResponseCache(options['cache_path'])
+        if options['cache'] == 'refresh':
+            cache.clear()
+    checkpoint = CheckpointStore(options['checkpoint_path']) if options['checkpoint'] else None
+    pool = ParsePool(workers=options['parse_workers']) if options['parse_workers'] else None
     try:
-        # Konfigurasi
-        SPREADSHEET_ID = '1ey13qZUTxmIlBt82PKOZgRXMENc0LUy46z7cFnnWVgE'
-        service_file = "C:/Users/ASUS/Downloads/DATA_PIPELINE/google-sheet-API.json"
-        url = 'https://fashion-studio.dicoding.dev/page{}.html'
-        csv_filename = 'fashion_studio.csv'
-
-        print("🔍 Memulai proses scraping...")
-        scrap_data = scrape_web(base_url=url)
-
-        print("📄 Mengubah hasil scrape ke DataFrame...")
-        df = transform_to_DataFrame(scrap_data)
-
-        print("🧹 Membersihkan data...")
-        deleteUnknownProduct(df)
-        deletePriceUnavailable(df)
-        transformData(df)
-        deleteDuplicate(df)
-        convertPriceToRupiah(df)
-        addScrapeTimestamp(df)
-
-        print("💾 Mengekspor data ke CSV...")
-        export_to_csv(df, csv_filename)
-
-        print("📤 Mengunggah ke Google Sheets...")
-        upload_df_to_gsheet(df, service_file, SPREADSHEET_ID)
-
-        print("🗃️ Menyimpan ke PostgreSQL...")
-        load_df_to_postgresql(
-            df=df,
-            db_name='shopscrap',
-            user='postgres',
-            password='se7kalo2',
-            host='localhost',
-            port=5432,
-            table_name='produk_fashion',
-            if_exists='append'
-        )
+        yield {
+            'start_page': config['start_page'],
+            'delay': config['delay'],
+            'workers': options['workers'],
+            'rate_limit': options['rate_limit'],
+            'parser': pool or options['parser'],
+            'cache': cache,
+            'checkpoint': checkpoint,
+        }
+    finally:
+        for resource in (pool, checkpoint, cache):
+            if resource is not None:
+                resource.close()
+
+
+def run_extract(config):
+    with scrape_options(config) as options:
+        return scrape_web(base_url=config['url'], **options)
+
+
+def exchange_rate(config):
+    """Kurs tunggal dari config, atau RateTable ber-cache jika rate_file diisi."""
+    if config['rate_file']:
+        return get_rate_table(config['rate_file'], ttl=config['rate_ttl'])
+    return config['exchange_rate']
+
+
+def run_transform(records, config):
+    print("📄 Mengubah hasil scrape ke DataFrame...")
+    df = transform_to_DataFrame(records)
+    if df.empty:
+        raise ValueError("Hasil extract kosong atau tidak bisa diubah menjadi DataFrame.")
+
+    print("🧹 Membersihkan data...")
+    return cleanDataFrame(df, exchange_rate(config))
+
+
+def quarantine_invalid(df, config):
+    """Memisahkan baris yang gagal aturan validasi dan menambahkannya ke file karantina."""
+    options = config['validation']
+    validator = Validator(rules_from_config(options['rules']) if options['rules'] else None)
+    valid, quarantine = validateDataFrame(df, validator)
+    if len(quarantine) and export_to_csv(quarantine, options['quarantine_path'], append=True) is None:
+        raise RuntimeError(f"Gagal menulis karantina ke '{options['quarantine_path']}'.")
+    return valid
+
+
+def run_validation(df, config):
+    valid = quarantine_invalid(df, config)
+    if valid.empty:
+        raise ValueError("Tidak ada baris yang lolos validasi.")
+    return valid
+
+
+def run_diff(df, config):
+    """Selisih df dengan snapshot terakhir (ChangeSet); belum menulis apa pun."""
+    options = config['cdc']
+    return capture_changes(df, SnapshotStore(options['snapshot_dir']), options['name'], options['key_columns'])
+
+
+def save_snapshot(df, changes, config):
+    """Menambahkan log perubahan ke dataset Parquet lalu menyimpan snapshot baru."""
+    options = config['cdc']
+    log = change_log(changes, options['key_columns'])
+    if len(log) and export_to_parquet(log, options['changes_path'], append=True) is None:
+        raise RuntimeError(f"Gagal menulis log perubahan ke '{options['changes_path']}'.")
+    SnapshotStore(options['snapshot_dir']).save(options['name'], df, options['key_columns'])
+    print(f"✅ Snapshot '{options['name']}' diperbarui.")
+
+
+def build_sinks(config, changes=None):
+    """Sink dari config; jika changes (ChangeSet) diberikan, PostgreSQL hanya memuat perubahan."""
+    load = config['load']
+
+    def postgresql(df, if_exists, **options):
+        if changes is None:
+            return load_df_to_postgresql(df=df, if_exists=if_exists, **options)
+        return load_changes_to_postgresql(changes, **options)
+
+    factories = {
+        'csv': lambda options: lambda df: export_to_csv(df, options['filename']),
+        'parquet': lambda options: lambda df: export_to_parquet(df, options['path'],
+                                                                partition_by=options['partition_by']),
+        'gsheet': lambda options: lambda df: upload_df_to_gsheet(
+            df, options['service_file'], options['spreadsheet_id'], sheet_name=options['sheet_name'], sync=True),
+        'postgresql': lambda options: lambda df: postgresql(df=df, **_db_config(options)),
+    }
+    return [
+        make_sink(name, factories[name](load[name]), timeout=load[name]['timeout'], retries=load[name]['retries'])
+        for name in load['sinks']
+    ]
+
+
+def _db_config(options):
+    """Argumen load_df_to_postgresql dari bagian config load.postgresql."""
+    return {key: value for key, value in options.items() if key not in ('timeout', 'retries')}
+
+
+def run_load(df, config, changes=None):
+    print(f"🚚 Memuat data ke {', '.join(config['load']['sinks'])} secara paralel...")
+    results = run_sinks(df, build_sinks(config, changes))
+    failed = [result.name for result in results if not result.success]
+    if failed:
+        raise RuntimeError(f"Sink gagal: {', '.join(failed)}")
+    return results
+
+
+def main(argv=None):
+    """
+    Menjalankan stage yang dipilih dan mencetak tabel waktu per stage.
+
+    Returns:
+    - int exit code: 0 sukses, 1 ada stage yang gagal, 2 konfigurasi tidak valid.
+    """
+    args = build_arg_parser().parse_args(argv)
+    try:
+        config = load_config(args.config, args)
+        stages = validate(config, args.stages or STAGES, args.input, streaming=args.streaming)
+    except (ConfigError, OSError, json.JSONDecodeError) as e:
+        print(f"❌ Konfigurasi tidak valid: {e}")
+        return 2
+
+    if args.dry_run:
+        print("🧪 Dry run, tidak ada stage yang dijalankan:")
+        print(describe_plan(config, stages, args.input, args))
+        return 0
+
+    # Metrik per run; --profile atau ETL_PROFILE=transform membungkus stage dengan cProfile
+    metrics = set_recorder(MetricsRecorder(profile=args.profile, profile_dir=config['profile_dir']))
+    current = None
+    try:
+        if args.streaming:
+            current = 'stream'
+            with metrics.stage('stream'):
+                run_streaming_pipeline(config=config)
+            print("✅ Semua proses selesai tanpa error.")
+            return 0
+
+        records = df = None
+        if stages[0] == 'transform':
+            records = read_extract(args.input)
+        elif stages[0] == 'load':
+            df = read_clean(args.input)
+
+        if 'extract' in stages:
+            current = 'extract'
+            print("🔍 Memulai proses scraping...")
+            with metrics.stage('extract'):
+                records = run_extract(config)
+            if args.save_extract:
+                save_extract(records, args.save_extract)
+
+        if 'transform' in stages:
+            current = 'transform'
+            with metrics.stage('transform'):
+                df = run_transform(records, config)
+            if config['validation']['enabled']:
+                current = 'validate'
+                with metrics.stage('validate'):
+                    df = run_validation(df, config)
+            if args.save_clean and export_to_parquet(df, args.save_clean) is None:
+                raise RuntimeError(f"Gagal menyimpan data bersih ke '{args.save_clean}'.")
+
+        if 'load' in stages:
+            changes = None
+            if config['cdc']['enabled']:
+                current = 'diff'
+                with metrics.stage('diff'):
+                    changes = run_diff(df, config)
+            current = 'load'
+            with metrics.stage('load'):
+                run_load(df, config, changes)
+            if changes is not None:
+                # Log perubahan dan snapshot baru hanya setelah semua sink berhasil,
+                # agar run gagal di-diff ulang tanpa mencatat perubahan yang tidak dimuat
+                save_snapshot(df, changes, config)
 
         print("✅ Semua proses selesai tanpa error.")
+        return 0
 
     except Exception as e:
-        print(f"❌ Terjadi kesalahan dalam main(): {e}")
+        print(f"❌ Stage '{current or 'input'}' gagal: {e}")
+        return 1
+    finally:
+        print(metrics.format_table())
+        print(f"📊 Metrik run disimpan di '{metrics.write_json(config['metrics_path'])}'.")
+
+
+def run_streaming_pipeline(url=None, csv_filename=None, service_file=None, spreadsheet_id=None, db_config=None,
+                           batch_size=500, workers=1, dedup_index=None, exchangeRate=16000, config=None,
+                           sheet_name='Sheet1'):
+    """
+    Menjalankan ETL secara streaming: setiap halaman yang selesai di-scrape
+    langsung dibersihkan per micro-batch dan dimuat ke semua sink.
+    dedup_index (utils.dedup.DedupIndex) membuang produk yang sudah dimuat
+    pada run sebelumnya; kunci batch baru dicatat setelah semua sink berhasil.
+    Jika config (lihat DEFAULT_CONFIG) diberikan, nilai yang tidak diisi
+    diambil dari config: opsi scrape sama dengan jalur batch (scrape_options),
+    validasi per batch jika diaktifkan, dan hanya sink di load.sinks yang
+    dipakai. if_exists di db_config berlaku untuk batch pertama; batch
+    berikutnya ditambahkan ('upsert' tetap upsert di setiap batch).
+    """
+    sink_names = ('csv', 'gsheet', 'postgresql')
+    parquet = None
+    if config is not None:
+        validate(config, ['extract', 'transform', 'load'], None, streaming=True)
+        load = config['load']
+        url = url or config['url']
+        csv_filename = csv_filename or load['csv']['filename']
+        parquet = load['parquet']
+        service_file = service_file or load['gsheet']['service_file']
+        spreadsheet_id = spreadsheet_id or load['gsheet']['spreadsheet_id']
+        sheet_name = load['gsheet']['sheet_name']
+        db_config = db_config or _db_config(load['postgresql'])
+        batch_size = config['transform']['batch_size']
+        exchangeRate = exchange_rate(config)
+        sink_names = [name for name in load['sinks'] if name in SINKS]
+    db_config = dict(db_config or {})
+    if_exists = db_config.pop('if_exists', 'append')
+
+    sinks = {
+        'csv': lambda batch, first: export_to_csv(batch, csv_filename, append=not first),
+        # Batch pertama mengganti partisi yang ditulis (seperti jalur batch), berikutnya ditambahkan
+        'parquet': lambda batch, first: export_to_parquet(batch, parquet['path'],
+                                                          partition_by=parquet['partition_by'], append=not first),
+        'gsheet': lambda batch, first: upload_df_to_gsheet(batch, service_file, spreadsheet_id,
+                                                           sheet_name=sheet_name, append=not first),
+        'postgresql': lambda batch, first: load_df_to_postgresql(
+            df=batch, if_exists=if_exists if first or if_exists == 'upsert' else 'append', **db_config),
+    }
+
+    with contextlib.ExitStack() as stack:
+        options = stack.enter_context(scrape_options(config)) if config is not None else {'workers': workers}
+        pages = iter_scrape_web(base_url=url, **options)
+        batches = transform_stream(pages, batch_size=batch_size, exchangeRate=exchangeRate, dedup_index=dedup_index)
+        if config is not None and config['validation']['enabled']:
+            batches = (valid for valid in (quarantine_invalid(batch, config) for batch in batches) if len(valid))
+        return load_batches(batches, {name: sinks[name] for name in sink_names},
+                            on_loaded=dedup_index.add if dedup_index is not None else None)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+from utils.extract import scrape_web
+from utils.async_extract import aiohttp, scrape_web_async, scrape_sites_async
+from benchmark.fixture_server import serve_catalog
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp tidak terpasang")
+class TestAsyncScraping(unittest.TestCase):
+
+    def test_scrape_web_async_matches_scrape_web(self):
+        with serve_catalog(total_pages=15, cards_per_page=4) as server:
+            expected = scrape_web(server['base_url'], delay=0)
+            result = asyncio.run(scrape_web_async(server['base_url'], concurrency=8))
+
+        self.assertEqual(len(result), 60)
+        self.assertEqual(result, expected)
+
+    def test_scrape_web_async_limits_speculative_probes(self):
+        with serve_catalog(total_pages=50, cards_per_page=2) as server:
+            result = asyncio.run(scrape_web_async(server['base_url'], concurrency=100))
+            requests = server['catalog']['requests']
+
+        self.assertEqual(len(result), 100)
+        # Probe spekulatif setelah halaman terakhir dibatasi probe_ahead (16), bukan concurrency
+        self.assertLessEqual(requests, 50 + 16)
+
+    def test_scrape_web_async_retries_server_error(self):
+        with serve_catalog(total_pages=2, cards_per_page=3, failures={2: 1}) as server:
+            result = asyncio.run(scrape_web_async(server['base_url'], concurrency=4))
+        self.assertEqual(len(result), 6)
+
+    def test_scrape_sites_async(self):
+        with serve_catalog(total_pages=3, cards_per_page=2) as first, \
+                serve_catalog(total_pages=5, cards_per_page=2, seed=1) as second:
+            urls = [first['base_url'], second['base_url']]
+            results = asyncio.run(scrape_sites_async(urls, concurrency=10))
+
+        self.assertEqual(len(results[urls[0]]), 6)
+        self.assertEqual(len(results[urls[1]]), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from utils.cdc import SnapshotStore, capture_changes, change_log, diff_snapshots
+from utils.load import apply_changes_to_sql
+from utils.transform import cleanDataFrame
+from benchmark.standins import sqlite_engine
+from benchmark.synthetic import generate_raw_frame
+
+
+class TestSnapshotDiff(unittest.TestCase):
+
+    def setUp(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.previous = cleanDataFrame(generate_raw_frame(1000, seed=11),
+                                           timestamp=pd.Timestamp('2024-01-01 08:00'))
+        current = self.previous.iloc[5:].copy()
+        current.loc[current.index[:3], 'price'] += 1000
+        current.loc[current.index[3], 'gender'] = 'Men' if current['gender'].iloc[3] != 'Men' else 'Women'
+        new_rows = self.previous.iloc[:2].assign(title=pd.array(['New Hoodie', 'New Pants'], dtype='string'))
+        current = pd.concat([current, new_rows])
+        current['scrape_timestamp'] = pd.Timestamp('2024-01-02 08:00')
+        self.current = current
+
+    def test_inserts_updates_deletes_with_old_and_new_values(self):
+        changes = diff_snapshots(self.previous, self.current)
+
+        self.assertEqual(changes.inserts['title'].tolist(), ['New Hoodie', 'New Pants'])
+        self.assertEqual(changes.deletes['title'].tolist(), self.previous['title'].iloc[:5].tolist())
+        self.assertEqual(len(changes.updates), 4)
+        self.assertEqual(changes.updates['changed_columns'].tolist(), ['price'] * 3 + ['gender'])
+        np.testing.assert_allclose(changes.updates['price_new'][:3] - changes.updates['price_old'][:3], 1000)
+        self.assertEqual(len(changes.upserts), 6)
+        self.assertEqual(change_log(changes)['change_type'].value_counts().to_dict(),
+                         {'delete': 5, 'update': 4, 'insert': 2})
+
+    def test_timestamp_and_dtype_only_changes_are_ignored(self):
+        current = self.previous.copy()
+        current['scrape_timestamp'] = pd.Timestamp('2024-01-02 08:00')
+        current['colors'] = current['colors'].astype('float64')
+        changes = diff_snapshots(self.previous, current)
+        self.assertEqual([len(part) for part in changes], [0, 0, 0, 0])
+
+    def test_store_roundtrip_and_hash_collisions(self):
+        with tempfile.TemporaryDirectory() as tmpdir, contextlib.redirect_stdout(io.StringIO()):
+            store = SnapshotStore(tmpdir)
+            self.assertEqual(len(capture_changes(self.previous, store, 'produk').inserts), len(self.previous))
+            store.save('produk', self.previous)
+            expected = diff_snapshots(self.previous, self.current)
+            changes = capture_changes(self.current, store, 'produk')
+
+            with mock.patch('utils.cdc.hash_keys', side_effect=lambda keys: np.zeros(len(keys), dtype='int64')):
+                collided = diff_snapshots(self.previous, self.current)
+
+        for result in (changes, collided):
+            pd.testing.assert_frame_equal(result.updates, expected.updates)
+            self.assertEqual(result.inserts['title'].tolist(), expected.inserts['title'].tolist())
+            self.assertEqual(result.deletes['title'].tolist(), expected.deletes['title'].tolist())
+
+    def test_apply_changes_to_sql(self):
+        engine = sqlite_engine()
+        with contextlib.redirect_stdout(io.StringIO()):
+            apply_changes_to_sql(diff_snapshots(None, self.previous), engine, 'produk_fashion')
+            counts = apply_changes_to_sql(diff_snapshots(self.previous, self.current), engine, 'produk_fashion')
+
+        self.assertEqual(counts, {'inserted': 2, 'updated': 4, 'unchanged': 0, 'deleted': 5})
+        with engine.connect() as conn:
+            table = pd.read_sql(text('SELECT title, price FROM produk_fashion'), conn)
+        self.assertEqual(sorted(table['title']), sorted(self.current['title']))
+        prices = table.set_index('title')['price']
+        np.testing.assert_allclose(prices[self.current['title']].to_numpy(), self.current['price'].to_numpy())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import pandas as pd
+from utils.chunked import transform_csv_chunked
+from utils.load import read_columnar
+from utils.transform import cleanDataFrame
+from benchmark.synthetic import generate_raw_frame
+
+
+class TestTransformCsvChunked(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.raw_path = os.path.join(self.tmpdir.name, 'raw.csv')
+        generate_raw_frame(3000, duplicate_share=0.4).to_csv(self.raw_path, index=False)
+        self.timestamp = pd.Timestamp('2024-01-01 08:00')
+
+    def test_raw_mode_matches_in_memory_clean(self):
+        output = os.path.join(self.tmpdir.name, 'clean.parquet')
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = transform_csv_chunked(self.raw_path, output, chunksize=400, timestamp=self.timestamp)
+            raw = pd.read_csv(self.raw_path, dtype=str, keep_default_na=False)
+            expected = cleanDataFrame(raw, timestamp=self.timestamp).reset_index(drop=True)
+
+        self.assertEqual(stats['chunks'], 8)
+        self.assertEqual(stats['rows_out'], len(expected))
+        self.assertGreater(stats['duplicates'], 0)
+        pd.testing.assert_frame_equal(read_columnar(output), expected)
+
+    def test_historical_mode_drops_duplicates_across_runs(self):
+        clean_path = os.path.join(self.tmpdir.name, 'clean.csv')
+        history_path = os.path.join(self.tmpdir.name, 'history.csv')
+        output = os.path.join(self.tmpdir.name, 'history_dedup.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            transform_csv_chunked(self.raw_path, clean_path, chunksize=500, timestamp=self.timestamp)
+            clean = pd.read_csv(clean_path)
+            # Riwayat berisi run yang sama dua kali (append harian)
+            pd.concat([clean, clean]).to_csv(history_path, index=False)
+            stats = transform_csv_chunked(history_path, output, mode='historical', chunksize=700)
+
+        result = pd.read_csv(output)
+        self.assertEqual(stats['rows_in'], 2 * len(clean))
+        self.assertEqual(stats['rows_out'], len(clean))
+        self.assertEqual(result['title'].tolist(), clean['title'].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import contextlib
+import io
+import unittest
+import pandas as pd
+from utils.columnar import ColumnarBuilder
+from utils.parser import available_backends, parse_page_with
+from utils.transform import cleanDataFrame, transform_to_DataFrame
+from benchmark.fixture_server import generate_catalog
+
+
+class TestColumnarBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.timestamp = pd.Timestamp('2024-01-01 08:00')
+        self.pages = list(generate_catalog(total_pages=6, cards_per_page=10, bad_share=0.2).values())
+
+    def test_matches_clean_dataframe_for_every_backend(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            records = [record for content in self.pages for record in parse_page_with(content)['records']]
+            expected = cleanDataFrame(transform_to_DataFrame(records), timestamp=self.timestamp)
+
+            for backend in available_backends():
+                with self.subTest(backend=backend):
+                    builder = ColumnarBuilder()
+                    for content in self.pages:
+                        page = parse_page_with(content, backend, sink=builder)
+                        self.assertEqual(page['records'], [])
+                    pd.testing.assert_frame_equal(builder.to_frame(self.timestamp), expected)
+
+    def test_extend_records_and_drop_invalid(self):
+        records = [
+            {'title': 'A', 'price': '$10', 'rating': 'Rating: ⭐ 4.5 / 5', 'colors': '3 Colors',
+             'size': 'Size: M', 'gender': 'Gender: Men'},
+            {'title': 'B', 'price': '$1,200.50', 'rating': 'Rating: ⭐ Not Rated', 'colors': '2 Colors',
+             'size': 'Size: L', 'gender': 'Gender: Women'},
+            {'title': 'A', 'price': '$11', 'rating': 'Rating: ⭐ 4.0 / 5', 'colors': '1 Colors',
+             'size': 'Size: S', 'gender': 'Gender: Men'},
+            {'title': 'Unknown Product', 'price': 'Price Unavailable', 'rating': 'N/A', 'colors': 'N/A',
+             'size': 'N/A', 'gender': 'N/A'},
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            builder = ColumnarBuilder(exchangeRate=2)
+            builder.extend_records(records)
+            kept = builder.to_frame(self.timestamp)
+
+            strict = ColumnarBuilder(exchangeRate=2, drop_invalid=True)
+            strict.extend_records(records)
+            strict_df = strict.to_frame(self.timestamp)
+
+        self.assertEqual(kept['title'].tolist(), ['A', 'B'])
+        self.assertEqual(kept['price'].tolist(), [20.0, 2401.0])
+        self.assertTrue(pd.isna(kept['rating'].iloc[1]))
+        self.assertEqual(strict_df['title'].tolist(), ['A'])
+        self.assertEqual(strict.dropped, {'unknown_product': 1, 'price_unavailable': 0, 'duplicate': 1, 'invalid': 1})
+
+    def test_single_gender_and_whole_prices_match_chain(self):
+        records = [
+            {'title': f'Item {i}', 'price': f'${i + 1}', 'rating': 'Rating: ⭐ 4 / 5', 'colors': '3 Colors',
+             'size': 'Size: M', 'gender': 'Gender: Men'}
+            for i in range(5)
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = cleanDataFrame(transform_to_DataFrame(records), timestamp=self.timestamp)
+            builder = ColumnarBuilder()
+            builder.extend_records(records)
+            result = builder.to_frame(self.timestamp)
+
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(result['price'].dtype, 'int64')
+        self.assertEqual(list(result['gender'].cat.categories), ['Men', 'Unisex', 'Women'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from utils.currency import RateTable, convert_amounts, convertPriceMultiCurrency, get_rate_table, parse_price_currency
+from utils.transform import cleanDataFrame
+from benchmark.synthetic import generate_raw_frame
+
+
+class TestCurrency(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.rate_path = os.path.join(self.tmpdir.name, 'rates.json')
+        self.write_rates({'USD': 16000, 'EUR': 17500})
+
+    def write_rates(self, rates):
+        with open(self.rate_path, 'w', encoding='utf-8') as f:
+            json.dump({'base': 'IDR', 'rates': rates}, f)
+
+    def test_detects_currency_per_row(self):
+        amount, currency = parse_price_currency(
+            pd.Series(['$12.50', 'US$ 1,299.00', 'Rp 150.000', '€9.99', 'SGD 5', '12'])
+        )
+        self.assertEqual(amount.tolist(), [12.5, 1299.0, 150000.0, 9.99, 5.0, 12.0])
+        self.assertEqual(currency.tolist(), ['USD', 'USD', 'IDR', 'EUR', 'SGD', 'USD'])
+        self.assertIsInstance(currency.dtype, pd.CategoricalDtype)
+
+    def test_convert_uses_rate_per_currency(self):
+        amount, currency = parse_price_currency(pd.Series(['$2', '€2', 'Rp 5.000', '£1']))
+        with contextlib.redirect_stdout(io.StringIO()):
+            converted = convert_amounts(amount, currency, RateTable(self.rate_path))
+        np.testing.assert_array_equal(converted.to_numpy()[:3], [32000.0, 35000.0, 5000.0])
+        self.assertTrue(np.isnan(converted.iloc[3]))
+
+    def test_rate_table_reloads_only_after_ttl(self):
+        with mock.patch('utils.currency.time.monotonic', return_value=100.0) as clock:
+            table = RateTable(self.rate_path, ttl=60)
+            self.assertEqual(table.rate('USD'), 16000)
+            self.write_rates({'USD': 15000})
+            clock.return_value = 150.0
+            self.assertEqual(table.rate('USD'), 16000)
+            clock.return_value = 161.0
+            self.assertEqual(table.rate('USD'), 15000)
+        self.assertEqual(table.loads, 2)
+        self.assertIs(get_rate_table(self.rate_path), get_rate_table(self.rate_path))
+
+    def test_clean_paths_match_with_rate_table(self):
+        raw = generate_raw_frame(1000, seed=4)
+        euro = raw.index[::3]
+        raw.loc[euro, 'price'] = raw.loc[euro, 'price'].str.replace('$', '€', regex=False)
+        rates, timestamp = RateTable(self.rate_path), pd.Timestamp('2024-01-01 08:00')
+        with contextlib.redirect_stdout(io.StringIO()):
+            chain = cleanDataFrame(raw.copy(), rates, timestamp)
+            single = cleanDataFrame(raw.copy(), 16000, timestamp)
+
+        usd = (chain['currency'] == 'USD').to_numpy()
+        np.testing.assert_allclose(chain['price'][usd], single.loc[chain.index[usd], 'price'])
+        self.assertEqual(set(chain['currency'].unique()), {'USD', 'EUR'})
+
+
+    def test_unreadable_rate_file_stops_cleaning(self):
+        with open(self.rate_path, 'w', encoding='utf-8') as f:
+            f.write('{rusak')
+        raw = generate_raw_frame(20, seed=2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(ValueError):
+                cleanDataFrame(raw.copy(), RateTable(self.rate_path))
+            with self.assertRaises(FileNotFoundError):
+                cleanDataFrame(raw.copy(), RateTable(os.path.join(self.tmpdir.name, 'hilang.json')))
+
+    def test_failed_conversion_leaves_no_unconverted_prices(self):
+        df = generate_raw_frame(20, seed=3)
+        with contextlib.redirect_stdout(io.StringIO()), \
+                mock.patch('utils.currency.convert_amounts', side_effect=RuntimeError('gagal')):
+            convertPriceMultiCurrency(df, RateTable(self.rate_path))
+        self.assertTrue(df['price'].isna().all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import pandas as pd
+from utils.dedup import DedupIndex
+from utils.load import load_batches
+from utils.transform import deleteIndexedDuplicate, transform_stream
+from benchmark.synthetic import generate_raw_records
+
+
+class TestDedupIndex(unittest.TestCase):
+
+    def test_filter_new_within_and_across_batches(self):
+        with DedupIndex(':memory:') as index:
+            first = pd.DataFrame({'title': ['A', 'B', 'A']})
+            second = pd.DataFrame({'title': ['B', 'C', 'C']})
+            self.assertEqual(index.filter_new(first).tolist(), [True, True, False])
+            self.assertEqual(index.filter_new(second).tolist(), [False, True, False])
+            self.assertEqual(len(index), 3)
+
+    def test_multi_column_keys_and_add_after_load(self):
+        with DedupIndex(':memory:', key_columns=['title', 'size']) as index:
+            df = pd.DataFrame({'title': ['A', 'A'], 'size': ['M', 'L']})
+            self.assertEqual(index.filter_new(df, add=False).tolist(), [True, True])
+            self.assertEqual(len(index), 0)
+            index.add(df)
+            self.assertEqual(index.contains(pd.DataFrame({'title': ['A', 'A'], 'size': ['M', 'S']})).tolist(),
+                             [True, False])
+
+    def test_index_persists_across_runs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'dedup.sqlite')
+            with DedupIndex(path) as index:
+                df = pd.DataFrame({'title': ['A', 'B'], 'price': [1, 2]})
+                with contextlib.redirect_stdout(io.StringIO()):
+                    deleteIndexedDuplicate(df, index)
+            with DedupIndex(path) as index:
+                df = pd.DataFrame({'title': ['B', 'C'], 'price': [3, 4]})
+                with contextlib.redirect_stdout(io.StringIO()):
+                    deleteIndexedDuplicate(df, index)
+                self.assertEqual(df['title'].tolist(), ['C'])
+
+    def test_transform_stream_with_index_matches_in_memory(self):
+        records = generate_raw_records(2000, duplicate_share=0.3)
+        pages = [records[start:start + 20] for start in range(0, len(records), 20)]
+        timestamp = pd.Timestamp('2024-01-01')
+        with contextlib.redirect_stdout(io.StringIO()), DedupIndex(':memory:') as index:
+            expected = pd.concat(transform_stream(iter(pages), batch_size=300, timestamp=timestamp))
+            indexed = pd.concat(transform_stream(iter(pages), batch_size=300, timestamp=timestamp,
+                                                 dedup_index=index))
+            # Kunci dicatat oleh pemanggil setelah load berhasil
+            index.add(indexed)
+            # Run berikutnya: semua judul sudah dimuat
+            rerun = list(transform_stream(iter(pages), batch_size=300, timestamp=timestamp, dedup_index=index))
+        pd.testing.assert_frame_equal(indexed, expected)
+        self.assertEqual(rerun, [])
+
+    def test_failed_load_does_not_mark_products_as_loaded(self):
+        records = generate_raw_records(200, duplicate_share=0.0)
+        pages = [records[start:start + 20] for start in range(0, len(records), 20)]
+        timestamp = pd.Timestamp('2024-01-01')
+        loaded = []
+
+        def failing_sink(batch, first):
+            return None
+
+        def sink(batch, first):
+            loaded.append(batch)
+            return len(batch)
+
+        with contextlib.redirect_stdout(io.StringIO()), DedupIndex(':memory:') as index:
+            with self.assertRaises(RuntimeError):
+                load_batches(transform_stream(iter(pages), batch_size=50, timestamp=timestamp, dedup_index=index),
+                             [failing_sink], on_loaded=index.add)
+            self.assertEqual(len(index), 0)
+
+            # Run berikutnya memuat ulang produk yang sama
+            total = load_batches(transform_stream(iter(pages), batch_size=50, timestamp=timestamp,
+                                                  dedup_index=index), [sink], on_loaded=index.add)
+            expected = pd.concat(transform_stream(iter(pages), batch_size=50, timestamp=timestamp))
+            self.assertEqual(total, len(expected))
+            self.assertEqual(len(index), len(expected))
+
+        pd.testing.assert_frame_equal(pd.concat(loaded), expected)
+
+if __name__ == '__main__':
+    unittest.main()
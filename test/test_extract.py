@@ -1,13 +1,25 @@
 import unittest
+import time
+from unittest import mock
+import pandas as pd
 from bs4 import BeautifulSoup
-from utils.extract import fetching_content, extractWebElement, scrape_web
+from utils.extract import (
+    fetching_content, extractWebElement, scrape_web, build_page_url, HostRateLimiter,
+    HttpFetcher, iter_scrape_web, scrape_web_columnar
+)
+from utils.cache import ResponseCache
+from utils.transform import cleanDataFrame, transform_to_DataFrame
+from utils.checkpoint import CheckpointStore
+from utils.parse_pool import ParsePool
+from benchmark.fixture_server import serve_catalog
 
 
 class TestScrapingFunctions(unittest.TestCase):
 
     def test_fetching_content_valid_url(self):
-        url = 'https://fashion-studio.dicoding.dev/'
-        content = fetching_content(url)
+        # Server katalog lokal menggantikan situs asli agar test berjalan offline
+        with serve_catalog(total_pages=1, cards_per_page=2) as server:
+            content = fetching_content(build_page_url(server['base_url'], 1))
         self.assertIsNotNone(content)
         self.assertIn(b"<html", content)  # minimal konten html ada
 
@@ -37,10 +49,135 @@ class TestScrapingFunctions(unittest.TestCase):
 
     def test_scrape_web_basic(self):
         # Ambil hanya 1 halaman untuk test kecepatan
-        data = scrape_web('https://fashion-studio.dicoding.dev/page{}.html', start_page=1, delay=0)
+        with serve_catalog(total_pages=1, cards_per_page=5) as server:
+            data = scrape_web(server['base_url'], start_page=1, delay=0)
         self.assertIsInstance(data, list)
         self.assertGreater(len(data), 0)
         self.assertTrue('title' in data[0])  # minimal kolom 'title' ada
 
+    def test_build_page_url(self):
+        base_url = 'https://fashion-studio.dicoding.dev/page{}.html'
+        self.assertEqual(build_page_url(base_url, 1), 'https://fashion-studio.dicoding.dev/')
+        self.assertEqual(build_page_url(base_url, 3), 'https://fashion-studio.dicoding.dev/page3.html')
+
+    def test_scrape_web_concurrent_matches_sequential(self):
+        # Server lokal dengan 12 halaman, pagination hanya menampilkan sebagian nomor
+        with serve_catalog(total_pages=12, cards_per_page=5) as server:
+            sequential = scrape_web(server['base_url'], delay=0)
+            concurrent = scrape_web(server['base_url'], delay=0, workers=4)
+
+        self.assertEqual(len(sequential), 60)
+        self.assertEqual(concurrent, sequential)
+
+    def test_host_rate_limiter(self):
+        limiter = HostRateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.wait('http://localhost/page1.html')
+        # 5 request dengan 50 req/detik membutuhkan minimal 4 interval
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 50 - 0.01)
+
+    def test_http_fetcher_retries_server_error(self):
+        # Halaman 2 mengembalikan 503 dua kali sebelum berhasil
+        with serve_catalog(total_pages=3, cards_per_page=2, failures={2: 2}) as server:
+            with HttpFetcher(retries=3, backoff_factor=0) as fetcher:
+                content = fetching_content(build_page_url(server['base_url'], 2), fetcher)
+            requests_made = server['catalog']['requests']
+
+        self.assertIn(b'collection-card', content)
+        self.assertEqual(requests_made, 3)
+
+    def test_scrape_web_with_injected_fetcher(self):
+        with serve_catalog(total_pages=3, cards_per_page=2) as server:
+            with HttpFetcher(pool_size=2) as fetcher:
+                data = scrape_web(server['base_url'], delay=0, fetcher=fetcher)
+        self.assertEqual(len(data), 6)
+
+    def test_iter_scrape_web_yields_pages(self):
+        with serve_catalog(total_pages=4, cards_per_page=3) as server:
+            pages = list(iter_scrape_web(server['base_url'], delay=0))
+            concurrent_pages = list(iter_scrape_web(server['base_url'], delay=0, workers=3))
+        self.assertEqual([len(records) for records in pages], [3, 3, 3, 3])
+        self.assertEqual(concurrent_pages, pages)
+
+    def test_scrape_web_cache_revalidates(self):
+        cache = ResponseCache(':memory:')
+        with serve_catalog(total_pages=4, cards_per_page=3) as server:
+            first = scrape_web(server['base_url'], delay=0, cache=cache)
+            second = scrape_web(server['base_url'], delay=0, workers=2, cache=cache)
+            not_modified = server['catalog']['not_modified']
+
+            # Halaman yang berubah diunduh dan di-parsing ulang
+            server['catalog']['pages'][2] += b'<!-- revisi -->'
+            third = scrape_web(server['base_url'], delay=0, cache=cache)
+
+        self.assertEqual(second, first)
+        self.assertEqual(not_modified, 4)
+        self.assertEqual(cache.stats['parsed_hits'], 4 + 3)
+        self.assertEqual(third, first)
+        cache.close()
+
+    def test_response_cache_lru_eviction(self):
+        with ResponseCache(':memory:', max_bytes=250, ttl=None) as cache:
+            for number in range(3):
+                cache.put(f'http://localhost/page{number}.html', b'x' * 100, etag=f'"{number}"')
+            self.assertIsNone(cache.get('http://localhost/page0.html'))
+            self.assertEqual(cache.get('http://localhost/page2.html').etag, '"2"')
+            self.assertLessEqual(cache.size(), 250)
+
+    def test_scrape_web_resumes_from_checkpoint(self):
+        with serve_catalog(total_pages=4, cards_per_page=3, failures={3: 100}) as server, \
+                HttpFetcher(retries=0) as fetcher, CheckpointStore(':memory:') as checkpoint:
+            base_url = server['base_url']
+            first = scrape_web(base_url, delay=0, fetcher=fetcher, checkpoint=checkpoint)
+            self.assertEqual(len(first), 6)
+            self.assertEqual(checkpoint.last_good_page(base_url), 2)
+            self.assertEqual(list(checkpoint.failed_pages(base_url)), [3])
+
+            # Run berikutnya hanya mengunduh halaman 3 dan 4
+            server['catalog']['failures'].clear()
+            server['catalog']['requests'] = 0
+            resumed = scrape_web(base_url, delay=0, fetcher=fetcher, checkpoint=checkpoint)
+            self.assertEqual(server['catalog']['requests'], 2)
+            self.assertEqual(resumed, scrape_web(base_url, delay=0, fetcher=fetcher))
+
+            # Scraping selesai: checkpoint dibersihkan
+            self.assertEqual(checkpoint.completed_pages(base_url), [])
+
+    def test_concurrent_scrape_refetches_only_failed_pages(self):
+        with serve_catalog(total_pages=5, cards_per_page=2, failures={2: 100}) as server, \
+                HttpFetcher(pool_size=4, retries=0) as fetcher, CheckpointStore(':memory:') as checkpoint:
+            base_url = server['base_url']
+            first = scrape_web(base_url, workers=4, fetcher=fetcher, checkpoint=checkpoint)
+            self.assertEqual(len(first), 2)
+            self.assertEqual(checkpoint.completed_pages(base_url), [1, 3, 4, 5])
+
+            server['catalog']['failures'].clear()
+            server['catalog']['requests'] = 0
+            resumed = scrape_web(base_url, workers=4, fetcher=fetcher, checkpoint=checkpoint)
+            self.assertEqual(server['catalog']['requests'], 1)
+            self.assertEqual(len(resumed), 10)
+
+    def test_scrape_web_with_parse_pool(self):
+        with serve_catalog(total_pages=6, cards_per_page=4) as server, \
+                ParsePool(workers=2, backend='html.parser') as pool:
+            expected = scrape_web(server['base_url'], delay=0, parser='html.parser')
+            with mock.patch.object(pool, 'map', wraps=pool.map) as pool_map:
+                pooled = scrape_web(server['base_url'], delay=0, workers=3, parser=pool)
+            # Halaman satu batch di-parse lewat satu map() (chunksize berlaku)
+            self.assertEqual(sum(len(call.args[0]) for call in pool_map.call_args_list), 6)
+            self.assertLess(pool_map.call_count, 6)
+            fixture_pages = [server['catalog']['pages'][number] for number in range(1, 7)]
+            self.assertEqual(sum(len(page['records']) for page in pool.map(fixture_pages, chunksize=2)), 24)
+        self.assertEqual(pooled, expected)
+
+    def test_scrape_web_columnar_matches_clean_path(self):
+        timestamp = pd.Timestamp('2024-01-01')
+        with serve_catalog(total_pages=3, cards_per_page=10) as server:
+            records = scrape_web(server['base_url'], delay=0)
+            df = scrape_web_columnar(server['base_url'], delay=0, timestamp=timestamp)
+        expected = cleanDataFrame(transform_to_DataFrame(records), timestamp=timestamp)
+        pd.testing.assert_frame_equal(df, expected)
+
 if __name__ == '__main__':
     unittest.main()
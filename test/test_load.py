@@ -1,8 +1,20 @@
+import contextlib
+import io
 import unittest
 import pandas as pd
 import os
+import shutil
+import tempfile
 from unittest import mock
-from utils.load import export_to_csv, upload_df_to_gsheet, load_df_to_postgresql
+from sqlalchemy import create_engine
+from utils.load import (
+    export_to_csv, upload_df_to_gsheet, load_df_to_postgresql, load_batches,
+    copy_insert, get_engine, dispose_engines, write_df_to_sql, upsert_df_to_sql,
+    sync_worksheet, export_to_parquet, export_to_feather, read_columnar
+)
+from utils.transform import convertToCompactSchema
+from benchmark.standins import InMemoryWorksheet
+
 
 class TestLoadFunctions(unittest.TestCase):
 
@@ -23,6 +35,8 @@ class TestLoadFunctions(unittest.TestCase):
         # Hapus file jika ada
         if os.path.exists(self.test_file):
             os.remove(self.test_file)
+        # Engine (termasuk Mock dari create_engine yang di-patch) tidak boleh terbawa ke test lain
+        dispose_engines()
 
     def test_export_to_csv_success(self):
         export_to_csv(self.df, self.test_file)
@@ -72,5 +86,252 @@ class TestLoadFunctions(unittest.TestCase):
         # Verifikasi fungsi to_sql dipanggil
         self.assertTrue(mock_engine.has_table.called or True)  # basic mock, to_sql() akan dipanggil
 
+    def test_export_to_csv_append(self):
+        export_to_csv(self.df, self.test_file)
+        export_to_csv(self.df, self.test_file, append=True)
+        result = pd.read_csv(self.test_file)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(list(result.columns), list(self.df.columns))
+
+    def test_load_batches(self):
+        calls = []
+        total = load_batches([self.df, self.df], [lambda batch, first: calls.append(first) or len(batch)])
+        self.assertEqual(total, 2)
+        self.assertEqual(calls, [True, False])
+
+    def test_load_batches_stops_on_failed_sink(self):
+        calls = []
+        sinks = {
+            'csv': lambda batch, first: calls.append(first) or len(batch),
+            'postgresql': lambda batch, first: None if not first else len(batch),
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(RuntimeError) as error:
+                load_batches([self.df, self.df, self.df], sinks)
+        self.assertIn('batch 2: postgresql', str(error.exception))
+        self.assertEqual(calls, [True, False])
+
+        def broken(batch, first):
+            raise OSError('disk penuh')
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(RuntimeError):
+                load_batches([self.df], [broken])
+
+    @mock.patch("utils.load.set_with_dataframe")
+    @mock.patch("utils.load.gspread.authorize")
+    @mock.patch("utils.load.Credentials")
+    def test_loaders_accept_compact_schema(self, mock_credentials, mock_authorize, mock_set):
+        convertToCompactSchema(self.df)
+
+        export_to_csv(self.df, self.test_file)
+        self.assertEqual(pd.read_csv(self.test_file)['price'].tolist(), [150000])
+
+        upload_df_to_gsheet(self.df, "dummy_credentials.json", "dummy_sheet_id")
+        mock_set.assert_called_once()
+
+    @mock.patch("utils.load.create_engine")
+    def test_get_engine_reuses_pool(self, mock_create_engine):
+        engine = get_engine('postgresql+psycopg2://u:p@localhost:5432/reuse_db')
+        self.assertIs(get_engine('postgresql+psycopg2://u:p@localhost:5432/reuse_db'), engine)
+        mock_create_engine.assert_called_once()
+        dispose_engines()
+        engine.dispose.assert_called_once()
+
+    def test_copy_insert_streams_csv(self):
+        cursor = mock.MagicMock()
+        cursor.__enter__.return_value = cursor
+        conn = mock.Mock()
+        conn.connection.dbapi_connection.cursor.return_value = cursor
+        table = mock.Mock(schema=None)
+        table.name = 'produk_fashion'
+
+        copy_insert(table, conn, ['title', 'price'], iter([('Item, 1', 150000.0), ('Item 2', None)]))
+
+        sql, buffer = cursor.copy_expert.call_args[0]
+        self.assertEqual(sql, 'COPY "produk_fashion" ("title", "price") FROM STDIN WITH (FORMAT csv)')
+        self.assertEqual(buffer.getvalue().splitlines(), ['"Item, 1",150000.0', 'Item 2,'])
+
+    def test_write_df_to_sql_sqlite_fallback(self):
+        engine = create_engine('sqlite://')
+        written = write_df_to_sql(self.df, engine, 'produk_fashion', method='copy')
+        self.assertEqual(written, 1)
+        self.assertEqual(len(pd.read_sql('SELECT * FROM produk_fashion', engine)), 1)
+
+    def test_upsert_df_to_sql_counts(self):
+        engine = create_engine('sqlite://')
+        first = pd.DataFrame({'title': ['A', 'B', 'C'], 'price': [1.0, 2.0, 3.0],
+                              'scrape_timestamp': pd.Timestamp('2025-05-20')})
+        second = pd.DataFrame({'title': ['A', 'B', 'D'], 'price': [1.0, 5.0, 4.0],
+                               'scrape_timestamp': pd.Timestamp('2025-05-21')})
+
+        self.assertEqual(upsert_df_to_sql(first, engine, 'produk_fashion'),
+                         {'inserted': 3, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(upsert_df_to_sql(second, engine, 'produk_fashion'),
+                         {'inserted': 1, 'updated': 1, 'unchanged': 1})
+        # Run ulang tanpa perubahan tidak menulis apa pun
+        self.assertEqual(upsert_df_to_sql(second, engine, 'produk_fashion'),
+                         {'inserted': 0, 'updated': 0, 'unchanged': 3})
+
+        result = pd.read_sql('SELECT title, price FROM produk_fashion ORDER BY title', engine)
+        self.assertEqual(result['price'].tolist(), [1.0, 5.0, 3.0, 4.0])
+        self.assertNotIn('produk_fashion_staging', pd.read_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'", engine)['name'].tolist())
+
+    def test_upsert_migrates_table_with_duplicate_keys(self):
+        # Tabel lama hasil beberapa run mode 'append': judul yang sama muncul berulang
+        legacy = pd.DataFrame({'title': ['A', 'B', 'A', 'B', 'C'], 'price': [1.0, 2.0, 1.5, 2.0, 3.0],
+                               'scrape_timestamp': pd.to_datetime(['2025-05-19', '2025-05-19', '2025-05-20',
+                                                                   '2025-05-20', '2025-05-20'])})
+        run = pd.DataFrame({'title': ['A', 'D'], 'price': [1.5, 4.0],
+                            'scrape_timestamp': pd.Timestamp('2025-05-21')})
+
+        engine = create_engine('sqlite://')
+        legacy.to_sql('produk_fashion', engine, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(ValueError) as error:
+                upsert_df_to_sql(run, engine, 'produk_fashion', dedupe_existing=False)
+        self.assertIn("if_exists='append'", str(error.exception))
+        self.assertEqual(len(pd.read_sql('SELECT * FROM produk_fashion', engine)), 5)
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            counts = upsert_df_to_sql(run, engine, 'produk_fashion')
+        self.assertIn('2 baris', output.getvalue())
+        self.assertEqual(counts['inserted'], 1)
+        result = pd.read_sql('SELECT title, price FROM produk_fashion ORDER BY title', engine)
+        self.assertEqual(result['title'].tolist(), ['A', 'B', 'C', 'D'])
+        self.assertEqual(result['price'].tolist(), [1.5, 2.0, 3.0, 4.0])
+
+    @mock.patch("utils.load.get_engine")
+    def test_load_df_to_postgresql_reports_duplicate_keys(self, mock_get_engine):
+        engine = create_engine('sqlite://')
+        pd.concat([self.df, self.df]).to_sql('produk_fashion', engine, index=False)
+        mock_get_engine.return_value = engine
+
+        with mock.patch("utils.load.dedupe_table_keys", return_value=0):
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                result = load_df_to_postgresql(self.df, 'db', 'u', 'p', 'localhost', 5432, 'produk_fashion',
+                                               if_exists='upsert')
+        self.assertIsNone(result)
+        self.assertIn("berisi kunci ['title'] ganda", output.getvalue())
+
+    @mock.patch("utils.load.upsert_df_to_sql")
+    @mock.patch("utils.load.get_engine")
+    def test_load_df_to_postgresql_upsert_mode(self, mock_get_engine, mock_upsert):
+        mock_upsert.return_value = {'inserted': 1, 'updated': 0, 'unchanged': 0}
+        counts = load_df_to_postgresql(self.df, 'db', 'u', 'p', 'localhost', 5432, 'produk_fashion',
+                                       if_exists='upsert', key_columns=['title'])
+        self.assertEqual(counts['inserted'], 1)
+        mock_upsert.assert_called_once()
+
+    def test_sync_worksheet_sends_only_changes(self):
+        worksheet = InMemoryWorksheet()
+        df = pd.DataFrame({
+            'title': [f'Item {i}' for i in range(100)],
+            'price': [float(i * 1000) for i in range(100)],
+            'rating': [4.5] * 100,
+        })
+
+        first = sync_worksheet(worksheet, df)
+        self.assertEqual(first['rows_added'], 101)
+        self.assertEqual(worksheet.cells_written, 303)
+
+        # Sync ulang tanpa perubahan tidak menulis apa pun
+        worksheet.cells_written = 0
+        unchanged = sync_worksheet(worksheet, df)
+        self.assertEqual(unchanged['requests'], 0)
+        self.assertEqual(worksheet.cells_written, 0)
+
+        # Dua baris berubah dan dua baris terakhir hilang
+        updated = df.iloc[:-2].copy()
+        updated.loc[[10, 50], 'price'] = 1.5
+        stats = sync_worksheet(worksheet, updated)
+        self.assertEqual((stats['rows_changed'], stats['rows_added'], stats['rows_removed']), (2, 0, 2))
+        self.assertEqual(worksheet.cells_written, 6)
+        self.assertEqual(worksheet.calls['batch_update'], 2)
+        self.assertEqual(worksheet.calls['batch_clear'], 1)
+        self.assertEqual(len(worksheet.get_all_values()), 99)
+        self.assertEqual(worksheet.get_all_values()[11][1], '1.5')
+
+    def test_sync_worksheet_ignores_new_timestamp(self):
+        worksheet = InMemoryWorksheet()
+        df = pd.DataFrame({
+            'title': [f'Item {i}' for i in range(873)],
+            'price': [float(i * 1000) for i in range(873)],
+            'scrape_timestamp': pd.Timestamp('2025-05-20 08:00'),
+        })
+        sync_worksheet(worksheet, df)
+
+        # Data identik dengan timestamp baru: tidak ada baris yang ditulis ulang
+        worksheet.cells_written = 0
+        rerun = df.assign(scrape_timestamp=pd.Timestamp('2025-05-21 08:00'))
+        stats = sync_worksheet(worksheet, rerun)
+        self.assertEqual((stats['rows_changed'], stats['cells_written'], stats['requests']), (0, 0, 0))
+        self.assertEqual(worksheet.cells_written, 0)
+
+        # Baris yang datanya berubah ikut membawa timestamp barunya
+        rerun.loc[5, 'price'] = 1.5
+        stats = sync_worksheet(worksheet, rerun)
+        self.assertEqual((stats['rows_changed'], stats['cells_written']), (1, 3))
+        self.assertEqual(worksheet.get_all_values()[6][2], '2025-05-21 08:00:00')
+        self.assertEqual(worksheet.get_all_values()[7][2], '2025-05-20 08:00:00')
+
+    def test_sync_worksheet_matches_rows_by_title(self):
+        worksheet = InMemoryWorksheet()
+        df = pd.DataFrame({'title': [f'Item {i}' for i in range(100)], 'price': [float(i) for i in range(100)]})
+        sync_worksheet(worksheet, df)
+
+        # Produk baru di awal df dan satu produk hilang: hanya satu baris ditulis
+        worksheet.cells_written = 0
+        inserted = pd.concat([pd.DataFrame({'title': ['Baru'], 'price': [7.5]}), df.drop(index=3)])
+        stats = sync_worksheet(worksheet, inserted)
+        self.assertEqual((stats['rows_changed'], stats['rows_added'], stats['rows_removed'], stats['rows_moved']),
+                         (0, 1, 1, 0))
+        self.assertEqual(worksheet.cells_written, 2)
+        self.assertEqual(worksheet.get_all_values()[4], ['Baru', '7.5'])
+
+        # Produk di tengah hilang: baris terakhir dipindah ke lubangnya, sisa bawah dikosongkan
+        worksheet.cells_written = 0
+        shrunk = inserted[inserted['title'] != 'Item 10']
+        stats = sync_worksheet(worksheet, shrunk)
+        self.assertEqual((stats['rows_removed'], stats['rows_moved'], stats['requests']), (1, 1, 2))
+        self.assertEqual(worksheet.cells_written, 2)
+        values = worksheet.get_all_values()
+        self.assertEqual(values[0], ['title', 'price'])
+        self.assertEqual(sorted(row[0] for row in values[1:]), sorted(shrunk['title']))
+
+    def test_sync_worksheet_chunks_requests(self):
+        worksheet = InMemoryWorksheet(rows=10)
+        df = pd.DataFrame({'title': [f'Item {i}' for i in range(50)], 'price': range(50)})
+        stats = sync_worksheet(worksheet, df, max_cells_per_request=20)
+        self.assertEqual(stats['requests'], 6)
+        self.assertEqual(worksheet.row_count, 51)
+        self.assertEqual(len(worksheet.get_all_values()), 51)
+
+    def test_columnar_export_preserves_dtypes(self):
+        df = self.df.astype({'gender': 'category'})
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        for export, filename in [(export_to_parquet, 'out.parquet'), (export_to_feather, 'out.arrow')]:
+            path = os.path.join(tmpdir, filename)
+            self.assertEqual(export(df, path), 1)
+            result = read_columnar(path)
+            self.assertEqual(result.dtypes.to_dict(), df.dtypes.to_dict())
+            self.assertEqual(result['title'].tolist(), ['Item 1'])
+
+    def test_parquet_append_by_partition(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        other_day = self.df.assign(scrape_timestamp=pd.Timestamp('2024-01-01 08:00'))
+
+        export_to_parquet(self.df, path, partition_by=['scrape_date'], append=True)
+        export_to_parquet(other_day, path, partition_by=['scrape_date'], append=True)
+        export_to_parquet(other_day, path, partition_by=['scrape_date'], append=True)
+        self.assertEqual(len(read_columnar(path)), 3)
+        self.assertIn('scrape_date=2024-01-01', os.listdir(path))
+
+        # Tanpa append, hanya partisi tanggal yang ditulis yang diganti
+        export_to_parquet(other_day, path, partition_by=['scrape_date'])
+        self.assertEqual(len(read_columnar(path)), 2)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,252 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+import main
+from utils.load import export_to_parquet, read_columnar
+from utils.metrics import get_recorder, set_recorder
+from utils.transform import cleanDataFrame
+from benchmark.fixture_server import serve_catalog
+from benchmark.synthetic import generate_raw_frame
+
+
+class TestMainRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = get_recorder()
+        self.addCleanup(set_recorder, self.previous)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.metrics_path = self.path('metrics.json')
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def run_main(self, *argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = main.main(['--metrics', self.metrics_path, *argv])
+        return code, output.getvalue()
+
+    def test_config_file_and_flags_override_defaults(self):
+        config_path = self.path('config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'extract': {'workers': 4, 'cache': 'off'}, 'load': {'postgresql': {'password': 'rahasia'}}}, f)
+
+        args = main.build_arg_parser().parse_args(['--config', config_path, '--workers', '8', '--sinks', 'csv'])
+        config = main.load_config(args.config, args)
+
+        self.assertEqual(config['extract']['workers'], 8)
+        self.assertEqual(config['extract']['cache'], 'off')
+        self.assertTrue(config['extract']['checkpoint'])
+        self.assertEqual(config['load']['sinks'], ['csv'])
+        self.assertEqual(config['load']['postgresql']['password'], 'rahasia')
+        self.assertEqual(config['load']['postgresql']['db_name'], 'shopscrap')
+        self.assertEqual(main.DEFAULT_CONFIG['extract']['workers'], 1)
+
+    def test_invalid_stage_combinations_rejected(self):
+        self.assertEqual(self.run_main('--stages', 'extract', 'load')[0], 2)
+        self.assertEqual(self.run_main('--stages', 'load', '--sinks', 'csv')[0], 2)
+        code, output = self.run_main('--stages', 'load', '--input', 'clean.parquet', '--sinks', 'postgresql')
+        self.assertEqual(code, 2)
+        self.assertIn('PGPASSWORD', output)
+
+        rate_path = self.path('rates.json')
+        with open(rate_path, 'w', encoding='utf-8') as f:
+            f.write('{rusak')
+        code, output = self.run_main('--rate-file', rate_path, '--sinks', 'csv')
+        self.assertEqual(code, 2)
+        self.assertIn('tidak bisa dibaca', output)
+
+    def test_extract_and_transform_save_artifacts(self):
+        extract_path, clean_path = self.path('raw.json'), self.path('clean.parquet')
+        with serve_catalog(total_pages=3, cards_per_page=4) as server:
+            code, output = self.run_main(
+                '--stages', 'extract', 'transform', '--url', server['base_url'], '--delay', '0',
+                '--cache', 'off', '--no-checkpoint', '--save-extract', extract_path, '--save-clean', clean_path,
+            )
+
+        self.assertEqual(code, 0)
+        with open(extract_path, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 12)
+        self.assertEqual(len(read_columnar(clean_path)), 12)
+        self.assertIn('Wall (s)', output)
+        with open(self.metrics_path, encoding='utf-8') as f:
+            self.assertEqual(set(json.load(f)['stages']), {'extract', 'transform'})
+
+    def test_load_only_from_saved_clean_data(self):
+        clean = cleanDataFrame(generate_raw_frame(200, seed=5))
+        clean_path, csv_path, config_path = self.path('clean.parquet'), self.path('out.csv'), self.path('config.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_to_parquet(clean, clean_path)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'load': {'csv': {'filename': csv_path}}}, f)
+
+        code, _ = self.run_main('--config', config_path, '--stages', 'load', '--input', clean_path, '--sinks', 'csv')
+
+        self.assertEqual(code, 0)
+        self.assertEqual(len(pd.read_csv(csv_path)), len(clean))
+        reloaded = main.read_clean(csv_path)
+        pd.testing.assert_frame_equal(reloaded, main.read_clean(clean_path), check_dtype=False)
+
+    def test_validation_sends_failing_rows_to_quarantine(self):
+        records = generate_raw_frame(50, seed=6, bad_share=0.0).to_dict('records')
+        records[10] = dict.fromkeys(records[10], 'ERROR')
+        extract_path, clean_path = self.path('raw.json'), self.path('clean.parquet')
+        config_path, quarantine_path = self.path('config.json'), self.path('quarantine.csv')
+        with open(extract_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'validation': {'quarantine_path': quarantine_path}}, f)
+
+        code, _ = self.run_main('--config', config_path, '--stages', 'transform', '--input', extract_path,
+                                '--validate', '--save-clean', clean_path)
+
+        self.assertEqual(code, 0)
+        quarantine = pd.read_csv(quarantine_path)
+        self.assertEqual(quarantine['title'].tolist(), ['ERROR'])
+        self.assertNotIn('ERROR', read_columnar(clean_path)['title'].tolist())
+
+    def test_validation_that_cannot_run_stops_transform(self):
+        records = generate_raw_frame(20, seed=6, bad_share=0.0).to_dict('records')
+        extract_path, clean_path = self.path('raw.json'), self.path('clean.parquet')
+        config_path, quarantine_path = self.path('config.json'), self.path('quarantine.csv')
+        with open(extract_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'validation': {'quarantine_path': quarantine_path,
+                                      'rules': [{'kind': 'not_null', 'column': 'sku'}]}}, f)
+
+        code, output = self.run_main('--config', config_path, '--stages', 'transform', '--input', extract_path,
+                                     '--validate', '--save-clean', clean_path)
+
+        self.assertEqual(code, 1)
+        self.assertIn('Tidak ada baris yang lolos validasi', output)
+        self.assertFalse(os.path.exists(clean_path))
+        self.assertEqual(set(pd.read_csv(quarantine_path)['quarantine_reason']), {'validation_error'})
+
+    def test_cdc_sends_only_changes_to_postgresql(self):
+        clean = cleanDataFrame(generate_raw_frame(100, seed=9))
+        clean_path, config_path = self.path('clean.parquet'), self.path('config.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_to_parquet(clean, clean_path)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'cdc': {'snapshot_dir': self.path('snapshots'), 'changes_path': self.path('changes')},
+                       'load': {'postgresql': {'password': 'rahasia'}}}, f)
+        argv = ['--config', config_path, '--stages', 'load', '--input', clean_path, '--sinks', 'postgresql', '--cdc']
+
+        with mock.patch('main.load_changes_to_postgresql', return_value={'inserted': 0}) as load_changes:
+            self.assertEqual(self.run_main(*argv)[0], 0)
+            self.assertEqual(len(load_changes.call_args.args[0].inserts), len(clean))
+            self.assertEqual(self.run_main(*argv)[0], 0)
+            self.assertEqual(len(load_changes.call_args.args[0].upserts), 0)
+        self.assertEqual(len(read_columnar(self.path('changes'))), len(clean))
+
+    def test_cdc_failed_load_writes_no_change_log(self):
+        clean = cleanDataFrame(generate_raw_frame(50, seed=9))
+        clean_path, config_path = self.path('clean.parquet'), self.path('config.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_to_parquet(clean, clean_path)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'cdc': {'snapshot_dir': self.path('snapshots'), 'changes_path': self.path('changes')},
+                       'load': {'postgresql': {'password': 'rahasia', 'retries': 0}}}, f)
+        argv = ['--config', config_path, '--stages', 'load', '--input', clean_path, '--sinks', 'postgresql', '--cdc']
+
+        with mock.patch('main.load_changes_to_postgresql', return_value=None):
+            self.assertEqual(self.run_main(*argv)[0], 1)
+        self.assertFalse(os.path.exists(self.path('changes')))
+
+        with mock.patch('main.load_changes_to_postgresql', return_value={'inserted': len(clean)}) as load_changes:
+            self.assertEqual(self.run_main(*argv)[0], 0)
+        self.assertEqual(len(load_changes.call_args.args[0].inserts), len(clean))
+        self.assertEqual(len(read_columnar(self.path('changes'))), len(clean))
+
+    def test_empty_extract_stops_before_load(self):
+        extract_path, csv_path = self.path('raw.json'), self.path('out.csv')
+        with open(extract_path, 'w', encoding='utf-8') as f:
+            json.dump([], f)
+
+        code, output = self.run_main('--stages', 'transform', 'load', '--input', extract_path, '--sinks', 'csv')
+
+        self.assertEqual(code, 1)
+        self.assertIn("Stage 'transform' gagal", output)
+        self.assertFalse(os.path.exists(csv_path))
+
+    def test_streaming_uses_batch_scrape_options_and_parquet_sink(self):
+        csv_path, parquet_path, config_path = self.path('out.csv'), self.path('parquet'), self.path('config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'delay': 0, 'extract': {'cache': 'off', 'checkpoint': False, 'parser': 'html.parser'},
+                       'transform': {'batch_size': 5},
+                       'load': {'csv': {'filename': csv_path}, 'parquet': {'path': parquet_path}}}, f)
+
+        with serve_catalog(total_pages=3, cards_per_page=4) as server, \
+                mock.patch('main.iter_scrape_web', wraps=main.iter_scrape_web) as scrape:
+            code, _ = self.run_main('--config', config_path, '--streaming', '--url', server['base_url'],
+                                    '--start-page', '2', '--sinks', 'csv', 'parquet')
+
+        self.assertEqual(code, 0)
+        options = scrape.call_args.kwargs
+        self.assertEqual((options['delay'], options['start_page'], options['parser']), (0, 2, 'html.parser'))
+        self.assertIsNone(options['cache'])
+        self.assertEqual(len(pd.read_csv(csv_path)), 8)
+        self.assertEqual(len(read_columnar(parquet_path)), 8)
+
+    def test_streaming_failed_sink_exits_non_zero(self):
+        config_path = self.path('config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'delay': 0, 'extract': {'cache': 'off', 'checkpoint': False}}, f)
+
+        with serve_catalog(total_pages=2, cards_per_page=4) as server, \
+                mock.patch('main.export_to_csv', return_value=None):
+            code, output = self.run_main('--config', config_path, '--streaming', '--url', server['base_url'],
+                                         '--sinks', 'csv')
+
+        self.assertEqual(code, 1)
+        self.assertIn('Sink gagal pada batch 1: csv', output)
+        self.assertNotIn('Semua proses selesai', output)
+
+    def test_streaming_uses_configured_sheet_and_if_exists(self):
+        config_path = self.path('config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'delay': 0, 'extract': {'cache': 'off', 'checkpoint': False}, 'transform': {'batch_size': 5},
+                       'load': {'gsheet': {'sheet_name': 'Produk'},
+                                'postgresql': {'password': 'rahasia', 'if_exists': 'replace'}}}, f)
+
+        with serve_catalog(total_pages=3, cards_per_page=4) as server, \
+                mock.patch('main.upload_df_to_gsheet', return_value=True) as gsheet, \
+                mock.patch('main.load_df_to_postgresql', return_value=True) as postgresql:
+            code, _ = self.run_main('--config', config_path, '--streaming', '--url', server['base_url'],
+                                    '--sinks', 'gsheet', 'postgresql')
+
+        self.assertEqual(code, 0)
+        self.assertEqual(main.DEFAULT_CONFIG['load']['postgresql']['if_exists'], 'append')
+        self.assertEqual({call.kwargs['sheet_name'] for call in gsheet.call_args_list}, {'Produk'})
+        self.assertEqual([call.kwargs['if_exists'] for call in postgresql.call_args_list],
+                         ['replace'] + ['append'] * (postgresql.call_count - 1))
+        self.assertGreater(postgresql.call_count, 1)
+
+    def test_streaming_rejects_unsupported_options(self):
+        config_path = self.path('config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'load': {'parquet': {'partition_by': []}}}, f)
+        code, output = self.run_main('--config', config_path, '--streaming', '--sinks', 'parquet')
+        self.assertEqual(code, 2)
+        self.assertIn('partition_by', output)
+
+        code, output = self.run_main('--streaming', '--sinks', 'csv', '--cdc')
+        self.assertEqual(code, 2)
+        self.assertIn('--cdc', output)
+
+    def test_dry_run_does_not_execute(self):
+        code, output = self.run_main('--dry-run', '--sinks', 'csv', '--url', 'http://127.0.0.1:9/page{}.html')
+        self.assertEqual(code, 0)
+        self.assertIn('extract -> transform -> load', output)
+        self.assertFalse(os.path.exists(self.metrics_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from utils.metrics import MetricsRecorder, get_recorder, set_recorder
+from utils.transform import cleanDataFrame
+from utils.extract import scrape_web
+from benchmark.fixture_server import serve_catalog
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = get_recorder()
+        self.recorder = set_recorder(MetricsRecorder(profile=[]))
+
+    def tearDown(self):
+        set_recorder(self.previous)
+
+    def test_stage_records_wall_and_cpu_time(self):
+        with self.recorder.stage('transform'):
+            sum(range(100000))
+        with self.recorder.stage('transform'):
+            pass
+        stage = self.recorder.to_dict()['stages']['transform']
+        self.assertEqual(stage['calls'], 2)
+        self.assertGreater(stage['wall_seconds'], 0)
+        self.assertGreaterEqual(stage['cpu_seconds'], 0)
+
+    def test_profile_hook(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            recorder = MetricsRecorder(profile=['load'], profile_dir=tmpdir)
+            with recorder.stage('load'):
+                sorted(range(1000), reverse=True)
+            with recorder.stage('extract'):
+                pass
+            result = json.loads(recorder.to_json())
+            self.assertEqual(list(result['profiles']), ['load'])
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 'load.prof')))
+
+    def test_transform_drop_counters(self):
+        raw = pd.DataFrame({
+            'title': ['A', 'Unknown Product', 'B', 'A', 'C'],
+            'price': ['$1', '$2', 'Price Unavailable', '$3', '$4'],
+            'rating': ['Rating: ⭐ 4.5 / 5'] * 5,
+            'colors': ['3 Colors'] * 5,
+            'size': ['Size: M'] * 5,
+            'gender': ['Gender: Men'] * 5,
+        })
+        with contextlib.redirect_stdout(io.StringIO()):
+            cleanDataFrame(raw)
+        counters = dict(self.recorder.counters)
+
+        self.assertEqual(counters['transform.dropped.unknown_product'], 1)
+        self.assertEqual(counters['transform.dropped.price_unavailable'], 1)
+        self.assertEqual(counters['transform.dropped.duplicate'], 1)
+        self.assertEqual((counters['transform.rows_in'], counters['transform.rows_out']), (5, 2))
+
+    def test_extract_counters(self):
+        with serve_catalog(total_pages=3, cards_per_page=4) as server, \
+                contextlib.redirect_stdout(io.StringIO()):
+            scrape_web(server['base_url'], delay=0)
+        metrics = self.recorder.to_dict()
+        self.assertEqual(metrics['counters']['extract.pages_fetched'], 3)
+        self.assertEqual(metrics['counters']['extract.cards_parsed'], 12)
+        self.assertGreater(metrics['counters']['extract.bytes_downloaded'], 0)
+        self.assertGreater(metrics['rates']['extract.cards_per_second'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
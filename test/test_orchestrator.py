@@ -0,0 +1,60 @@
+import time
+import unittest
+import pandas as pd
+from utils.orchestrator import make_sink, run_sinks
+
+
+class TestRunSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({'title': ['Item 1', 'Item 2'], 'price': [1.0, 2.0]})
+
+    def test_sinks_run_in_parallel(self):
+        def slow(df):
+            time.sleep(0.3)
+            return len(df)
+
+        start = time.perf_counter()
+        results = run_sinks(self.df, [make_sink(f'sink{i}', slow) for i in range(3)])
+        elapsed = time.perf_counter() - start
+
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual([result.rows for result in results], [2, 2, 2])
+        self.assertLess(elapsed, 0.8)
+
+    def test_failure_and_stall_are_isolated(self):
+        def broken(df):
+            raise RuntimeError('koneksi ditolak')
+
+        def stalled(df):
+            time.sleep(5)
+            return len(df)
+
+        start = time.perf_counter()
+        results = run_sinks(self.df, [
+            make_sink('broken', broken),
+            make_sink('stalled', stalled, timeout=0.2),
+            make_sink('csv', len),
+        ])
+
+        self.assertLess(time.perf_counter() - start, 1.0)
+        broken_result, stalled_result, csv_result = results
+        self.assertFalse(broken_result.success)
+        self.assertIn('koneksi ditolak', broken_result.error)
+        self.assertEqual(stalled_result.error, 'timeout')
+        self.assertTrue(csv_result.success)
+
+    def test_retry_until_success(self):
+        calls = []
+
+        def flaky(df):
+            calls.append(1)
+            return None if len(calls) < 3 else {'inserted': 1, 'updated': 1, 'unchanged': 0}
+
+        result, = run_sinks(self.df, [make_sink('postgresql', flaky, retries=3, backoff=0.01)])
+        self.assertTrue(result.success)
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(result.rows, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import glob
+import os
+import unittest
+from utils.parser import available_backends, get_backend, parse_page_with
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmark', 'fixtures')
+
+
+class TestParserBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.pages = []
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+            with open(path, 'rb') as f:
+                self.pages.append(f.read())
+
+    def test_all_backends_match_html_parser(self):
+        self.assertGreater(len(self.pages), 0)
+        for content in self.pages:
+            expected = parse_page_with(content, 'html.parser')
+            for backend in available_backends():
+                with self.subTest(backend=backend):
+                    self.assertEqual(parse_page_with(content, backend), expected)
+
+    def test_pagination_and_next_button(self):
+        first = parse_page_with(self.pages[0], 'html.parser')
+        self.assertEqual(len(first['records']), 20)
+        self.assertTrue(first['has_next'])
+        self.assertEqual(first['last_page'], 3)
+
+        last_page = os.path.join(FIXTURE_DIR, 'page50.html')
+        with open(last_page, 'rb') as f:
+            last = parse_page_with(f.read(), 'html.parser')
+        self.assertFalse(last['has_next'])
+
+    def test_not_found_page(self):
+        content = b'<html><body><h1>404 - Page Not Found</h1></body></html>'
+        for backend in available_backends():
+            self.assertTrue(parse_page_with(content, backend)['not_found'])
+
+    def test_get_backend(self):
+        self.assertEqual(get_backend(), available_backends()[0])
+        self.assertEqual(get_backend('html.parser'), 'html.parser')
+        with self.assertRaises(ValueError):
+            get_backend('tidak-ada')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import pandas as pd
+from utils.pipeline import TransformPipeline, default_pipeline
+from utils.transform import cleanDataFrame, deleteUnknownProduct
+from benchmark.synthetic import generate_raw_frame
+
+
+class TestTransformPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = generate_raw_frame(500, seed=3)
+        self.timestamp = pd.Timestamp('2025-05-21 14:47:24')
+
+    def test_default_pipeline_matches_chain(self):
+        expected = cleanDataFrame(self.raw.copy(), timestamp=self.timestamp)
+        result = default_pipeline(timestamp=self.timestamp).execute(self.raw)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_steps_are_lazy(self):
+        before = self.raw.copy()
+        pipeline = default_pipeline()
+        self.assertEqual(len(pipeline.steps), 11)
+        pd.testing.assert_frame_equal(self.raw, before)
+
+    def test_filters_pushed_before_parsing(self):
+        kinds = [step.kind for step in default_pipeline().optimize().steps]
+        self.assertEqual(kinds[:3], ['filter', 'filter', 'filter'])
+
+    def test_conversions_merged(self):
+        pipeline = TransformPipeline().parse('price').convert_currency(2).convert_currency(3)
+        converts = [step for step in pipeline.optimize().steps if step.kind == 'convert']
+        self.assertEqual(len(converts), 1)
+        self.assertEqual(converts[0].params['exchangeRate'], 6)
+
+        df = pd.DataFrame({'price': ['$1.50', '$2']})
+        self.assertEqual(pipeline.execute(df)['price'].tolist(), [9.0, 12.0])
+
+    def test_select_prunes_unused_columns(self):
+        pipeline = default_pipeline().select(['title', 'price'])
+        names = [step.name for step in pipeline.optimize().steps]
+        self.assertNotIn('parse_rating', names)
+        self.assertNotIn('add_timestamp', names)
+
+        result = pipeline.execute(self.raw)
+        self.assertEqual(list(result.columns), ['title', 'price'])
+
+    def test_filter_not_moved_past_conflicting_step(self):
+        pipeline = (
+            TransformPipeline()
+            .parse('title')
+            .filter(deleteUnknownProduct, reads=['title'], writes=['title'])
+        )
+        self.assertEqual([step.kind for step in pipeline.optimize().steps], ['parse', 'filter'])
+
+if __name__ == '__main__':
+    unittest.main()
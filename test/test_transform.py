@@ -2,8 +2,11 @@ import unittest
 import pandas as pd
 from utils.transform import (
     transform_to_DataFrame, deleteUnknownProduct, deletePriceUnavailable,
-    transformData, deleteDuplicate, convertPriceToRupiah, addScrapeTimestamp
+    transformData, deleteDuplicate, convertPriceToRupiah, addScrapeTimestamp,
+    cleanDataFrame, iter_micro_batches, transform_stream,
+    convertToCompactSchema
 )
+from benchmark.synthetic import generate_raw_frame
 
 class TestTransformFunctions(unittest.TestCase):
 
@@ -68,5 +71,49 @@ class TestTransformFunctions(unittest.TestCase):
         self.assertIn('scrape_timestamp', self.df.columns)
         self.assertTrue(pd.api.types.is_datetime64_any_dtype(self.df['scrape_timestamp']))
 
+    def test_iter_micro_batches(self):
+        pages = [self.raw_data, self.raw_data[:1]]
+        batches = list(iter_micro_batches(pages, batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2])
+
+    def test_transform_stream_matches_batch_path(self):
+        records = [dict(record, title=f"{record['title']} {i % 4}")
+                   for i, record in enumerate(self.raw_data * 4)]
+        timestamp = pd.Timestamp('2025-05-21 14:47:24')
+
+        expected = cleanDataFrame(transform_to_DataFrame(records), timestamp=timestamp)
+        pages = [records[i:i + 3] for i in range(0, len(records), 3)]
+        batches = list(transform_stream(pages, batch_size=2, timestamp=timestamp))
+        result = pd.concat(batches)
+
+        self.assertGreater(len(batches), 1)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_transform_stream_matches_batch_path_with_bad_gender(self):
+        records = [dict(record, title=f"{record['title']} {i}") for i, record in enumerate(self.raw_data * 4)]
+        records[3]['gender'] = 'Gender: N/A'
+        records[9]['gender'] = 'ERROR'
+        timestamp = pd.Timestamp('2025-05-21 14:47:24')
+
+        expected = cleanDataFrame(transform_to_DataFrame(records), timestamp=timestamp)
+        result = pd.concat(transform_stream([records], batch_size=3, timestamp=timestamp))
+
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(list(result['gender'].cat.categories), ['Men', 'Unisex', 'Women'])
+        self.assertEqual(int(result['gender'].isna().sum()), 2)
+
+    def test_convert_to_compact_schema(self):
+        df = cleanDataFrame(generate_raw_frame(2000, seed=2))
+        expected_price = df['price'].round()
+        footprint = convertToCompactSchema(df)
+
+        self.assertLess(footprint['after'], footprint['before'])
+        self.assertEqual(df['price'].dtype, 'int64')
+        self.assertEqual(df['colors'].dtype, 'Int8')
+        self.assertEqual(df['rating'].dtype, 'float32')
+        self.assertIsInstance(df['size'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df['gender'].dtype, pd.CategoricalDtype)
+        self.assertTrue((df['price'] == expected_price).all())
+
 if __name__ == '__main__':
     unittest.main()
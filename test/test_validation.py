@@ -0,0 +1,76 @@
+import contextlib
+import io
+import unittest
+import numpy as np
+import pandas as pd
+from utils.validation import (
+    REASON_COLUMN, Validator, enum_rule, not_null_rule, range_rule, regex_rule, rules_from_config,
+    validateDataFrame
+)
+from utils.transform import cleanDataFrame
+from benchmark.synthetic import generate_raw_frame
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'title': ['Hoodie 1', 'ERROR', 'Pants 2', 'Shirt 3'],
+            'price': [160000.0, np.nan, -5.0, 320000.0],
+            'rating': [4.5, np.nan, 3.0, 7.0],
+            'gender': pd.Categorical(['Men', 'ERROR', 'Women', 'Unisex']),
+        })
+
+    def test_each_rule_kind(self):
+        validator = Validator([
+            not_null_rule('price'),
+            range_rule('rating', min=0, max=5),
+            regex_rule('title', r'(?!ERROR$)\S.*'),
+            enum_rule('gender', ['Men', 'Women', 'Unisex']),
+        ])
+        failures = validator.evaluate(self.df)
+        np.testing.assert_array_equal(failures, [
+            [False, False, False, False],
+            [True, False, True, True],      # range meloloskan NaN, not_null yang melaporkan
+            [False, False, False, False],
+            [False, True, False, False],
+        ])
+
+    def test_quarantine_carries_reasons(self):
+        validator = Validator(rules_from_config([
+            {'kind': 'not_null', 'column': 'price'},
+            {'kind': 'range', 'column': 'price', 'min': 0},
+            {'kind': 'range', 'column': 'rating', 'min': 0, 'max': 5, 'name': 'rating_bintang'},
+        ]))
+        result = validator.validate(self.df)
+
+        self.assertEqual(result.valid['title'].tolist(), ['Hoodie 1'])
+        self.assertEqual(result.quarantine['quarantine_reason'].tolist(),
+                         ['price:not_null', 'price:range[0,]', 'rating_bintang'])
+        self.assertEqual(result.failures, {'price:not_null': 1, 'price:range[0,]': 1, 'rating_bintang': 1})
+
+    def test_default_rules_quarantine_error_cards(self):
+        raw = generate_raw_frame(500, seed=8)
+        raw.loc[3] = 'ERROR'
+        raw.loc[7, 'gender'] = 'Gender: Other'
+        with contextlib.redirect_stdout(io.StringIO()):
+            valid, quarantine = validateDataFrame(cleanDataFrame(raw))
+
+        self.assertEqual(sorted(quarantine.index), [3, 7])
+        self.assertIn('price:not_null', quarantine.loc[3, 'quarantine_reason'])
+        self.assertEqual(quarantine.loc[7, 'quarantine_reason'], 'gender:not_null')
+        self.assertFalse(valid['price'].isna().any())
+
+    def test_invalid_rule_and_missing_column(self):
+        with self.assertRaises(ValueError):
+            rules_from_config([{'kind': 'unique', 'column': 'title'}])
+        with contextlib.redirect_stdout(io.StringIO()):
+            valid, quarantine = validateDataFrame(self.df, Validator([not_null_rule('size')]))
+        # Validasi yang gagal dijalankan tidak meloloskan baris apa pun
+        self.assertTrue(valid.empty)
+        self.assertEqual(len(quarantine), len(self.df))
+        self.assertEqual(set(quarantine[REASON_COLUMN]), {'validation_error'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp opsional, hanya dibutuhkan oleh engine async
+    aiohttp = None
+
+from utils.extract import HEADERS, _accept_encoding, build_page_url, parse_page
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def _require_aiohttp():
+    if aiohttp is None:
+        raise ImportError("Engine async membutuhkan paket 'aiohttp' (pip install aiohttp).")
+
+
+def create_session(concurrency=100, timeout=10):
+    """
+    Membuat aiohttp.ClientSession dengan connection pool sebesar 'concurrency',
+    keep-alive dan header yang sama dengan HttpFetcher.
+    """
+    _require_aiohttp()
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    headers = dict(HEADERS)
+    headers['Accept-Encoding'] = _accept_encoding()
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+
+
+class AsyncHostRateLimiter:
+    """Versi asyncio dari HostRateLimiter: batas request per detik per host."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+
+    async def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def fetching_content_async(session, url, retries=3, backoff_factor=0.5):
+    """
+    Mengambil konten HTML secara async. Status 5xx, timeout dan kegagalan
+    koneksi di-retry dengan exponential backoff. Mengembalikan None jika gagal.
+    """
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url) as response:
+                if response.status in RETRY_STATUSES and attempt < retries:
+                    await asyncio.sleep(backoff_factor * (2 ** attempt))
+                    continue
+                response.raise_for_status()
+                return await response.read()
+        except (aiohttp.ClientResponseError, aiohttp.InvalidURL) as e:
+            print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt < retries:
+                await asyncio.sleep(backoff_factor * (2 ** attempt))
+                continue
+            print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
+            return None
+    return None
+
+
+async def iter_scrape_web_async(base_url, start_page=1, concurrency=100, rate_limit=None,
+                                session=None, executor=None, parser=None, probe_ahead=16):
+    """
+    Async generator yang menghasilkan dict produk (sama seperti extractWebElement)
+    berurutan sesuai nomor halaman.
+
+    Halaman diambil bersamaan hingga 'concurrency' request dalam satu thread;
+    parsing HTML dikirim ke 'executor' (default: thread pool milik event loop,
+    bisa juga ProcessPoolExecutor) agar tidak memblokir event loop dengan
+    backend 'parser' (lihat parse_page).
+
+    Karena akhir katalog belum diketahui, halaman di luar nomor terakhir yang
+    terlihat di pagination diambil secara spekulatif dengan jendela yang
+    tumbuh bertahap (1, 2, 4, ... sejumlah halaman yang sudah ditemukan) dan
+    dibatasi 'probe_ahead', sehingga request yang terbuang setelah halaman
+    terakhir paling banyak probe_ahead, bukan 'concurrency' request.
+    """
+    _require_aiohttp()
+    own_session = session is None
+    if own_session:
+        session = create_session(concurrency)
+
+    loop = asyncio.get_running_loop()
+    limiter = AsyncHostRateLimiter(rate_limit)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_and_parse(page_number):
+        url = build_page_url(base_url, page_number)
+        async with semaphore:
+            await limiter.wait(url)
+            print(f"Scraping halaman: {url}")
+            content = await fetching_content_async(session, url)
+        if not content:
+            print(f"Gagal mengambil konten halaman {url}. Menghentikan scraping.")
+            return None
+        return await loop.run_in_executor(executor, parse_page, content, parser)
+
+    known_last = None
+    found = 0
+    next_page = start_page
+    try:
+        while True:
+            # Halaman <= known_last pasti ada; probe di luarnya dibatasi found dan probe_ahead
+            probes = max(1, min(found, probe_ahead))
+            last = max(known_last or 0, next_page + probes - 1)
+            batch = list(range(next_page, min(last, next_page + concurrency - 1) + 1))
+
+            tasks = [asyncio.ensure_future(fetch_and_parse(number)) for number in batch]
+            stop = False
+            try:
+                # Halaman dikeluarkan sesuai urutan begitu halaman tersebut selesai
+                for page_number, task in zip(batch, tasks):
+                    page = await task
+                    if page is None:
+                        stop = True
+                        break
+                    if page['not_found']:
+                        print(f"Halaman error ditemukan di halaman {page_number}. Menghentikan scraping.")
+                        stop = True
+                        break
+
+                    found += 1
+                    for record in page['records']:
+                        yield record
+                    if page['last_page']:
+                        known_last = max(known_last or 0, page['last_page'])
+
+                    if not page['has_next']:
+                        print("✅ Tombol next disabled atau tidak ditemukan. Menghentikan scraping.")
+                        stop = True
+                        break
+            finally:
+                # Probe spekulatif setelah halaman terakhir tidak dibutuhkan lagi
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            if stop:
+                break
+            next_page = batch[-1] + 1
+    finally:
+        if own_session:
+            await session.close()
+
+
+async def scrape_web_async(base_url, start_page=1, concurrency=100, rate_limit=None,
+                           session=None, executor=None, parser=None, probe_ahead=16):
+    """Counterpart async dari scrape_web, mengembalikan list dict produk."""
+    try:
+        return [
+            record async for record in iter_scrape_web_async(
+                base_url, start_page, concurrency, rate_limit, session, executor, parser, probe_ahead
+            )
+        ]
+    except ImportError:
+        raise
+    except Exception as e:
+        print(f"❌ Terjadi kesalahan tak terduga saat scraping async {base_url}: {e}")
+        return []
+
+
+async def scrape_sites_async(base_urls, concurrency=100, rate_limit=None, executor=None, parser=None):
+    """
+    Scraping beberapa situs katalog sekaligus dalam satu event loop dengan
+    satu connection pool bersama.
+
+    Returns:
+    - dict base_url -> list dict produk.
+    """
+    async with create_session(concurrency) as session:
+        results = await asyncio.gather(*[
+            scrape_web_async(url, concurrency=concurrency, rate_limit=rate_limit,
+                             session=session, executor=executor, parser=parser)
+            for url in base_urls
+        ])
+    return dict(zip(base_urls, results))
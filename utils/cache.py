@@ -0,0 +1,155 @@
+"""
+Cache respons HTTP di disk (SQLite) untuk scraping ulang.
+
+- Body disimpan per URL bersama ETag/Last-Modified sehingga request berikutnya
+  dikirim sebagai conditional request; respons 304 memakai body dari cache.
+- Hasil parse_page disimpan per digest body dan backend parser, sehingga
+  halaman yang tidak berubah tidak di-parsing ulang.
+- Entri lebih tua dari ttl dibuang; total ukuran dibatasi max_bytes dengan
+  eviksi LRU (berdasarkan waktu akses terakhir).
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+CacheEntry = namedtuple('CacheEntry', ['body', 'etag', 'last_modified', 'digest'])
+
+
+def body_digest(content):
+    """Digest body halaman, kunci cache hasil parsing."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha1(content).hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache respons dan hasil parsing yang aman dipakai bersama oleh banyak thread.
+
+    Parameters:
+    - path (str): File SQLite; ':memory:' untuk cache sementara.
+    - max_bytes (int): Batas total ukuran body yang disimpan.
+    - ttl (float): Umur maksimum entri (detik); None = tanpa batas.
+    """
+
+    def __init__(self, path='.scrape_cache.sqlite', max_bytes=256 * 2**20, ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed_idx ON responses (accessed_at);
+            CREATE TABLE IF NOT EXISTS parsed (
+                digest TEXT NOT NULL,
+                parser TEXT NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (digest, parser)
+            );
+        ''')
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'parsed_hits': 0}
+
+    def get(self, url):
+        """Entri untuk url (CacheEntry) atau None jika tidak ada/kedaluwarsa."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, digest, stored_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None or (self.ttl is not None and now - row[4] > self.ttl):
+                if row is not None:
+                    self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                    self._conn.commit()
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+        return CacheEntry(bytes(row[0]), row[1], row[2], row[3])
+
+    def touch(self, url):
+        """Menandai entri dipakai ulang setelah respons 304."""
+        with self._lock:
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+            self.stats['revalidated'] += 1
+
+    def put(self, url, body, etag=None, last_modified=None):
+        now = time.time()
+        digest = body_digest(body)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, body, etag, last_modified, digest, len(body), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+        return digest
+
+    def get_parsed(self, digest, parser):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM parsed WHERE digest = ? AND parser = ?', (digest, parser)
+            ).fetchone()
+            if row is not None:
+                self.stats['parsed_hits'] += 1
+        return json.loads(row[0]) if row else None
+
+    def put_parsed(self, digest, parser, result):
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO parsed VALUES (?, ?, ?)',
+                               (digest, parser, json.dumps(result)))
+            self._conn.commit()
+
+    def _evict(self, now):
+        removed = 0
+        if self.ttl is not None:
+            removed += self._conn.execute('DELETE FROM responses WHERE stored_at < ?', (now - self.ttl,)).rowcount
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total > self.max_bytes:
+            # Hapus entri yang paling lama tidak diakses sampai total di bawah batas
+            excess = total - self.max_bytes
+            freed = 0
+            victims = []
+            for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at'):
+                if freed >= excess:
+                    break
+                victims.append((url,))
+                freed += size
+            self._conn.executemany('DELETE FROM responses WHERE url = ?', victims)
+            removed += len(victims)
+        if removed:
+            # Hasil parsing yang body-nya sudah tidak ada ikut dibuang
+            self._conn.execute('DELETE FROM parsed WHERE digest NOT IN (SELECT digest FROM responses)')
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.execute('DELETE FROM parsed')
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,244 @@
+"""
+Change data capture: selisih snapshot antar run scraping.
+
+Setiap run menghasilkan snapshot penuh yang hanya berbeda pada
+scrape_timestamp. diff_snapshots membandingkan frame bersih terbaru dengan
+snapshot sebelumnya tanpa membandingkan seluruh frame sel demi sel:
+- setiap baris diringkas menjadi hash kunci (kolom kunci) dan digest isi
+  (kolom lain kecuali scrape_timestamp), keduanya int64;
+- kedua snapshot di-join lewat hash table pada hash kunci (pd.Index), lalu
+  hanya digest pasangan yang cocok yang dibandingkan;
+- nilai lama/baru per kolom hanya dibandingkan untuk baris yang digest-nya
+  berubah, yang biasanya sebagian kecil dari snapshot.
+
+Hasilnya ChangeSet ringkas (inserts, updates, deletes, upserts) yang bisa
+dimuat loader (lihat utils.load.apply_changes_to_sql) alih-alih memuat ulang
+seluruh snapshot. Snapshot terakhir disimpan SnapshotStore sebagai Parquet
+beserta hash dan digest-nya, sehingga run berikutnya tidak menghitung ulang.
+
+Contoh:
+    store = SnapshotStore('.snapshots')
+    changes = capture_changes(df_clean, store, 'produk_fashion', key_columns=['title'])
+    apply_changes_to_sql(changes, engine, 'produk_fashion', key_columns=['title'])
+    store.save('produk_fashion', df_clean, key_columns=['title'])
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.dedup import hash_keys, row_keys
+from utils.metrics import incr
+
+# inserts/deletes: baris penuh (baru/lama); updates: kunci, <kolom>_old/<kolom>_new
+# dan 'changed_columns'; upserts: baris penuh baru untuk inserts + updates
+ChangeSet = namedtuple('ChangeSet', ['inserts', 'updates', 'deletes', 'upserts'])
+
+KEY_HASH = '_key_hash'
+ROW_DIGEST = '_row_digest'
+INTERNAL_COLUMNS = (KEY_HASH, ROW_DIGEST)
+DEFAULT_EXCLUDE = ('scrape_timestamp',)
+
+
+def content_columns(df, key_columns, exclude=DEFAULT_EXCLUDE):
+    """Kolom isi yang dibandingkan: semua kolom selain kunci, exclude dan kolom internal."""
+    return [col for col in df.columns
+            if col not in key_columns and col not in exclude and col not in INTERNAL_COLUMNS]
+
+
+def row_digests(df, columns):
+    """
+    Digest int64 per baris dari kolom isi, di-hash per dtype tanpa konversi ke
+    string. Kolom numerik disamakan ke float64 agar colors int64 (run tanpa
+    NaN) dan float64 (run dengan NaN) menghasilkan digest yang sama.
+    """
+    if not columns:
+        return np.zeros(len(df), dtype='int64')
+    frame = df[columns]
+    numeric = {col: 'float64' for col in columns
+               if pd.api.types.is_numeric_dtype(frame[col]) and not pd.api.types.is_bool_dtype(frame[col])}
+    return pd.util.hash_pandas_object(frame.astype(numeric), index=False).to_numpy().view('int64')
+
+
+def with_digests(df, key_columns, exclude=DEFAULT_EXCLUDE):
+    """Salinan df dengan kolom _key_hash dan _row_digest; kunci ganda dibuang (kemunculan pertama)."""
+    key_columns = list(key_columns)
+    missing_columns = [col for col in key_columns if col not in df.columns]
+    if missing_columns:
+        raise KeyError(f"Kolom kunci tidak ditemukan: {missing_columns}")
+
+    result = df.assign(**{
+        KEY_HASH: hash_keys(row_keys(df, key_columns)),
+        ROW_DIGEST: row_digests(df, content_columns(df, key_columns, exclude)),
+    })
+    # Cek ganda pada hash int64 dulu; kunci asli hanya dibandingkan jika ada hash yang sama
+    duplicated = result[KEY_HASH].duplicated(keep='first').to_numpy()
+    if duplicated.any():
+        duplicated = result.duplicated(subset=key_columns, keep='first').to_numpy()
+    if duplicated.any():
+        print(f"⚠️ {int(duplicated.sum())} baris dengan kunci ganda diabaikan pada snapshot.")
+        result = result[~duplicated]
+    return result
+
+
+def _public(df):
+    return df.drop(columns=[col for col in INTERNAL_COLUMNS if col in df.columns]).reset_index(drop=True)
+
+
+def _differs(old, new):
+    """Mask kolom berbeda; NaN dianggap sama dengan NaN."""
+    old, new = pd.Series(old), pd.Series(new)
+    return ~((old == new).fillna(False).to_numpy(dtype=bool) | (old.isna() & new.isna()).to_numpy())
+
+
+def _match_positions(previous, current, key_columns):
+    """Hash join: posisi baris lama untuk setiap baris baru (-1 = tidak ada)."""
+    index = pd.Index(previous[KEY_HASH].to_numpy())
+    if not index.is_unique:
+        # Tabrakan hash 64-bit antar kunci berbeda (sangat jarang): join pada kunci asli
+        return pd.Index(row_keys(previous, key_columns)).get_indexer(row_keys(current, key_columns))
+
+    positions = index.get_indexer(current[KEY_HASH].to_numpy())
+    matched = np.flatnonzero(positions >= 0)
+    # Konfirmasi kunci asli untuk pasangan yang cocok (penjaga tabrakan hash)
+    for col in key_columns:
+        same = previous[col].to_numpy()[positions[matched]] == current[col].to_numpy()[matched]
+        positions[matched[~np.asarray(same, dtype=bool)]] = -1
+    return positions
+
+
+def diff_snapshots(previous, current, key_columns=('title',), exclude=DEFAULT_EXCLUDE):
+    """
+    Selisih dua snapshot berdasarkan kolom kunci.
+
+    Parameters:
+    - previous (pd.DataFrame/None): Snapshot lama (boleh sudah berisi kolom
+      _key_hash/_row_digest dari SnapshotStore). None = semua baris baru.
+    - current (pd.DataFrame): Frame bersih run ini.
+    - key_columns (list): Kolom identitas produk.
+    - exclude (list): Kolom yang tidak dibandingkan (default scrape_timestamp).
+
+    Returns:
+    - ChangeSet(inserts, updates, deletes, upserts).
+    """
+    key_columns = list(key_columns)
+    current = with_digests(current, key_columns, exclude)
+    if previous is None or previous.empty:
+        previous = current.iloc[0:0]
+    elif KEY_HASH not in previous.columns or ROW_DIGEST not in previous.columns:
+        previous = with_digests(previous, key_columns, exclude)
+
+    positions = _match_positions(previous, current, key_columns)
+    matched = positions >= 0
+
+    changed = matched.copy()
+    changed[matched] = (previous[ROW_DIGEST].to_numpy()[positions[matched]]
+                        != current[ROW_DIGEST].to_numpy()[matched])
+
+    kept = np.zeros(len(previous), dtype=bool)
+    kept[positions[matched]] = True
+
+    inserts = _public(current[~matched])
+    deletes = _public(previous[~kept])
+    upserts = _public(current[~matched | changed])
+
+    columns = content_columns(current, key_columns, exclude)
+    old_rows = previous.iloc[positions[changed]].reset_index(drop=True)
+    new_rows = current[changed].reset_index(drop=True)
+    updates = new_rows[key_columns].copy()
+    flags = {}
+    for col in columns:
+        old_values = old_rows[col] if col in old_rows.columns else pd.Series([None] * len(old_rows))
+        updates[f'{col}_old'] = old_values.to_numpy()
+        updates[f'{col}_new'] = new_rows[col].to_numpy()
+        flags[col] = _differs(old_values.to_numpy(), new_rows[col].to_numpy())
+    updates['changed_columns'] = [
+        ','.join(col for col in columns if flags[col][row]) for row in range(len(updates))
+    ]
+
+    incr('cdc.inserts', len(inserts))
+    incr('cdc.updates', len(updates))
+    incr('cdc.deletes', len(deletes))
+    incr('cdc.unchanged', int(matched.sum()) - len(updates))
+    return ChangeSet(inserts, updates, deletes, upserts)
+
+
+def change_log(changes, key_columns=('title',)):
+    """
+    Satu DataFrame ringkas dengan kolom 'change_type' ('insert', 'update',
+    'delete'), kunci, dan nilai baris (nilai baru untuk insert/update, nilai
+    lama untuk delete), misal untuk disimpan sebagai log perubahan.
+    """
+    parts = []
+    for change_type, frame in (('insert', changes.inserts), ('delete', changes.deletes)):
+        parts.append(frame.assign(change_type=change_type))
+    updated_keys = changes.updates[list(key_columns)]
+    updated = changes.upserts.merge(updated_keys, on=list(key_columns), how='inner')
+    parts.append(updated.assign(change_type='update'))
+    log = pd.concat([part for part in parts if len(part)] or [parts[0]], ignore_index=True)
+    return log[['change_type'] + [col for col in log.columns if col != 'change_type']]
+
+
+def summarize(changes):
+    return {'inserted': len(changes.inserts), 'updated': len(changes.updates), 'deleted': len(changes.deletes)}
+
+
+class SnapshotStore:
+    """
+    Penyimpanan snapshot terakhir per nama (misal per tabel tujuan) sebagai
+    Parquet, lengkap dengan _key_hash dan _row_digest.
+
+    Parameters:
+    - path (str): Direktori snapshot.
+    """
+
+    def __init__(self, path='.snapshots'):
+        self.path = path
+
+    def _file(self, name, suffix=''):
+        return os.path.join(self.path, f'{name}{suffix}.parquet')
+
+    def load(self, name):
+        """Snapshot terakhir, atau None jika belum ada."""
+        path = self._file(name)
+        if not os.path.exists(path):
+            return None
+        return pq.read_table(path).to_pandas()
+
+    def save(self, name, df, key_columns=('title',), exclude=DEFAULT_EXCLUDE):
+        """
+        Menyimpan df sebagai snapshot terakhir. Penulisan atomik (file
+        sementara lalu os.replace); snapshot sebelumnya disimpan sebagai
+        '<name>.prev.parquet'.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        snapshot = df if KEY_HASH in df.columns else with_digests(df, key_columns, exclude)
+        tmp_path = self._file(name, '.tmp')
+        pq.write_table(pa.Table.from_pandas(snapshot, preserve_index=False), tmp_path, compression='zstd')
+        if os.path.exists(self._file(name)):
+            os.replace(self._file(name), self._file(name, '.prev'))
+        os.replace(tmp_path, self._file(name))
+        return len(snapshot)
+
+    def clear(self, name):
+        for suffix in ('', '.prev', '.tmp'):
+            if os.path.exists(self._file(name, suffix)):
+                os.remove(self._file(name, suffix))
+
+
+def capture_changes(df, store, name, key_columns=('title',), exclude=DEFAULT_EXCLUDE):
+    """
+    Membandingkan df dengan snapshot terakhir di store dan mencetak ringkasannya.
+    Snapshot tidak diperbarui; panggil store.save(...) setelah perubahan berhasil dimuat.
+
+    Returns:
+    - ChangeSet.
+    """
+    changes = diff_snapshots(store.load(name), df, key_columns, exclude)
+    counts = summarize(changes)
+    print(f"✅ CDC '{name}': {counts['inserted']} baru, {counts['updated']} berubah, "
+          f"{counts['deleted']} hilang sejak snapshot terakhir.")
+    return changes
@@ -0,0 +1,108 @@
+"""
+Checkpoint per halaman untuk scraping yang bisa dilanjutkan.
+
+Setiap halaman yang selesai di-parsing disimpan (SQLite) beserta record-nya.
+Jika proses berhenti di tengah jalan, run berikutnya mengambil halaman yang
+sudah selesai dari checkpoint dan hanya mengunduh halaman yang gagal atau
+belum tersentuh. Checkpoint sebuah base_url dihapus begitu scraping-nya
+selesai normal, sehingga run harian berikutnya mulai dari data baru.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+
+class CheckpointStore:
+    """
+    Penyimpanan checkpoint halaman yang aman dipakai bersama oleh banyak thread.
+
+    Parameters:
+    - path (str): File SQLite; ':memory:' untuk checkpoint sementara.
+    """
+
+    def __init__(self, path='.scrape_checkpoint.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS pages (
+                base_url TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (base_url, page)
+            );
+            CREATE TABLE IF NOT EXISTS failures (
+                base_url TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL,
+                failed_at REAL NOT NULL,
+                PRIMARY KEY (base_url, page)
+            );
+        ''')
+
+    def get_page(self, base_url, page_number):
+        """Hasil parse_page yang tersimpan untuk halaman ini, atau None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM pages WHERE base_url = ? AND page = ?', (base_url, page_number)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_page(self, base_url, page_number, page):
+        """Mencatat halaman yang selesai; catatan kegagalannya (jika ada) dihapus."""
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)',
+                               (base_url, page_number, json.dumps(page), time.time()))
+            self._conn.execute('DELETE FROM failures WHERE base_url = ? AND page = ?', (base_url, page_number))
+            self._conn.commit()
+
+    def mark_failed(self, base_url, page_number, error=None):
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO failures VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT (base_url, page) DO UPDATE SET
+                    error = excluded.error, attempts = attempts + 1, failed_at = excluded.failed_at
+            ''', (base_url, page_number, error, time.time()))
+            self._conn.commit()
+
+    def completed_pages(self, base_url):
+        with self._lock:
+            rows = self._conn.execute('SELECT page FROM pages WHERE base_url = ? ORDER BY page', (base_url,))
+            return [row[0] for row in rows]
+
+    def last_good_page(self, base_url):
+        """Nomor halaman terakhir dari rangkaian halaman selesai tanpa celah, atau None."""
+        last = None
+        for page_number in self.completed_pages(base_url):
+            if last is not None and page_number != last + 1:
+                break
+            last = page_number
+        return last
+
+    def failed_pages(self, base_url):
+        """dict nomor halaman -> (error, jumlah percobaan) untuk halaman yang gagal."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT page, error, attempts FROM failures WHERE base_url = ? ORDER BY page', (base_url,)
+            )
+            return {page: (error, attempts) for page, error, attempts in rows}
+
+    def clear(self, base_url):
+        with self._lock:
+            self._conn.execute('DELETE FROM pages WHERE base_url = ?', (base_url,))
+            self._conn.execute('DELETE FROM failures WHERE base_url = ?', (base_url,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
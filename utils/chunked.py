@@ -0,0 +1,141 @@
+"""
+Transformasi out-of-core untuk file CSV yang terlalu besar untuk RAM.
+
+CSV dibaca per chunk berukuran tetap (memory-mapped), setiap chunk dibersihkan
+dengan cleanDataFrame, duplikat lintas chunk dibuang dengan DedupIndex di
+disk, dan hasil langsung ditulis bertahap ke CSV atau Parquet. Puncak memori
+sebanding dengan chunksize, bukan ukuran file.
+
+Mode:
+- 'raw'        : CSV mentah hasil scraping (kolom string seperti extractWebElement).
+- 'historical' : CSV riwayat yang sudah bersih (misal fashion_studio.csv hasil
+                 export_to_csv yang di-append setiap hari); dtype dipulihkan dan
+                 duplikat antar run dibuang.
+
+Contoh:
+    stats = transform_csv_chunked('fashion_studio.csv', 'fashion_studio_dedup.parquet',
+                                  mode='historical', chunksize=200_000)
+"""
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.dedup import DedupIndex
+from utils.metrics import incr
+from utils.transform import COLUMN_PARSERS, cleanDataFrame
+
+HISTORICAL_DTYPES = {'title': 'string', 'size': 'string', 'gender': 'category'}
+
+
+class _IncrementalWriter:
+    """Menulis chunk demi chunk ke CSV (append) atau Parquet (satu row group per chunk)."""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._parquet = None
+        self._schema = None
+        self._first = True
+
+    def write(self, df):
+        if self.fmt == 'parquet':
+            if self._parquet is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._schema = table.schema
+                self._parquet = pq.ParquetWriter(self.path, self._schema, compression='zstd')
+            else:
+                table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def _clean_historical(chunk):
+    """Memulihkan dtype chunk riwayat bersih; baris yang tidak lengkap dibuang."""
+    chunk = chunk.dropna(subset=['title', 'price'])
+    chunk['scrape_timestamp'] = pd.to_datetime(chunk['scrape_timestamp']).astype('datetime64[ns]')
+    return chunk
+
+
+def transform_csv_chunked(input_path, output_path, mode='raw', chunksize=100_000, exchangeRate=16000,
+                          timestamp=None, key_columns=('title',), dedup_index=None, output_format=None):
+    """
+    Membersihkan CSV besar per chunk dan menulis hasilnya secara bertahap.
+
+    Parameters:
+    - input_path (str): CSV sumber.
+    - output_path (str): File tujuan (.csv atau .parquet).
+    - mode (str): 'raw' atau 'historical' (lihat docstring modul).
+    - chunksize (int): Jumlah baris per chunk; menentukan puncak memori.
+    - exchangeRate (float): Kurs konversi price (hanya mode 'raw').
+    - timestamp: Nilai scrape_timestamp untuk mode 'raw' (default sekarang).
+    - key_columns (list): Kolom identitas untuk semantik deleteDuplicate lintas chunk.
+    - dedup_index (DedupIndex): Indeks kunci yang dipakai; jika None, dibuat
+      indeks sementara di disk yang dihapus setelah selesai. Memberikan indeks
+      persisten juga membuang baris yang sudah terlihat pada run sebelumnya.
+    - output_format (str): 'csv' atau 'parquet'; default dari ekstensi output_path.
+
+    Returns:
+    - dict 'chunks', 'rows_in', 'rows_out', 'duplicates', atau None jika gagal.
+    """
+    if mode not in ('raw', 'historical'):
+        raise ValueError("mode harus 'raw' atau 'historical'.")
+    output_format = output_format or ('parquet' if output_path.endswith('.parquet') else 'csv')
+    timestamp = pd.to_datetime(timestamp if timestamp is not None else pd.Timestamp.now())
+
+    tmpdir = None
+    if dedup_index is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        index = DedupIndex(os.path.join(tmpdir.name, 'keys.sqlite'), key_columns=key_columns)
+    else:
+        index = dedup_index
+
+    stats = {'chunks': 0, 'rows_in': 0, 'rows_out': 0, 'duplicates': 0}
+    writer = _IncrementalWriter(output_path, output_format)
+    try:
+        read_options = {'dtype': str, 'keep_default_na': False} if mode == 'raw' else {'dtype': HISTORICAL_DTYPES}
+        reader = pd.read_csv(input_path, chunksize=chunksize, memory_map=True, **read_options)
+        for chunk in reader:
+            stats['chunks'] += 1
+            stats['rows_in'] += len(chunk)
+
+            if mode == 'raw':
+                missing_columns = [col for col in COLUMN_PARSERS if col not in chunk.columns]
+                if missing_columns:
+                    raise KeyError(f"Kolom yang hilang: {missing_columns}")
+                chunk = cleanDataFrame(chunk, exchangeRate, timestamp)
+            else:
+                chunk = _clean_historical(chunk)
+
+            new = index.filter_new(chunk)
+            stats['duplicates'] += int((~new).sum())
+            chunk = chunk[new]
+            if not chunk.empty:
+                writer.write(chunk)
+                stats['rows_out'] += len(chunk)
+            print(f"✅ Chunk {stats['chunks']}: {stats['rows_in']} baris dibaca, {stats['rows_out']} baris ditulis.")
+
+        if stats['rows_out'] == 0:
+            print("⚠️ Tidak ada baris bersih yang ditulis.")
+        incr('transform.dropped.duplicate', stats['duplicates'])
+        return stats
+
+    except FileNotFoundError:
+        print(f"❌ File '{input_path}' tidak ditemukan.")
+    except KeyError as ke:
+        print(f"❌ Kolom tidak ditemukan: {ke}")
+    except Exception as e:
+        print(f"❌ Terjadi kesalahan saat transformasi chunk: {e}")
+    finally:
+        writer.close()
+        if tmpdir is not None:
+            index.close()
+            tmpdir.cleanup()
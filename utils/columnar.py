@@ -0,0 +1,152 @@
+"""
+Ekstraksi kolumnar: kartu produk langsung ditambahkan ke array per kolom.
+
+Jalur default membuat dict berisi enam string per kartu, lalu
+transform_to_DataFrame dan transformData mem-parsing ulang setiap string
+dengan regex. ColumnarBuilder menerima field mentah dari parser (lihat
+parse_page_with(..., sink=builder)), mem-parsing price, rating dan colors
+dengan pola yang sudah dikompilasi, menerapkan filter pembersihan, dan
+menghasilkan DataFrame bertipe yang identik dengan
+cleanDataFrame(transform_to_DataFrame(records)) tanpa dict perantara. Teks
+angka hasil ekstraksi dikonversi sekali per kolom dengan pd.to_numeric dan
+gender memakai parser yang sama dengan rantai fungsi, sehingga inferensi
+dtype (int64 untuk angka bulat, kategori gender tetap) ikut sama.
+
+Contoh:
+    builder = ColumnarBuilder(exchangeRate=16000)
+    for content in pages:
+        parse_page_with(content, sink=builder)
+    df = builder.to_frame()
+"""
+import math
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from utils.metrics import incr
+from utils.parser import P_FIELDS
+from utils.transform import COLORS_PATTERN, RATING_PATTERN, _parse_gender
+
+_RATING = re.compile(RATING_PATTERN)
+_COLORS = re.compile(COLORS_PATTERN)
+_PRICE_SYMBOLS = str.maketrans('', '', '$,')
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def _extract_number_text(pattern, text):
+    match = pattern.search(text)
+    return match.group(1) if match else None
+
+
+def _numeric(values, index):
+    """Konversi teks angka seperti pd.to_numeric pada rantai fungsi: int64 jika semua bulat."""
+    return pd.to_numeric(pd.Series(values, index=index, dtype='str'), errors='coerce')
+
+
+class ColumnarBuilder:
+    """
+    Penampung kolom bertipe untuk kartu produk.
+
+    Parameters:
+    - exchangeRate (float): Kurs konversi price ke Rupiah.
+    - clean (bool): Terapkan filter cleanDataFrame saat append: 'Unknown Product',
+      'Price Unavailable' dan duplikat 'title' (kemunculan pertama dipertahankan).
+    - drop_invalid (bool): Buang juga kartu yang price, rating atau colors-nya
+      tidak bisa di-parse (misal 'Invalid Rating'); default dipertahankan sebagai NaN.
+    """
+
+    def __init__(self, exchangeRate=16000, clean=True, drop_invalid=False):
+        self.exchangeRate = exchangeRate
+        self.clean = clean
+        self.drop_invalid = drop_invalid
+        self.index = []
+        self.title = []
+        self.price = []
+        self.rating = []
+        self.colors = []
+        self.size = []
+        self.gender = []
+        self.seen_titles = set()
+        self.cards = 0
+        self.dropped = {'unknown_product': 0, 'price_unavailable': 0, 'duplicate': 0, 'invalid': 0}
+
+    def __len__(self):
+        return len(self.title)
+
+    def append(self, title, price, p_texts):
+        """Menambahkan satu kartu dari field mentah parser (title, price, p_texts)."""
+        position = self.cards
+        self.cards += 1
+
+        title = title if title is not None else 'N/A'
+        price = price if price is not None else 'N/A'
+        if len(p_texts) != len(P_FIELDS):
+            p_texts = list(p_texts[:len(P_FIELDS)]) + ['N/A'] * (len(P_FIELDS) - len(p_texts))
+        rating_text, colors_text, size_text, gender_text = p_texts
+
+        if self.clean:
+            if title.strip().lower() == 'unknown product':
+                self.dropped['unknown_product'] += 1
+                return
+            if price.strip().lower() == 'price unavailable':
+                self.dropped['price_unavailable'] += 1
+                return
+
+        price_text = price.translate(_PRICE_SYMBOLS)
+        rating_text = _extract_number_text(_RATING, rating_text)
+        colors_text = _extract_number_text(_COLORS, colors_text)
+
+        if self.drop_invalid and (math.isnan(_to_float(price_text)) or rating_text is None or colors_text is None):
+            self.dropped['invalid'] += 1
+            return
+        if self.clean:
+            if title in self.seen_titles:
+                self.dropped['duplicate'] += 1
+                return
+            self.seen_titles.add(title)
+
+        self.index.append(position)
+        self.title.append(title)
+        self.price.append(price_text)
+        self.rating.append(rating_text)
+        self.colors.append(colors_text)
+        self.size.append(size_text.replace('Size:', '').strip())
+        self.gender.append(gender_text)
+
+    def extend_records(self, records):
+        """Menambahkan record dict (format extractWebElement), misal dari scrape_web."""
+        for record in records:
+            self.append(record['title'], record['price'], [record[field] for field in P_FIELDS])
+
+    def to_frame(self, timestamp=None):
+        """
+        Membangun DataFrame bertipe: title/size string, price/rating/colors
+        numerik (int64 jika semua bulat, float64 jika ada desimal atau NaN),
+        gender category (GENDER_DTYPE), scrape_timestamp datetime.
+        Index adalah urutan kartu yang lolos, sama seperti jalur cleanDataFrame.
+        """
+        index = pd.Index(self.index, dtype='int64')
+        df = pd.DataFrame({
+            'title': pd.array(self.title, dtype='string'),
+            'price': _numeric(self.price, index) * self.exchangeRate,
+            'rating': _numeric(self.rating, index),
+            'colors': _numeric(self.colors, index),
+            'size': pd.array(self.size, dtype='string'),
+            'gender': _parse_gender(pd.Series(self.gender, index=index, dtype='str')),
+        }, index=index)
+        df['scrape_timestamp'] = pd.to_datetime(timestamp if timestamp is not None else datetime.now())
+        df['scrape_timestamp'] = df['scrape_timestamp'].astype('datetime64[ns]')
+
+        incr('transform.rows_in', self.cards)
+        incr('transform.rows_out', len(df))
+        for reason, count in self.dropped.items():
+            incr(f'transform.dropped.{reason}', count)
+        print(f"✅ {self.cards - len(df)} kartu dibuang, {len(df)} baris bertipe dibangun secara kolumnar.")
+        return df
@@ -0,0 +1,240 @@
+"""
+Konversi harga multi-mata uang dengan tabel kurs lokal.
+
+Mata uang setiap baris dideteksi dari simbol/kode di teks price saat parsing
+('$12.50', 'US$ 1,299.00', 'Rp 150.000'). Koma dianggap pemisah ribuan dan
+titik sebagai desimal, kecuali mata uang di THOUSANDS_DOT_CURRENCIES yang
+menulis ribuan dengan titik. Kurs dibaca dari file lokal (JSON atau CSV)
+lewat RateTable yang di-cache di dalam proses dengan TTL, sehingga file yang
+diperbarui harian ikut terbaca tanpa membaca ulang file untuk setiap batch. Konversi dilakukan sebagai satu perkalian vektor:
+kolom mata uang berupa kategori, kurs diambil sekali per kategori, lalu
+dikalikan lewat kode kategori (bukan per baris).
+
+Format file kurs (nilai = harga 1 unit mata uang dalam mata uang dasar):
+    rates.json : {"base": "IDR", "rates": {"USD": 16000, "EUR": 17500, "SGD": 12000}}
+    rates.csv  : currency,rate
+                 USD,16000
+
+Contoh:
+    rates = get_rate_table('rates.json', ttl=3600)
+    cleanDataFrame(df, exchangeRate=rates)      # menambah kolom 'currency'
+"""
+import csv
+import json
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import incr
+
+# Simbol -> kode ISO 4217; simbol bertingkat ('US$') harus dicek sebelum '$'
+CURRENCY_SYMBOLS = {
+    'US$': 'USD',
+    'S$': 'SGD',
+    'Rp': 'IDR',
+    'RM': 'MYR',
+    '$': 'USD',
+    '€': 'EUR',
+    '£': 'GBP',
+    '¥': 'JPY',
+}
+CURRENCY_PATTERN = '(' + '|'.join(re.escape(symbol) for symbol in CURRENCY_SYMBOLS) + r'|\b[A-Z]{3}\b)'
+# Mata uang yang menulis ribuan dengan titik, misal 'Rp 150.000'
+THOUSANDS_DOT_CURRENCIES = frozenset({'IDR', 'JPY'})
+AMOUNT_JUNK_PATTERN = r'[^\d.\-]'
+
+
+def load_rate_file(path):
+    """
+    Membaca file kurs JSON atau CSV.
+
+    Returns:
+    - (base, dict kode -> kurs ke mata uang dasar); mata uang dasar selalu 1.0.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        base = 'IDR'
+        rates = {row['currency'].strip().upper(): float(row['rate']) for row in rows}
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        base = data.get('base', 'IDR').upper()
+        rates = {code.upper(): float(rate) for code, rate in data['rates'].items()}
+    rates[base] = 1.0
+    return base, rates
+
+
+class RateTable:
+    """
+    Tabel kurs dari file lokal dengan cache TTL di dalam proses.
+
+    Parameters:
+    - path (str): File kurs (.json atau .csv), lihat docstring modul.
+    - ttl (float): Umur cache (detik); setelah lewat, file dibaca ulang pada
+      pemanggilan berikutnya. Jika pembacaan ulang gagal, kurs lama tetap dipakai.
+    """
+
+    def __init__(self, path, ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._base = None
+        self._rates = None
+        self._expires = 0.0
+        self.loads = 0
+
+    def rates(self):
+        """Dict kode -> kurs; dibaca dari file hanya saat cache kosong atau kedaluwarsa."""
+        with self._lock:
+            now = time.monotonic()
+            if self._rates is None or now >= self._expires:
+                try:
+                    self._base, self._rates = load_rate_file(self.path)
+                    self.loads += 1
+                except (OSError, ValueError, KeyError) as e:
+                    if self._rates is None:
+                        raise
+                    print(f"⚠️ Gagal membaca ulang file kurs '{self.path}', memakai kurs lama: {e}")
+                self._expires = now + self.ttl
+            return self._rates
+
+    @property
+    def base(self):
+        self.rates()
+        return self._base
+
+    def rate(self, currency):
+        return self.rates().get(currency, np.nan)
+
+    def invalidate(self):
+        with self._lock:
+            self._expires = 0.0
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_rate_table(path, ttl=3600):
+    """RateTable bersama per file sehingga semua batch dalam satu proses berbagi cache."""
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None:
+            table = _tables[path] = RateTable(path, ttl)
+        table.ttl = ttl
+        return table
+
+
+def parse_price_currency(series, default_currency='USD'):
+    """
+    Memisahkan teks price menjadi jumlah dan mata uang.
+
+    Parameters:
+    - series (pd.Series): Teks price, misal '$1,299.00' atau 'Rp 150.000'.
+    - default_currency (str): Mata uang untuk teks tanpa simbol/kode.
+
+    Returns:
+    - (pd.Series float jumlah, pd.Series category kode mata uang).
+    """
+    text = series.astype(str)
+    symbols = text.str.extract(CURRENCY_PATTERN, expand=False)
+
+    # Pemetaan simbol -> kode dilakukan pada nilai unik saja, bukan per baris
+    positions, uniques = pd.factorize(symbols)
+    codes = [CURRENCY_SYMBOLS.get(symbol, symbol) for symbol in uniques]
+    categories = list(dict.fromkeys(codes + [default_currency]))
+    lookup = np.array([categories.index(code) for code in codes] + [categories.index(default_currency)])
+    currency = pd.Series(pd.Categorical.from_codes(lookup[positions], categories), index=series.index)
+
+    amount_text = text.str.replace(',', '', regex=False).str.replace(AMOUNT_JUNK_PATTERN, '', regex=True)
+    thousands_dot = currency.isin(THOUSANDS_DOT_CURRENCIES).to_numpy()
+    if thousands_dot.any():
+        amount_text = amount_text.where(~thousands_dot, amount_text.str.replace('.', '', regex=False))
+    return pd.to_numeric(amount_text, errors='coerce'), currency
+
+
+def convert_amounts(amount, currency, rates):
+    """
+    Mengalikan jumlah dengan kurs mata uangnya dalam satu operasi vektor.
+
+    Parameters:
+    - amount (pd.Series): Jumlah numerik.
+    - currency (pd.Series category): Kode mata uang per baris.
+    - rates (dict/RateTable): Kurs ke mata uang tujuan.
+
+    Returns:
+    - pd.Series float; mata uang tanpa kurs menjadi NaN.
+    """
+    rates = rates.rates() if isinstance(rates, RateTable) else rates
+    currency = currency.astype('category')
+    categories = currency.cat.categories
+    # Satu faktor per kategori; kode -1 (NaN) mengambil elemen terakhir (NaN)
+    factors = np.array([rates.get(code, np.nan) for code in categories] + [np.nan], dtype='float64')
+    unknown = [code for code in categories if code not in rates]
+    if unknown:
+        missing = int(currency.isin(unknown).sum())
+        incr('transform.unknown_currency', missing)
+        print(f"⚠️ Tidak ada kurs untuk {unknown}; {missing} harga menjadi NaN.")
+    return amount.astype('float64') * factors[currency.cat.codes.to_numpy()]
+
+
+def convertPriceMultiCurrency(df, rates, default_currency='USD'):
+    """
+    Mengonversi kolom 'price' ke mata uang dasar tabel kurs per baris (inplace).
+
+    - Jika 'price' masih teks, mata uang dideteksi dari simbolnya dan disimpan
+      di kolom 'currency' (category).
+    - Jika 'price' sudah numerik, kolom 'currency' yang ada dipakai, atau
+      default_currency jika tidak ada.
+
+    Kegagalan membaca file kurs (OSError/ValueError/KeyError dari
+    RateTable.rates) tidak ditangkap agar run berhenti. Jika konversi gagal
+    karena hal lain, 'price' diisi NaN sehingga baris dikarantina validasi,
+    bukan dimuat sebagai angka yang belum dikonversi.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame yang mengandung kolom 'price'.
+        rates (RateTable/dict): Kurs ke mata uang dasar.
+        default_currency (str): Mata uang untuk harga tanpa simbol.
+
+    Returns:
+        None – proses dilakukan langsung pada df (inplace).
+    """
+    rates = rates.rates() if isinstance(rates, RateTable) else rates
+    try:
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Input bukan DataFrame.")
+
+        if 'price' not in df.columns:
+            raise KeyError("Kolom 'price' tidak ditemukan dalam DataFrame.")
+
+        if pd.api.types.is_numeric_dtype(df['price']):
+            amount = df['price']
+            currency = df['currency'] if 'currency' in df.columns else \
+                pd.Series(pd.Categorical([default_currency] * len(df)), index=df.index)
+        else:
+            amount, currency = parse_price_currency(df['price'], default_currency)
+
+        df['price'] = convert_amounts(amount, currency, rates)
+        df['currency'] = currency.astype('category')
+        print(f"✅ Konversi harga dari {len(df['currency'].cat.categories)} mata uang berhasil.")
+
+    except TypeError as te:
+        print(f"❌ Tipe data tidak valid: {te}")
+        _invalidate_prices(df)
+    except KeyError as ke:
+        print(f"❌ Kolom tidak ditemukan: {ke}")
+    except Exception as e:
+        print(f"❌ Terjadi kesalahan saat mengonversi harga: {e}")
+        _invalidate_prices(df)
+
+
+def _invalidate_prices(df):
+    """Harga yang gagal dikonversi menjadi NaN, bukan angka mata uang asal."""
+    if isinstance(df, pd.DataFrame) and 'price' in df.columns:
+        df['price'] = np.nan
+        incr('transform.unconverted_price', len(df))
@@ -0,0 +1,139 @@
+"""
+Indeks deduplikasi persisten lintas batch dan lintas run.
+
+deleteDuplicate hanya melihat satu DataFrame di memori. DedupIndex menyimpan
+hash 64-bit dari kolom kunci (beserta kunci aslinya untuk konfirmasi exact
+match) di SQLite dengan primary key B-tree, sehingga biaya lookup per baris
+tetap O(log n) ketika riwayat tumbuh hingga jutaan produk. Batch dicek
+sekaligus lewat join dengan tabel sementara, bukan satu query per baris.
+
+Contoh:
+    with DedupIndex('.dedup_index.sqlite', key_columns=['title', 'size']) as index:
+        for batch in batches:
+            batch = batch[index.filter_new(batch)]
+"""
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+KEY_SEPARATOR = '\x1f'
+
+
+def row_keys(df, key_columns):
+    """Kunci string per baris: nilai kolom kunci digabung dengan pemisah unit."""
+    key = df[key_columns[0]].astype(str).to_numpy(dtype=object)
+    for column in key_columns[1:]:
+        key = key + KEY_SEPARATOR + df[column].astype(str).to_numpy(dtype=object)
+    return key
+
+
+def hash_keys(keys):
+    """Hash 64-bit deterministik (sama antar proses dan run) sebagai int64 untuk SQLite."""
+    return pd.util.hash_array(np.asarray(keys, dtype=object), categorize=False).view('int64')
+
+
+class DedupIndex:
+    """
+    Penyimpanan kunci yang sudah pernah dimuat.
+
+    Parameters:
+    - path (str): File SQLite; ':memory:' untuk indeks sementara.
+    - key_columns (list): Kolom yang menentukan identitas produk.
+    - namespace (str): Memisahkan beberapa indeks (misal per tabel tujuan) dalam satu file.
+    """
+
+    def __init__(self, path='.dedup_index.sqlite', key_columns=('title',), namespace='default'):
+        self.path = path
+        self.key_columns = list(key_columns)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS dedup_keys (
+                namespace TEXT NOT NULL,
+                hash INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (namespace, hash, key)
+            ) WITHOUT ROWID
+        ''')
+        self._conn.execute('CREATE TEMP TABLE batch_keys (position INTEGER, hash INTEGER, key TEXT)')
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM dedup_keys WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+
+    def _lookup(self, keys, hashes):
+        """Posisi baris yang kuncinya sudah ada di indeks (hash cocok dan kunci sama persis)."""
+        self._conn.execute('DELETE FROM batch_keys')
+        self._conn.executemany('INSERT INTO batch_keys VALUES (?, ?, ?)',
+                               zip(range(len(keys)), hashes.tolist(), keys))
+        rows = self._conn.execute('''
+            SELECT b.position FROM batch_keys b
+            JOIN dedup_keys d ON d.namespace = ? AND d.hash = b.hash AND d.key = b.key
+        ''', (self.namespace,))
+        return [row[0] for row in rows]
+
+    def contains(self, df):
+        """Mask boolean: True untuk baris yang kuncinya sudah ada di indeks."""
+        seen = np.zeros(len(df), dtype=bool)
+        if len(df):
+            keys = row_keys(df, self.key_columns)
+            with self._lock:
+                seen[self._lookup(keys.tolist(), hash_keys(keys))] = True
+        return seen
+
+    def filter_new(self, df, add=True):
+        """
+        Mask boolean: True untuk baris yang belum pernah terlihat, baik di indeks
+        maupun sebelumnya di batch yang sama (kemunculan pertama dipertahankan).
+
+        Parameters:
+        - add (bool): Langsung catat kunci baris baru ke indeks. Gunakan False
+          lalu panggil add() setelah load berhasil jika indeks harus mencerminkan
+          data yang benar-benar sudah dimuat.
+        """
+        if not len(df):
+            return np.zeros(0, dtype=bool)
+        keys = row_keys(df, self.key_columns)
+        hashes = hash_keys(keys)
+        new = ~pd.Series(keys).duplicated(keep='first').to_numpy()
+        with self._lock:
+            new[self._lookup(keys.tolist(), hashes)] = False
+            if add:
+                self._insert(keys[new].tolist(), hashes[new])
+        return new
+
+    def add(self, df):
+        """Mencatat kunci semua baris df ke indeks."""
+        if len(df):
+            keys = row_keys(df, self.key_columns)
+            with self._lock:
+                self._insert(keys.tolist(), hash_keys(keys))
+
+    def _insert(self, keys, hashes):
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO dedup_keys VALUES (?, ?, ?)',
+            ((self.namespace, value, key) for value, key in zip(hashes.tolist(), keys)),
+        )
+        self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM dedup_keys WHERE namespace = ?', (self.namespace,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
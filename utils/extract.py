@@ -1,6 +1,16 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from utils.cache import body_digest
+from utils.columnar import ColumnarBuilder
+from utils.metrics import incr
+from utils.parse_pool import ParsePool
+from utils.parser import ERROR_RECORD, extract_card_bs4, get_backend, parse_page_with
 
 HEADERS = {
     "User-Agent": (
@@ -9,14 +19,112 @@ HEADERS = {
     )
 }
 
-def fetching_content(url):
-    """Mengambil konten HTML dari URL yang diberikan."""
-    session = requests.Session()
+def _accept_encoding():
+    """Negosiasi kompresi; brotli hanya diminta jika decoder-nya terpasang."""
     try:
-        response = session.get(url, headers=HEADERS, timeout=10)  # tambahkan timeout agar tidak menggantung
-        response.raise_for_status()  # akan raise jika status >= 400
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return 'gzip, deflate, br'
+        except ImportError:
+            return 'gzip, deflate'
+
+
+class HttpFetcher:
+    """
+    Pengambil halaman dengan satu requests.Session yang dipakai ulang.
+
+    - Connection pool berukuran pool_size (samakan dengan jumlah workers).
+    - Keep-alive, negosiasi gzip/brotli.
+    - Retry dengan exponential backoff untuk status 5xx, timeout dan
+      kegagalan koneksi.
+    - Opsional: cache (utils.cache.ResponseCache) untuk conditional request
+      (If-None-Match/If-Modified-Since); respons 304 memakai body dari cache.
+    """
+
+    def __init__(self, pool_size=10, retries=3, backoff_factor=0.5, timeout=10, headers=None,
+                 cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.session.headers.update({
+            'Accept-Encoding': _accept_encoding(),
+            'Connection': 'keep-alive',
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url):
+        """Mengambil url dan mengembalikan body (bytes); raise jika status >= 400."""
+        entry = self.cache.get(url) if self.cache is not None else None
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = self.session.get(url, timeout=self.timeout, headers=headers or None)
+        incr('extract.pages_fetched')
+        if entry is not None and response.status_code == 304:
+            incr('extract.not_modified')
+            self.cache.touch(url)
+            return entry.body
+        response.raise_for_status()
+        incr('extract.bytes_downloaded', len(response.content))
+
+        if self.cache is not None:
+            self.cache.put(url, response.content, response.headers.get('ETag'),
+                           response.headers.get('Last-Modified'))
         return response.content
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_default_fetcher():
+    """Fetcher bersama yang dipakai jika pemanggil tidak menyuntikkan fetcher sendiri."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = HttpFetcher()
+        return _default_fetcher
+
+
+def fetching_content(url, fetcher=None):
+    """Mengambil konten HTML dari URL yang diberikan."""
+    fetcher = fetcher or get_default_fetcher()
+    try:
+        return fetcher.get(url)
     except requests.exceptions.RequestException as e:
+        incr('extract.fetch_errors')
         print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
         return None
 
@@ -27,87 +135,393 @@ def extractWebElement(element):
     Menggunakan error handling untuk menghindari AttributeError dan IndexError.
     """
     try:
-        title = element.select_one('.product-title').text.strip() if element.select_one('.product-title') else 'N/A'
-        price = element.select_one('.price').text.strip() if element.select_one('.price') else 'N/A'
-        
-        p_tags = element.find_all('p')
-        rating = p_tags[0].text.strip() if len(p_tags) > 0 else 'N/A'
-        colors = p_tags[1].text.strip() if len(p_tags) > 1 else 'N/A'
-        size = p_tags[2].text.strip() if len(p_tags) > 2 else 'N/A'
-        gender = p_tags[3].text.strip() if len(p_tags) > 3 else 'N/A'
-
-        result = {
-            'title': title,
-            'price': price,
-            'rating': rating,
-            'colors': colors,
-            'size': size,
-            'gender': gender
-        }
+        # Satu traversal per kartu: judul, harga dan tag <p> dikumpulkan sekaligus
+        result = extract_card_bs4(element)
 
     except Exception as e:
         print(f"Terjadi kesalahan saat mengekstrak elemen: {e}")
-        result = {
-            'title': 'ERROR',
-            'price': 'ERROR',
-            'rating': 'ERROR',
-            'colors': 'ERROR',
-            'size': 'ERROR',
-            'gender': 'ERROR'
-        }
+        result = dict(ERROR_RECORD)
 
     return result
 
 
 
-def scrape_web(base_url, start_page=1, delay=2):
+def build_page_url(base_url, page_number):
+    """
+    Menyusun URL halaman katalog. Halaman 1 adalah root situs,
+    halaman berikutnya mengikuti pola base_url (misal '.../page{}.html').
+    """
+    if page_number == 1:
+        return base_url.rsplit('/', 1)[0] + '/'  # Halaman awal
+    return base_url.format(page_number)
+
+
+def parse_page(content, parser=None, cache=None):
+    """
+    Mem-parsing satu halaman katalog.
+
+    Parameters:
+    - content (bytes/str): HTML halaman.
+    - parser (str/ParsePool): Backend parser ('selectolax', 'lxml', 'html.parser').
+      None memilih backend tercepat yang terpasang. ParsePool mem-parsing di
+      proses terpisah sehingga tidak terikat GIL.
+    - cache (ResponseCache): Jika diberikan, hasil parsing dipakai ulang untuk
+      body yang identik (berdasarkan digest).
+
+    Returns:
+    - dict berisi 'records' (list dict produk), 'not_found' (halaman error),
+      'has_next' (tombol next aktif) dan 'last_page' (dari pagination).
+    """
+    pool = parser if isinstance(parser, ParsePool) else None
+    backend = pool.backend if pool else get_backend(parser)
+
+    if cache is not None:
+        digest = body_digest(content)
+        page = cache.get_parsed(digest, backend)
+        if page is not None:
+            incr('extract.parse_cache_hits')
+            return page
+
+    start = time.perf_counter()
+    page = pool.parse(content) if pool else parse_page_with(content, backend)
+    incr('extract.parse_seconds', time.perf_counter() - start)
+    incr('extract.cards_parsed', len(page['records']))
+    if cache is not None:
+        cache.put_parsed(digest, backend, page)
+    return page
+
+
+def parse_pages(contents, parser=None, cache=None):
+    """
+    Mem-parsing banyak halaman sekaligus, hasil berurutan sesuai contents.
+
+    Dengan ParsePool semua halaman (kecuali yang ada di cache hasil parsing)
+    dikirim lewat satu ParsePool.map sehingga chunksize pool berlaku; tanpa
+    pool sama dengan parse_page per halaman.
+    """
+    if not isinstance(parser, ParsePool):
+        return [parse_page(content, parser, cache) for content in contents]
+
+    pages = [None] * len(contents)
+    digests = {}
+    for position, content in enumerate(contents):
+        if cache is not None:
+            digests[position] = body_digest(content)
+            pages[position] = cache.get_parsed(digests[position], parser.backend)
+            if pages[position] is not None:
+                incr('extract.parse_cache_hits')
+    pending = [position for position, page in enumerate(pages) if page is None]
+
+    start = time.perf_counter()
+    parsed = parser.map([contents[position] for position in pending])
+    incr('extract.parse_seconds', time.perf_counter() - start)
+    for position, page in zip(pending, parsed):
+        pages[position] = page
+        incr('extract.cards_parsed', len(page['records']))
+        if cache is not None:
+            cache.put_parsed(digests[position], parser.backend, page)
+    return pages
+
+
+class HostRateLimiter:
+    """
+    Membatasi laju request per host (jumlah request per detik).
+    Aman dipakai bersama oleh banyak thread.
+    """
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Menunggu hingga slot request berikutnya untuk host dari url tersedia."""
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def scrape_web(base_url, start_page=1, delay=2, workers=1, rate_limit=None, fetcher=None,
+               parser=None, cache=None, checkpoint=None):
+    """
+    Melakukan scraping seluruh halaman katalog mulai dari start_page.
+
+    Parameters:
+    - base_url (str): Pola URL halaman, misal 'https://.../page{}.html'.
+    - start_page (int): Halaman awal (default 1).
+    - delay (float): Jeda antar halaman pada mode sekuensial (detik).
+    - workers (int): Jumlah thread pengambil halaman. Jika > 1, halaman diambil
+      secara paralel dan 'delay' diganti oleh 'rate_limit'.
+    - rate_limit (float): Batas request per detik per host pada mode paralel.
+    - fetcher (HttpFetcher): Fetcher yang dipakai ulang. Jika None, mode
+      sekuensial memakai fetcher bersama dan mode paralel membuat fetcher
+      dengan pool sebesar 'workers'.
+    - parser (str/ParsePool): Backend parser HTML, lihat parse_page. Pada mode
+      paralel, ParsePool membuat parsing ikut berjalan paralel di banyak core.
+    - cache (ResponseCache): Cache respons dan hasil parsing untuk scraping
+      ulang. Jika fetcher tidak diberikan, dibuat fetcher yang memakai cache
+      ini; jika diberikan, cache milik fetcher yang dipakai.
+    - checkpoint (CheckpointStore): Halaman yang sudah selesai pada run yang
+      terputus diambil dari checkpoint tanpa request; hanya halaman yang gagal
+      atau belum tersentuh yang diunduh. Checkpoint dihapus saat scraping selesai.
+
+    Returns:
+    - list dict produk, berurutan sesuai nomor halaman.
+    """
     data = []
+    for records in iter_scrape_web(base_url, start_page, delay, workers, rate_limit, fetcher, parser,
+                                   cache, checkpoint):
+        data.extend(records)
+    return data
+
+
+def iter_scrape_web(base_url, start_page=1, delay=2, workers=1, rate_limit=None, fetcher=None,
+                    parser=None, cache=None, checkpoint=None):
+    """
+    Versi streaming dari scrape_web: menghasilkan list dict produk per halaman
+    begitu halaman tersebut selesai di-parsing, berurutan sesuai nomor halaman.
+    Parameter sama dengan scrape_web.
+    """
+    if cache is not None and fetcher is None:
+        with HttpFetcher(pool_size=max(workers or 1, 1), cache=cache) as own_fetcher:
+            yield from iter_scrape_web(base_url, start_page, delay, workers, rate_limit, own_fetcher, parser,
+                                       checkpoint=checkpoint)
+        return
+    cache = getattr(fetcher, 'cache', None)
+
+    if workers and workers > 1:
+        if fetcher is None:
+            with HttpFetcher(pool_size=workers) as own_fetcher:
+                yield from _iter_scrape_web_concurrent(base_url, start_page, workers, rate_limit, own_fetcher, parser,
+                                                       checkpoint=checkpoint)
+        else:
+            yield from _iter_scrape_web_concurrent(base_url, start_page, workers, rate_limit, fetcher, parser,
+                                                   cache, checkpoint)
+        return
+
     page_number = start_page
+    finished = False
 
     while True:
         try:
-            if page_number == 1:
-                url = 'https://fashion-studio.dicoding.dev/'  # Halaman awal
+            page = checkpoint.get_page(base_url, page_number) if checkpoint is not None else None
+            resumed = page is not None
+
+            if resumed:
+                print(f"♻️ Halaman {page_number} diambil dari checkpoint.")
             else:
-                url = base_url.format(page_number)
+                url = build_page_url(base_url, page_number)
 
-            print(f"Scraping halaman: {url}")
-            content = fetching_content(url)
+                print(f"Scraping halaman: {url}")
+                content = fetching_content(url, fetcher)
 
-            if not content:
-                print(f"Gagal mengambil konten halaman {url}. Menghentikan scraping.")
-                break
+                if not content:
+                    print(f"Gagal mengambil konten halaman {url}. Menghentikan scraping.")
+                    if checkpoint is not None:
+                        checkpoint.mark_failed(base_url, page_number, 'konten kosong')
+                    break
 
-            soup = BeautifulSoup(content, "html.parser")
+                page = parse_page(content, parser, cache)
 
-            # Cek jika halaman error berdasarkan konten teks
-            if "Page Not Found" in soup.text or "page not found" in soup.text:
-                print(f"Halaman error ditemukan di {url}. Menghentikan scraping.")
-                break
+                if page['not_found']:
+                    print(f"Halaman error ditemukan di {url}. Menghentikan scraping.")
+                    finished = True
+                    break
 
-            web_elements = soup.find_all(class_='collection-card')
-            print(f"Jumlah elemen ditemukan: {len(web_elements)}")
+                if checkpoint is not None:
+                    checkpoint.save_page(base_url, page_number, page)
 
-            for element in web_elements:
-                try:
-                    shop = extractWebElement(element)
-                    data.append(shop)
-                except Exception as e:
-                    print(f"❌ Gagal mengekstrak data dari satu elemen: {e}")
-                    continue  # lanjut ke elemen berikutnya
+            print(f"Jumlah elemen ditemukan: {len(page['records'])}")
+            yield page['records']
 
-            # Cek tombol next
-            next_button = soup.find('li', class_='page-item next')
-            if not next_button or 'disabled' in next_button.get('class', []):
+            if not page['has_next']:
                 print("✅ Tombol next disabled atau tidak ditemukan. Menghentikan scraping.")
+                finished = True
                 break
             else:
                 page_number += 1
-                time.sleep(delay)
+                if not resumed:
+                    time.sleep(delay)
 
         except Exception as e:
             print(f"❌ Terjadi kesalahan tak terduga saat scraping halaman {page_number}: {e}")
+            if checkpoint is not None:
+                checkpoint.mark_failed(base_url, page_number, str(e))
             break
 
-    return data
+    if finished and checkpoint is not None:
+        checkpoint.clear(base_url)
+
+
+def scrape_web_columnar(base_url, start_page=1, delay=2, fetcher=None, parser=None, exchangeRate=16000,
+                        drop_invalid=False, timestamp=None):
+    """
+    Scraping sekuensial yang langsung menghasilkan DataFrame bersih bertipe.
+
+    Field setiap kartu dikirim parser ke ColumnarBuilder (tanpa dict per kartu);
+    price, rating dan colors di-parse saat ekstraksi dan filter cleanDataFrame
+    diterapkan saat itu juga, sehingga transform_to_DataFrame + cleanDataFrame
+    tidak perlu dijalankan lagi.
+
+    Parameters:
+    - base_url, start_page, delay, fetcher: lihat scrape_web.
+    - parser (str): Backend parser HTML (nama backend, bukan ParsePool).
+    - exchangeRate (float): Kurs konversi price ke Rupiah.
+    - drop_invalid (bool): Buang kartu yang price/rating/colors-nya tidak valid.
+    - timestamp: Nilai kolom scrape_timestamp (default waktu sekarang).
+
+    Returns:
+    - pd.DataFrame dengan skema yang sama seperti hasil cleanDataFrame.
+    """
+    builder = ColumnarBuilder(exchangeRate, drop_invalid=drop_invalid)
+    page_number = start_page
+
+    while True:
+        try:
+            url = build_page_url(base_url, page_number)
+            print(f"Scraping halaman: {url}")
+            content = fetching_content(url, fetcher)
+            if not content:
+                print(f"Gagal mengambil konten halaman {url}. Menghentikan scraping.")
+                break
+
+            cards_before = builder.cards
+            page = parse_page_with(content, parser, sink=builder)
+            if page['not_found']:
+                print(f"Halaman error ditemukan di {url}. Menghentikan scraping.")
+                break
+
+            incr('extract.cards_parsed', builder.cards - cards_before)
+            print(f"Jumlah elemen ditemukan: {builder.cards - cards_before}")
+            if not page['has_next']:
+                print("✅ Tombol next disabled atau tidak ditemukan. Menghentikan scraping.")
+                break
+            page_number += 1
+            time.sleep(delay)
+
+        except Exception as e:
+            print(f"❌ Terjadi kesalahan tak terduga saat scraping halaman {page_number}: {e}")
+            break
+
+    return builder.to_frame(timestamp)
+
+
+def _iter_scrape_web_concurrent(base_url, start_page, workers, rate_limit, fetcher, parser, cache=None,
+                                checkpoint=None):
+    """
+    Mode paralel iter_scrape_web. Halaman pertama diambil lebih dulu untuk membaca
+    pagination; halaman yang sudah diketahui diambil sekaligus, sisanya
+    diprobe secara spekulatif per jendela sebesar 'workers'. Scraping berhenti
+    pada halaman pertama yang gagal, error, atau tombol next-nya disabled,
+    sama seperti mode sekuensial. Dengan ParsePool, halaman satu batch
+    di-parse bersama lewat parse_pages (ParsePool.map dengan chunksize).
+    """
+    limiter = HostRateLimiter(rate_limit)
+    pool = parser if isinstance(parser, ParsePool) else None
+
+    def failed(page_number, error):
+        print(f"❌ Terjadi kesalahan tak terduga saat scraping halaman {page_number}: {error}")
+        if checkpoint is not None:
+            checkpoint.mark_failed(base_url, page_number, str(error))
+
+    def save(page_number, page):
+        # Halaman sukses setelah halaman yang gagal tetap dicatat, sehingga
+        # run berikutnya hanya mengulang halaman yang gagal
+        if checkpoint is not None and not page['not_found']:
+            checkpoint.save_page(base_url, page_number, page)
+        return page
+
+    def fetch_and_parse(page_number):
+        """dict halaman, None jika gagal, atau bytes mentah jika parsing ditunda ke ParsePool."""
+        if checkpoint is not None:
+            page = checkpoint.get_page(base_url, page_number)
+            if page is not None:
+                print(f"♻️ Halaman {page_number} diambil dari checkpoint.")
+                return page
+
+        url = build_page_url(base_url, page_number)
+        try:
+            limiter.wait(url)
+            print(f"Scraping halaman: {url}")
+            content = fetching_content(url, fetcher)
+            if not content:
+                print(f"Gagal mengambil konten halaman {url}. Menghentikan scraping.")
+                if checkpoint is not None:
+                    checkpoint.mark_failed(base_url, page_number, 'konten kosong')
+                return None
+            if pool is not None:
+                return content
+            return save(page_number, parse_page(content, parser, cache))
+        except Exception as e:
+            failed(page_number, e)
+            return None
+
+    def parse_batch(batch, results):
+        """Mem-parsing semua konten mentah batch sekaligus (juga setelah halaman gagal, untuk checkpoint)."""
+        results = list(results)
+        raw = [position for position, result in enumerate(results)
+               if result is not None and not isinstance(result, dict)]
+        try:
+            pages = parse_pages([results[position] for position in raw], pool, cache)
+        except Exception:
+            # Satu halaman rusak menggagalkan map(); ulangi per halaman untuk menemukan yang gagal
+            pages = []
+            for position in raw:
+                try:
+                    pages.append(parse_page(results[position], pool, cache))
+                except Exception as e:
+                    failed(batch[position], e)
+                    pages.append(None)
+        for position, page in zip(raw, pages):
+            results[position] = page if page is None else save(batch[position], page)
+        return results
+
+    known_last = None
+    next_page = start_page
+    finished = False
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            if next_page == start_page:
+                batch = [start_page]
+            else:
+                # Ambil semua halaman yang sudah diketahui, lalu probe spekulatif
+                # minimal sebanyak 'workers'; hasil setelah halaman terakhir dibuang
+                last = max(known_last or 0, next_page + workers - 1)
+                batch = list(range(next_page, last + 1))
+
+            stop = False
+            results = executor.map(fetch_and_parse, batch)
+            if pool is not None:
+                results = parse_batch(batch, results)
+            for page_number, page in zip(batch, results):
+                if page is None:
+                    stop = True
+                    break
+                if page['not_found']:
+                    print(f"Halaman error ditemukan di halaman {page_number}. Menghentikan scraping.")
+                    stop = finished = True
+                    break
+
+                print(f"Jumlah elemen ditemukan di halaman {page_number}: {len(page['records'])}")
+                yield page['records']
+                if page['last_page']:
+                    known_last = max(known_last or 0, page['last_page'])
+
+                if not page['has_next']:
+                    print("✅ Tombol next disabled atau tidak ditemukan. Menghentikan scraping.")
+                    stop = finished = True
+                    break
+
+            if stop:
+                break
+            next_page = batch[-1] + 1
 
+    if finished and checkpoint is not None:
+        checkpoint.clear(base_url)
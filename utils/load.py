@@ -1,25 +1,46 @@
+import csv
+import io
+import os
+import threading
+import uuid
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import gspread
+from gspread.utils import rowcol_to_a1
 from gspread_dataframe import set_with_dataframe
 from google.oauth2.service_account import Credentials
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from utils.metrics import incr
 
-def export_to_csv(df, filename):
+
+def export_to_csv(df, filename, append=False):
     """
     Mengekspor DataFrame ke file CSV dengan error handling.
 
     Parameters:
     - df (pd.DataFrame): DataFrame yang ingin diekspor.
     - filename (str): Nama file tujuan, termasuk .csv
+    - append (bool): Tambahkan ke file yang sudah ada tanpa header (untuk micro-batch).
+
+    Returns:
+    - int jumlah baris yang diekspor, atau None jika gagal.
     """
     try:
         if df.empty:
             raise ValueError("DataFrame kosong. Tidak dapat diekspor ke file CSV.")
 
-        df.to_csv(filename, index=False)
+        if append and os.path.exists(filename):
+            df.to_csv(filename, mode='a', header=False, index=False)
+        else:
+            df.to_csv(filename, index=False)
         print(f"✅ Data berhasil diekspor ke '{filename}'.")
+        return len(df)
 
     except FileNotFoundError:
         print(f"❌ Lokasi file '{filename}' tidak ditemukan.")
@@ -32,7 +53,311 @@ def export_to_csv(df, filename):
 
 
 
-def upload_df_to_gsheet(df, service_account_file, spreadsheet_id, sheet_name='Sheet1'):
+COLUMNAR_FORMATS = {
+    'parquet': ('parquet', '.parquet'),
+    'feather': ('ipc', '.arrow'),
+}
+
+
+def _partition_frame(df, partition_by):
+    """Menambahkan kolom partisi turunan; 'scrape_date' diambil dari scrape_timestamp."""
+    if 'scrape_date' in partition_by and 'scrape_date' not in df.columns:
+        df = df.assign(scrape_date=pd.to_datetime(df['scrape_timestamp']).dt.strftime('%Y-%m-%d'))
+    return df
+
+
+def _write_columnar(df, path, fmt, partition_by, append, compression, row_group_size):
+    ds_format, extension = COLUMNAR_FORMATS[fmt]
+    if not partition_by and not append:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if fmt == 'parquet':
+            pq.write_table(table, path, compression=compression, row_group_size=row_group_size)
+        else:
+            feather.write_feather(table, path, compression=compression or 'uncompressed',
+                                  chunksize=row_group_size)
+        return
+
+    # Dataset: setiap pemanggilan menulis file baru dengan nama unik sehingga
+    # append tidak perlu membaca ulang data lama
+    partition_by = list(partition_by or [])
+    table = pa.Table.from_pandas(_partition_frame(df, partition_by), preserve_index=False)
+    file_format = ds.ParquetFileFormat() if ds_format == 'parquet' else ds.IpcFileFormat()
+    ds.write_dataset(
+        table, path,
+        format=ds_format,
+        file_options=file_format.make_write_options(compression=compression),
+        partitioning=partition_by or None,
+        partitioning_flavor='hive' if partition_by else None,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}{extension}",
+        # Tanpa append, partisi yang ditulis ulang (misal tanggal yang sama) diganti
+        existing_data_behavior='overwrite_or_ignore' if append else 'delete_matching',
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, len(table)),
+    )
+
+
+def _export_columnar(df, path, fmt, partition_by, append, compression, row_group_size):
+    try:
+        if df.empty:
+            raise ValueError(f"DataFrame kosong. Tidak dapat diekspor ke file {fmt}.")
+        _write_columnar(df, path, fmt, partition_by, append, compression, row_group_size)
+        print(f"✅ Data berhasil diekspor ke '{path}' ({fmt}).")
+        return len(df)
+
+    except PermissionError:
+        print(f"❌ Tidak memiliki izin untuk menulis ke '{path}'.")
+    except (ValueError, KeyError) as ve:
+        print(f"❌ {ve}")
+    except Exception as e:
+        print(f"❌ Terjadi kesalahan saat menulis ke file {fmt}: {e}")
+
+
+def export_to_parquet(df, path, partition_by=None, append=False, compression='zstd',
+                      row_group_size=100_000):
+    """
+    Mengekspor DataFrame ke Parquet (kolumnar, terkompresi, dtype terjaga).
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang ingin diekspor.
+    - path (str): File .parquet, atau direktori dataset jika partition_by/append dipakai.
+    - partition_by (list): Kolom partisi gaya Hive, misal ['scrape_date']
+      (diturunkan otomatis dari scrape_timestamp).
+    - append (bool): Tambahkan file baru ke dataset tanpa menyentuh file lama.
+      Jika False dengan partition_by, partisi yang ditulis diganti.
+    - compression (str): 'zstd', 'snappy', 'gzip', atau None.
+    - row_group_size (int): Jumlah baris maksimum per row group.
+
+    Returns:
+    - int jumlah baris yang diekspor, atau None jika gagal.
+    """
+    return _export_columnar(df, path, 'parquet', partition_by, append, compression, row_group_size)
+
+
+def export_to_feather(df, path, partition_by=None, append=False, compression=None,
+                      row_group_size=100_000):
+    """
+    Mengekspor DataFrame ke Arrow IPC/Feather v2.
+
+    Tanpa kompresi (default) file dapat di-memory-map sehingga read_columnar
+    membaca kolom tanpa menyalin data. Parameter lain sama dengan export_to_parquet;
+    compression dapat berupa 'lz4' atau 'zstd'.
+
+    Returns:
+    - int jumlah baris yang diekspor, atau None jika gagal.
+    """
+    return _export_columnar(df, path, 'feather', partition_by, append, compression, row_group_size)
+
+
+def read_columnar(path, columns=None, filter=None):
+    """
+    Membaca kembali hasil export_to_parquet/export_to_feather (file tunggal atau
+    dataset berpartisi) dengan dtype asli, termasuk kategori dan datetime.
+
+    Parameters:
+    - path (str): File atau direktori dataset.
+    - columns (list): Hanya baca kolom ini.
+    - filter (pyarrow.compute.Expression): Filter baris/partisi, misal
+      ds.field('scrape_date') == '2024-01-01'.
+    """
+    if os.path.isdir(path):
+        names = [name for _, _, files in os.walk(path) for name in files]
+        fmt = 'ipc' if any(name.endswith('.arrow') for name in names) else 'parquet'
+        dataset = ds.dataset(path, format=fmt, partitioning='hive')
+    elif path.endswith('.parquet'):
+        dataset = ds.dataset(path, format='parquet')
+    else:
+        # Memory-map: file IPC tanpa kompresi dibaca zero-copy
+        dataset = ds.dataset(feather.read_table(path, memory_map=True))
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+
+def _sheet_value(value):
+    """Nilai sel untuk Sheets: angka tetap angka, NaN menjadi sel kosong, lainnya string."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (bool, int, float)):
+        return value
+    return str(value)
+
+
+def _same_cell(current, desired):
+    """Membandingkan nilai tampilan sheet (string) dengan nilai yang akan ditulis."""
+    if isinstance(desired, (int, float)) and not isinstance(desired, bool):
+        try:
+            return float(current.replace(',', '')) == float(desired)
+        except ValueError:
+            return False
+    return current == str(desired)
+
+
+def _row_runs(indexes):
+    """Mengelompokkan index baris berurutan menjadi (awal, akhir) inklusif."""
+    runs = []
+    for index in indexes:
+        if runs and index == runs[-1][1] + 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return runs
+
+
+def _sheet_key(value):
+    """Nilai sel sebagai teks seperti yang dibaca ulang dari sheet (150000.0 -> '150000')."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _keyed_layout(current, rows, key_positions):
+    """
+    Urutan baris data di sheet setelah sync: baris dengan kunci yang masih ada
+    tetap di posisinya, baris baru mengisi posisi baris yang dihapus lalu
+    ditambahkan di bawah, dan lubang yang tersisa diisi baris terakhir.
+
+    Returns:
+    - (layout, added, removed): layout berisi index baris rows per posisi data.
+    """
+    def keys(values, as_text):
+        seen = {}
+        result = []
+        for row in values:
+            key = tuple(as_text(row[position]) if position < len(row) else '' for position in key_positions)
+            seen[key] = seen.get(key, 0) + 1
+            result.append((key, seen[key]))  # nomor kemunculan membedakan kunci ganda
+        return result
+
+    wanted = {key: index for index, key in enumerate(keys(rows, _sheet_key))}
+    layout = [wanted.pop(key, None) for key in keys(current, str)]
+    removed = layout.count(None)
+    new_rows = sorted(wanted.values())
+    holes = [position for position, index in enumerate(layout) if index is None]
+
+    for position, index in zip(holes, new_rows):
+        layout[position] = index
+    layout.extend(new_rows[len(holes):])
+    for position in holes[len(new_rows):]:
+        while layout and layout[-1] is None:
+            layout.pop()
+        if position < len(layout):
+            layout[position] = layout.pop()
+    while layout and layout[-1] is None:
+        layout.pop()
+    return layout, len(new_rows), removed
+
+
+def sync_worksheet(worksheet, df, max_cells_per_request=20000, volatile_columns=('scrape_timestamp',),
+                   key_columns=('title',)):
+    """
+    Menyamakan isi worksheet dengan df secara inkremental.
+
+    Sheet dibaca sekali (get_all_values), lalu hanya baris yang berubah atau
+    bertambah yang dikirim sebagai rentang lewat batch_update (dipecah agar
+    tiap request maksimal max_cells_per_request sel), dan baris sisa di bawah
+    data baru dikosongkan dengan satu batch_clear. Nilai ditulis dengan
+    value_input_option 'RAW' agar hasil baca ulang stabil untuk diff berikutnya.
+
+    Baris dicocokkan lewat key_columns, bukan posisi: produk yang sudah ada
+    tetap di barisnya, produk baru mengisi baris produk yang hilang lalu
+    ditambahkan di bawah. Akibatnya urutan baris di sheet bisa berbeda dari
+    urutan df. Jika header berubah atau key_columns tidak ada, baris
+    dibandingkan per posisi dengan urutan df.
+
+    Kolom di volatile_columns (default scrape_timestamp, berubah setiap run)
+    tidak ikut dibandingkan; nilainya hanya ditulis ulang bersama baris yang
+    kolom datanya berubah atau baris baru.
+
+    Returns:
+    - dict berisi 'rows_changed', 'rows_added', 'rows_removed', 'rows_moved',
+      'requests' dan 'cells_written'.
+    """
+    current = worksheet.get_all_values()
+    header = list(df.columns)
+    rows = [[_sheet_value(value) for value in row] for row in df.itertuples(index=False, name=None)]
+    width = max(len(header), max((len(row) for row in current), default=0))
+
+    def pad(row):
+        return list(row) + [''] * (width - len(row))
+
+    # Header selalu dibandingkan penuh; baris data tanpa kolom volatil
+    volatile = {position for position, col in enumerate(header) if col in volatile_columns}
+    compared = [position for position in range(width) if position not in volatile]
+
+    key_positions = [header.index(col) for col in key_columns if col in header]
+    keyed = bool(current) and pad(current[0]) == pad(header) and len(key_positions) == len(key_columns) > 0
+    if keyed:
+        layout, rows_added, rows_removed = _keyed_layout(current[1:], rows, key_positions)
+    else:
+        layout = list(range(len(rows)))
+    desired = [header] + [rows[index] for index in layout]
+
+    def same_row(index):
+        old, new = pad(current[index]), pad(desired[index])
+        positions = range(width) if index == 0 else compared
+        return all(_same_cell(old[position], new[position]) for position in positions)
+
+    changed = [index for index in range(min(len(current), len(desired))) if not same_row(index)]
+    added = list(range(len(current), len(desired)))
+    if keyed:
+        # Posisi yang ditulis: produk sama dengan data berubah, produk baru, atau baris yang dipindah
+        rows_changed = sum(1 for index in changed
+                           if all(pad(current[index])[position] == _sheet_key(desired[index][position])
+                                  for position in key_positions))
+        rows_moved = len(changed) + len(added) - rows_changed - rows_added
+    else:
+        rows_changed, rows_added, rows_moved = len(changed), len(added), 0
+        rows_removed = max(len(current) - len(desired), 0)
+
+    if len(desired) > worksheet.row_count:
+        worksheet.add_rows(len(desired) - worksheet.row_count)
+    if width > worksheet.col_count:
+        worksheet.add_cols(width - worksheet.col_count)
+
+    # Rentang yang ditulis, dipecah sesuai batas sel per request
+    rows_per_range = max(1, max_cells_per_request // width)
+    ranges = []
+    for start, end in _row_runs(changed + added):
+        for chunk_start in range(start, end + 1, rows_per_range):
+            chunk_end = min(end, chunk_start + rows_per_range - 1)
+            ranges.append({
+                'range': f"{rowcol_to_a1(chunk_start + 1, 1)}:{rowcol_to_a1(chunk_end + 1, width)}",
+                'values': [pad(desired[index]) for index in range(chunk_start, chunk_end + 1)],
+            })
+
+    requests = 0
+    cells_written = 0
+    batch, batch_cells = [], 0
+    for item in ranges:
+        size = len(item['values']) * width
+        if batch and batch_cells + size > max_cells_per_request:
+            worksheet.batch_update(batch, value_input_option='RAW')
+            requests += 1
+            batch, batch_cells = [], 0
+        batch.append(item)
+        batch_cells += size
+        cells_written += size
+    if batch:
+        worksheet.batch_update(batch, value_input_option='RAW')
+        requests += 1
+
+    removed = len(current) - len(desired)
+    if removed > 0:
+        worksheet.batch_clear([f"{rowcol_to_a1(len(desired) + 1, 1)}:{rowcol_to_a1(len(current), width)}"])
+        requests += 1
+
+    return {
+        'rows_changed': rows_changed,
+        'rows_added': rows_added,
+        'rows_removed': rows_removed,
+        'rows_moved': rows_moved,
+        'requests': requests,
+        'cells_written': cells_written,
+    }
+
+
+def upload_df_to_gsheet(df, service_account_file, spreadsheet_id, sheet_name='Sheet1', append=False,
+                        sync=False):
     """
     Mengunggah DataFrame ke Google Sheets dengan error handling.
 
@@ -41,6 +366,13 @@ def upload_df_to_gsheet(df, service_account_file, spreadsheet_id, sheet_name='Sh
     - service_account_file (str): Nama file kredensial JSON.
     - spreadsheet_id (str): ID Google Spreadsheet (bukan URL lengkap).
     - sheet_name (str): Nama sheet/tab di dalam spreadsheet (default: 'Sheet1').
+    - append (bool): Tambahkan baris di bawah data yang ada tanpa clear (untuk micro-batch).
+    - sync (bool): Hanya kirim baris yang berubah/bertambah/terhapus (sync_worksheet)
+      alih-alih clear lalu tulis ulang seluruh sheet.
+
+    Returns:
+    - dict statistik sync_worksheet untuk mode sync, selain itu jumlah baris
+      yang diunggah; None jika gagal.
     """
     try:
         # Validasi DataFrame
@@ -62,12 +394,27 @@ def upload_df_to_gsheet(df, service_account_file, spreadsheet_id, sheet_name='Sh
         # Akses worksheet
         worksheet = spreadsheet.worksheet(sheet_name)
 
+        if sync:
+            stats = sync_worksheet(worksheet, df)
+            print(f"✅ Sync ke spreadsheet: {spreadsheet.title} → {sheet_name}: "
+                  f"{stats['rows_changed']} berubah, {stats['rows_added']} baru, "
+                  f"{stats['rows_removed']} dihapus, {stats['cells_written']} sel dalam {stats['requests']} request.")
+            return stats
+
+        if append:
+            # Tambahkan baris baru tanpa header
+            values = df.astype(object).where(df.notna(), '').astype(str).values.tolist()
+            worksheet.append_rows(values, value_input_option='USER_ENTERED')
+            print(f"✅ {len(values)} baris ditambahkan ke spreadsheet: {spreadsheet.title} → {sheet_name}")
+            return len(values)
+
         # Hapus isi lama (opsional)
         worksheet.clear()
 
         # Upload DataFrame
         set_with_dataframe(worksheet, df)
         print(f"✅ DataFrame berhasil diunggah ke spreadsheet: {spreadsheet.title} → {sheet_name}")
+        return len(df)
 
     except FileNotFoundError:
         print(f"❌ File kredensial '{service_account_file}' tidak ditemukan.")
@@ -79,7 +426,279 @@ def upload_df_to_gsheet(df, service_account_file, spreadsheet_id, sheet_name='Sh
         print(f"❌ Terjadi kesalahan umum: {e}")
 
 
-def load_df_to_postgresql(df, db_name, user, password, host, port, table_name, if_exists='replace'):
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(conn_str):
+    """
+    Mengembalikan engine SQLAlchemy bersama untuk conn_str sehingga connection
+    pool dipakai ulang antar pemanggilan, bukan membuat engine baru tiap load.
+    """
+    with _engines_lock:
+        engine = _engines.get(conn_str)
+        if engine is None:
+            engine = create_engine(conn_str, pool_pre_ping=True)
+            _engines[conn_str] = engine
+        return engine
+
+
+def dispose_engines():
+    """Menutup semua connection pool engine bersama (panggil saat proses selesai)."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def copy_insert(table, conn, keys, data_iter):
+    """
+    Metode insert untuk DataFrame.to_sql yang mengalirkan satu chunk baris
+    melalui PostgreSQL 'COPY ... FROM STDIN' dari buffer CSV di memori.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(data_iter)
+    buffer.seek(0)
+
+    columns = ', '.join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+
+    sql = f'COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)'
+
+    dbapi_conn = conn.connection.dbapi_connection
+    with dbapi_conn.cursor() as cursor:
+        if hasattr(cursor, 'copy_expert'):  # psycopg2
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _resolve_method(method, dialect_name):
+    if method == 'copy':
+        return copy_insert if dialect_name == 'postgresql' else 'multi'
+    return method
+
+
+def write_df_to_sql(df, engine, table_name, if_exists='append', method='copy', chunksize=10000):
+    """
+    Menulis DataFrame ke tabel dalam satu transaksi.
+
+    Parameters:
+    - method (str/callable): 'copy' untuk COPY FROM STDIN (khusus PostgreSQL,
+      dialek lain otomatis memakai 'multi'), atau None / 'multi' / callable
+      seperti pada DataFrame.to_sql.
+    - chunksize (int): Jumlah baris per chunk COPY/INSERT.
+
+    Returns:
+    - int: Jumlah baris yang ditulis.
+    """
+    with engine.begin() as conn:
+        df.to_sql(name=table_name, con=conn, if_exists=if_exists, index=False,
+                  method=_resolve_method(method, engine.dialect.name), chunksize=chunksize)
+    return len(df)
+
+
+def add_row_hash(df, key_columns, exclude=('scrape_timestamp',), column='row_hash'):
+    """
+    Mengembalikan salinan df dengan kolom hash konten (int64) dari semua kolom
+    selain kunci dan kolom 'exclude' (timestamp selalu berubah tiap run).
+    """
+    content_columns = [col for col in df.columns if col not in key_columns and col not in exclude]
+    hashed = pd.util.hash_pandas_object(df[content_columns].astype(str), index=False)
+    result = df.copy()
+    result[column] = hashed.to_numpy().view('int64')
+    return result
+
+
+def dedupe_table_keys(conn, table_name, key_columns, order_column='scrape_timestamp'):
+    """
+    Migrasi tabel lama hasil mode 'append': untuk setiap kunci ganda, hanya
+    baris terbaru (order_column terbesar, atau baris terakhir jika kolom itu
+    tidak ada) yang dipertahankan, sehingga unique index bisa dibuat.
+    Dijalankan di dalam transaksi conn milik pemanggil.
+
+    Returns:
+    - int jumlah baris ganda yang dihapus.
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    target = quote(table_name)
+    keys = [quote(col) for col in key_columns]
+    duplicate_keys = f'SELECT {", ".join(keys)} FROM {target} GROUP BY {", ".join(keys)} HAVING COUNT(*) > 1'
+    rows = pd.read_sql(text(
+        f'SELECT t.* FROM {target} t JOIN ({duplicate_keys}) d ON '
+        + ' AND '.join(f't.{key} = d.{key}' for key in keys)
+    ), conn)
+    if rows.empty:
+        return 0
+
+    if order_column in rows.columns:
+        rows = rows.sort_values(order_column, kind='stable')
+    kept = rows.drop_duplicates(subset=key_columns, keep='last')
+
+    staging_name = f'{table_name}_dedupe_staging'
+    staging = quote(staging_name)
+    kept[key_columns].to_sql(name=staging_name, con=conn, if_exists='replace', index=False)
+    join = ' AND '.join(f'{target}.{key} = s.{key}' for key in keys)
+    conn.execute(text(f'DELETE FROM {target} WHERE EXISTS (SELECT 1 FROM {staging} s WHERE {join})'))
+    conn.execute(text(f'DROP TABLE {staging}'))
+    kept.to_sql(name=table_name, con=conn, if_exists='append', index=False)
+    return len(rows) - len(kept)
+
+
+def upsert_df_to_sql(df, engine, table_name, key_columns=('title',), method='copy', chunksize=10000,
+                     dedupe_existing=True):
+    """
+    Upsert idempoten berbasis kunci produk melalui tabel staging.
+
+    Baris di-hash (add_row_hash), ditulis ke tabel staging, lalu hanya baris
+    baru atau yang hash kontennya berubah yang di-INSERT ... ON CONFLICT ke
+    tabel tujuan. Baris yang tidak berubah tidak ditulis ulang. Tabel tujuan
+    dibuat bila belum ada, lengkap dengan unique index pada key_columns.
+
+    Tabel lama yang diisi mode 'append' bisa berisi kunci ganda sehingga
+    unique index gagal dibuat. Jika dedupe_existing True, kunci ganda dirapikan
+    dulu (dedupe_table_keys) sebelum index dibuat; jika False atau index tetap
+    gagal, ValueError dengan langkah perbaikannya dilempar dan transaksi di-rollback.
+
+    Returns:
+    - dict berisi jumlah 'inserted', 'updated' dan 'unchanged'.
+    """
+    key_columns = list(key_columns)
+    missing_columns = [col for col in key_columns if col not in df.columns]
+    if missing_columns:
+        raise KeyError(f"Kolom kunci tidak ditemukan: {missing_columns}")
+
+    staged = add_row_hash(df.drop_duplicates(subset=key_columns, keep='first'), key_columns)
+    staging_name = f'{table_name}_staging'
+
+    quote = engine.dialect.identifier_preparer.quote
+    target, staging = quote(table_name), quote(staging_name)
+    columns = [quote(col) for col in staged.columns]
+    keys = [quote(col) for col in key_columns]
+    join = ' AND '.join(f't.{key} = s.{key}' for key in keys)
+    changed = f't.{keys[0]} IS NULL OR t."row_hash" IS NULL OR t."row_hash" <> s."row_hash"'
+
+    with engine.begin() as conn:
+        if not inspect(conn).has_table(table_name):
+            staged.head(0).to_sql(name=table_name, con=conn, index=False)
+        elif 'row_hash' not in [col['name'] for col in inspect(conn).get_columns(table_name)]:
+            conn.execute(text(f'ALTER TABLE {target} ADD COLUMN "row_hash" BIGINT'))
+
+        index_name = f"{table_name}_key_idx"
+        if index_name not in [index['name'] for index in inspect(conn).get_indexes(table_name)]:
+            if dedupe_existing:
+                removed = dedupe_table_keys(conn, table_name, key_columns)
+                if removed:
+                    incr('load.deduped_rows', removed)
+                    print(f"⚠️ {removed} baris dengan kunci {key_columns} ganda dihapus dari '{table_name}' "
+                          f"(baris terbaru dipertahankan) sebelum unique index dibuat.")
+            try:
+                conn.execute(text(f'CREATE UNIQUE INDEX {quote(index_name)} ON {target} ({", ".join(keys)})'))
+            except IntegrityError as e:
+                raise ValueError(
+                    f"Tabel '{table_name}' berisi kunci {key_columns} ganda (sisa mode 'append'), unique index "
+                    f"untuk upsert tidak bisa dibuat. Jalankan upsert dengan dedupe_existing=True, hapus baris "
+                    f"ganda secara manual, atau pakai if_exists='append'. Detail: {e.orig}"
+                ) from e
+
+        staged.to_sql(name=staging_name, con=conn, if_exists='replace', index=False,
+                      method=_resolve_method(method, engine.dialect.name), chunksize=chunksize)
+
+        inserted = conn.execute(text(
+            f'SELECT COUNT(*) FROM {staging} s LEFT JOIN {target} t ON {join} WHERE t.{keys[0]} IS NULL'
+        )).scalar()
+        updated = conn.execute(text(
+            f'SELECT COUNT(*) FROM {staging} s JOIN {target} t ON {join} '
+            f'WHERE t."row_hash" IS NULL OR t."row_hash" <> s."row_hash"'
+        )).scalar()
+
+        assignments = ', '.join(f'{col} = excluded.{col}' for col in columns if col not in keys)
+        conn.execute(text(
+            f'INSERT INTO {target} ({", ".join(columns)}) '
+            f'SELECT {", ".join(f"s.{col}" for col in columns)} FROM {staging} s '
+            f'LEFT JOIN {target} t ON {join} WHERE {changed} '
+            f'ON CONFLICT ({", ".join(keys)}) DO UPDATE SET {assignments}'
+        ))
+        conn.execute(text(f'DROP TABLE {staging}'))
+
+    return {'inserted': inserted, 'updated': updated, 'unchanged': len(staged) - inserted - updated}
+
+
+def delete_keys_from_sql(keys, engine, table_name, key_columns=('title',), method='copy', chunksize=10000):
+    """
+    Menghapus baris tabel yang kuncinya ada di DataFrame 'keys', lewat tabel
+    staging dan satu DELETE ... WHERE EXISTS (bukan satu query per kunci).
+
+    Returns:
+    - int jumlah baris yang dihapus.
+    """
+    key_columns = list(key_columns)
+    if keys.empty:
+        return 0
+    staging_name = f'{table_name}_delete_staging'
+    quote = engine.dialect.identifier_preparer.quote
+    target, staging = quote(table_name), quote(staging_name)
+    join = ' AND '.join(f'{target}.{quote(key)} = s.{quote(key)}' for key in key_columns)
+
+    with engine.begin() as conn:
+        if not inspect(conn).has_table(table_name):
+            return 0
+        keys[key_columns].drop_duplicates().to_sql(
+            name=staging_name, con=conn, if_exists='replace', index=False,
+            method=_resolve_method(method, engine.dialect.name), chunksize=chunksize)
+        deleted = conn.execute(text(
+            f'DELETE FROM {target} WHERE EXISTS (SELECT 1 FROM {staging} s WHERE {join})'
+        )).rowcount
+        conn.execute(text(f'DROP TABLE {staging}'))
+    return deleted
+
+
+def apply_changes_to_sql(changes, engine, table_name, key_columns=('title',), method='copy', chunksize=10000):
+    """
+    Menerapkan utils.cdc.ChangeSet ke tabel: baris baru dan berubah di-upsert
+    (upsert_df_to_sql), baris yang hilang dihapus (delete_keys_from_sql).
+    Hanya perubahan yang dikirim ke database, bukan seluruh snapshot.
+
+    Returns:
+    - dict jumlah 'inserted', 'updated', 'unchanged' dan 'deleted'.
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    if not changes.upserts.empty:
+        counts = upsert_df_to_sql(changes.upserts, engine, table_name, key_columns, method=method,
+                                  chunksize=chunksize)
+    counts['deleted'] = delete_keys_from_sql(changes.deletes, engine, table_name, key_columns, method=method,
+                                             chunksize=chunksize)
+    return counts
+
+
+def load_changes_to_postgresql(changes, db_name, user, password, host, port, table_name, method='copy',
+                               chunksize=10000, key_columns=('title',)):
+    """
+    Memuat ChangeSet hasil utils.cdc ke tabel PostgreSQL (lihat apply_changes_to_sql).
+    Parameter koneksi sama dengan load_df_to_postgresql.
+
+    Returns:
+    - dict jumlah 'inserted', 'updated', 'unchanged', 'deleted'; None jika gagal.
+    """
+    try:
+        conn_str = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}"
+        engine = get_engine(conn_str)
+        counts = apply_changes_to_sql(changes, engine, table_name, key_columns, method=method, chunksize=chunksize)
+        print(f"✅ Perubahan dimuat ke tabel '{table_name}' di database '{db_name}': "
+              f"{counts['inserted']} baru, {counts['updated']} berubah, {counts['deleted']} dihapus.")
+        return counts
+
+    except SQLAlchemyError as db_err:
+        print(f"❌ Kesalahan saat koneksi atau query ke database: {db_err}")
+    except KeyError as ke:
+        print(f"❌ Kolom tidak ditemukan: {ke}")
+    except Exception as e:
+        print(f"❌ Kesalahan umum: {e}")
+
+
+def load_df_to_postgresql(df, db_name, user, password, host, port, table_name, if_exists='replace',
+                          method='copy', chunksize=10000, key_columns=('title',)):
     """
     Memuat DataFrame ke tabel PostgreSQL.
 
@@ -91,10 +710,16 @@ def load_df_to_postgresql(df, db_name, user, password, host, port, table_name, i
     - host (str): Host database (biasanya 'localhost' atau IP).
     - port (int or str): Port PostgreSQL (default 5432).
     - table_name (str): Nama tabel tujuan.
-    - if_exists (str): 'replace', 'append', atau 'fail' (default: 'replace').
+    - if_exists (str): 'replace', 'append', 'fail', atau 'upsert' (default: 'replace').
+      'upsert' hanya menulis baris baru/berubah berdasarkan key_columns.
+    - method (str): 'copy' (bulk COPY FROM STDIN, default), 'multi' atau None
+      (INSERT per baris seperti to_sql bawaan).
+    - chunksize (int): Jumlah baris per chunk (default 10000).
+    - key_columns (list): Kolom identitas produk untuk mode 'upsert' (default: title).
 
     Returns:
-    - None
+    - dict jumlah 'inserted', 'updated', 'unchanged' untuk mode 'upsert', selain
+      itu jumlah baris yang dimuat; None jika gagal.
     """
     try:
         if not isinstance(df, pd.DataFrame):
@@ -103,16 +728,73 @@ def load_df_to_postgresql(df, db_name, user, password, host, port, table_name, i
         if df.empty:
             raise ValueError("DataFrame kosong, tidak bisa dimasukkan ke database.")
 
-        # Buat connection string PostgreSQL
-        conn_str = f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
-        engine = create_engine(conn_str)
+        # Buat connection string PostgreSQL, engine dipakai ulang antar pemanggilan
+        conn_str = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{db_name}"
+        engine = get_engine(conn_str)
+
+        if if_exists == 'upsert':
+            counts = upsert_df_to_sql(df, engine, table_name, key_columns, method=method, chunksize=chunksize)
+            print(f"✅ Upsert ke tabel '{table_name}' di database '{db_name}': "
+                  f"{counts['inserted']} baru, {counts['updated']} berubah, {counts['unchanged']} tetap.")
+            return counts
 
-        # Masukkan data ke database
-        df.to_sql(name=table_name, con=engine, if_exists=if_exists, index=False)
+        # Masukkan data ke database dalam satu transaksi
+        write_df_to_sql(df, engine, table_name, if_exists=if_exists, method=method, chunksize=chunksize)
         print(f"✅ DataFrame berhasil dimuat ke tabel '{table_name}' di database '{db_name}'.")
+        return len(df)
 
     except SQLAlchemyError as db_err:
         print(f"❌ Kesalahan saat koneksi atau query ke database: {db_err}")
+    except KeyError as ke:
+        print(f"❌ Kolom tidak ditemukan: {ke}")
+    except ValueError as ve:
+        print(f"❌ {ve}")
     except Exception as e:
         print(f"❌ Kesalahan umum: {e}")
 
+
+def load_batches(batches, sinks, on_loaded=None):
+    """
+    Memuat aliran micro-batch DataFrame ke beberapa sink begitu batch tersedia,
+    sehingga baris pertama sampai ke tujuan sebelum scraping selesai.
+
+    Parameters:
+    - batches (iterable of pd.DataFrame): Misal hasil transform_stream.
+    - sinks (dict nama -> callable, atau list of callable): Dipanggil sebagai
+      sink(df, first_batch), di mana first_batch bernilai True hanya untuk
+      batch pertama (untuk menulis header atau mengganti isi lama). Seperti
+      loader lain di modul ini, kembalian None/False atau exception berarti gagal.
+    - on_loaded (callable): Dipanggil sebagai on_loaded(df) hanya setelah semua
+      sink berhasil untuk batch itu, misal DedupIndex.add.
+
+    Returns:
+    - int: Jumlah total baris yang dimuat ke semua sink.
+
+    Raises:
+    - RuntimeError: Jika ada sink yang gagal; streaming dihentikan pada batch itu.
+    """
+    if not isinstance(sinks, dict):
+        sinks = {f'sink{position}': sink for position, sink in enumerate(sinks)}
+    total = 0
+    first_batch = True
+    for number, df in enumerate(batches, start=1):
+        failed = []
+        for name, sink in sinks.items():
+            try:
+                result = sink(df, first_batch)
+            except Exception as e:
+                print(f"❌ Sink '{name}' gagal pada batch {number}: {e}")
+                result = None
+            if result is None or result is False:
+                incr(f'load.failed.{name}')
+                failed.append(name)
+        if failed:
+            raise RuntimeError(f"Sink gagal pada batch {number}: {', '.join(failed)}; "
+                               f"{total} baris sebelumnya sudah dimuat.")
+        if on_loaded is not None:
+            on_loaded(df)
+        incr('load.rows_streamed', len(df))
+        total += len(df)
+        first_batch = False
+    print(f"✅ {total} baris dimuat secara streaming ke {len(sinks)} sink.")
+    return total
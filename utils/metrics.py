@@ -0,0 +1,184 @@
+"""
+Instrumentasi ETL: waktu per stage (wall dan CPU), counter, dan hook cProfile.
+
+Semua modul mencatat ke recorder aktif (lihat get_recorder/set_recorder):
+- extract.*   : pages_fetched, bytes_downloaded, not_modified, fetch_errors,
+                cards_parsed, parse_seconds, parse_cache_hits
+- transform.* : rows_in, rows_out, dropped.<filter>
+- load.*      : rows.<sink>, seconds.<sink>, failed.<sink>
+
+Contoh:
+    recorder = set_recorder(MetricsRecorder(profile=['transform'], profile_dir='profiles'))
+    with stage('extract'):
+        data = scrape_web(url)
+    recorder.write_json('metrics.json')
+
+Profiling juga bisa diaktifkan tanpa mengubah kode lewat variabel
+lingkungan ETL_PROFILE, misal ETL_PROFILE=transform,load.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+# Rasio turunan yang dihitung di to_dict(): nama -> (pembilang, penyebut)
+RATES = {
+    'extract.cards_per_second': ('extract.cards_parsed', 'extract.parse_seconds'),
+}
+# Counter jumlah baris per stage untuk format_table(); prefix berakhiran '.' diambil nilai terbesarnya
+# (misal baris terbanyak yang dimuat satu sink)
+STAGE_ROWS = {
+    'extract': 'extract.cards_parsed',
+    'transform': 'transform.rows_out',
+    'load': 'load.rows.',
+}
+
+
+class MetricsRecorder:
+    """
+    Pengumpul metrik yang aman dipakai bersama oleh banyak thread.
+
+    Parameters:
+    - profile (iterable): Nama stage yang dibungkus cProfile. None membaca
+      variabel lingkungan ETL_PROFILE (dipisah koma).
+    - profile_dir (str): Jika diberikan, statistik cProfile tiap stage
+      disimpan sebagai '<profile_dir>/<stage>.prof' (bisa dibuka snakeviz/pstats).
+    - profile_top (int): Jumlah fungsi teratas (cumulative) yang dicantumkan di JSON.
+    """
+
+    def __init__(self, profile=None, profile_dir=None, profile_top=15):
+        if profile is None:
+            profile = [name for name in os.environ.get('ETL_PROFILE', '').split(',') if name]
+        self.profile = set(profile)
+        self.profile_dir = profile_dir
+        self.profile_top = profile_top
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.stages = {}
+            self.profiles = {}
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        with self._lock:
+            self.counters[name] = value
+
+    def record_stage(self, name, wall, cpu):
+        with self._lock:
+            entry = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0})
+            entry['wall_seconds'] += wall
+            entry['cpu_seconds'] += cpu
+            entry['calls'] += 1
+
+    @contextmanager
+    def stage(self, name, profile=False):
+        """
+        Mengukur wall time dan CPU time (seluruh proses) sebuah stage.
+        profile=True (atau nama stage ada di self.profile) membungkusnya dengan cProfile.
+        """
+        profiler = cProfile.Profile() if profile or name in self.profile else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self.record_stage(name, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+            if profiler is not None:
+                self._save_profile(name, profiler)
+
+    def _save_profile(self, name, profiler):
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(self.profile_top)
+        entry = {'top': stream.getvalue().strip().splitlines()}
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            entry['path'] = os.path.join(self.profile_dir, f'{name}.prof')
+            stats.dump_stats(entry['path'])
+        with self._lock:
+            self.profiles[name] = entry
+
+    def to_dict(self):
+        with self._lock:
+            counters = dict(self.counters)
+            result = {
+                'stages': {name: dict(entry) for name, entry in self.stages.items()},
+                'counters': counters,
+                'rates': {},
+            }
+            if self.profiles:
+                result['profiles'] = dict(self.profiles)
+        for name, (numerator, denominator) in RATES.items():
+            if counters.get(denominator):
+                result['rates'][name] = counters.get(numerator, 0) / counters[denominator]
+        return result
+
+    def _stage_rows(self, name, counters):
+        counter = STAGE_ROWS.get(name)
+        if counter is None:
+            return None
+        if counter.endswith('.'):
+            values = [value for key, value in counters.items() if key.startswith(counter)]
+            return max(values) if values else None
+        return counters.get(counter)
+
+    def format_table(self):
+        """Tabel teks waktu per stage (wall, CPU, jumlah panggilan, baris dan baris/detik)."""
+        data = self.to_dict()
+        lines = [f"{'Stage':<12}{'Wall (s)':>10}{'CPU (s)':>10}{'Calls':>7}{'Rows':>10}{'Rows/s':>11}"]
+        total_wall = total_cpu = 0.0
+        for name, entry in data['stages'].items():
+            rows = self._stage_rows(name, data['counters'])
+            rate = rows / entry['wall_seconds'] if rows is not None and entry['wall_seconds'] > 0 else None
+            lines.append(
+                f"{name:<12}{entry['wall_seconds']:>10.2f}{entry['cpu_seconds']:>10.2f}{entry['calls']:>7}"
+                f"{rows if rows is not None else '-':>10}{f'{rate:.0f}' if rate is not None else '-':>11}"
+            )
+            total_wall += entry['wall_seconds']
+            total_cpu += entry['cpu_seconds']
+        lines.append(f"{'total':<12}{total_wall:>10.2f}{total_cpu:>10.2f}")
+        return '\n'.join(lines)
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+        return path
+
+
+_recorder = MetricsRecorder()
+
+
+def get_recorder():
+    """Recorder aktif yang dipakai oleh instrumentasi extract/transform/load."""
+    return _recorder
+
+
+def set_recorder(recorder):
+    """Mengganti recorder aktif (misal satu recorder per run) dan mengembalikannya."""
+    global _recorder
+    _recorder = recorder
+    return recorder
+
+
+def incr(name, value=1):
+    _recorder.incr(name, value)
+
+
+def stage(name, profile=False):
+    return _recorder.stage(name, profile)
@@ -0,0 +1,117 @@
+"""
+Orkestrator load: mengirim DataFrame final ke semua sink secara bersamaan.
+
+Setiap sink berjalan di thread-nya sendiri dengan timeout dan retry
+masing-masing, sehingga sink yang lambat atau gagal tidak menahan sink lain.
+Waktu total menjadi kira-kira waktu sink paling lambat, bukan jumlahnya.
+
+Contoh:
+    results = run_sinks(df, [
+        make_sink('csv', lambda df: export_to_csv(df, 'fashion_studio.csv')),
+        make_sink('gsheet', lambda df: upload_df_to_gsheet(df, ...), timeout=120, retries=2),
+        make_sink('postgresql', lambda df: load_df_to_postgresql(df=df, ...), retries=1),
+    ])
+"""
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, TimeoutError
+
+from utils.metrics import incr
+
+# func(df) mengembalikan None jika gagal (pola loader di utils.load) atau raise
+Sink = namedtuple('Sink', ['name', 'func', 'timeout', 'retries', 'backoff'])
+SinkResult = namedtuple('SinkResult', ['name', 'success', 'rows', 'duration', 'attempts', 'error'])
+
+
+def make_sink(name, func, timeout=300, retries=0, backoff=1.0):
+    """
+    Mendefinisikan satu sink.
+
+    Parameters:
+    - name (str): Nama sink untuk laporan.
+    - func (callable): Dipanggil sebagai func(df); df tidak boleh diubah.
+    - timeout (float): Batas waktu total sink (detik), termasuk retry. None = tanpa batas.
+    - retries (int): Jumlah percobaan ulang setelah gagal.
+    - backoff (float): Jeda awal antar percobaan, berlipat dua tiap retry.
+    """
+    return Sink(name, func, timeout, retries, backoff)
+
+
+def _rows_written(result, df):
+    """Jumlah baris dari nilai kembalian loader (int, dict statistik, atau lainnya)."""
+    if isinstance(result, bool):
+        return len(df)
+    if isinstance(result, int):
+        return result
+    if isinstance(result, dict):
+        return sum(result.get(key, 0) for key in ('inserted', 'updated', 'deleted', 'rows_changed', 'rows_added'))
+    return len(df)
+
+
+def _run_sink(sink, df, started):
+    attempts = 0
+    error = None
+    while True:
+        attempts += 1
+        try:
+            result = sink.func(df)
+            if result is not None:
+                return SinkResult(sink.name, True, _rows_written(result, df),
+                                  time.perf_counter() - started, attempts, None)
+            error = 'sink mengembalikan None (gagal)'
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+
+        delay = sink.backoff * (2 ** (attempts - 1))
+        out_of_time = sink.timeout is not None and time.perf_counter() - started + delay > sink.timeout
+        if attempts > sink.retries or out_of_time:
+            return SinkResult(sink.name, False, 0, time.perf_counter() - started, attempts, error)
+        time.sleep(delay)
+
+
+def _start_sink(sink, df, started):
+    """Menjalankan sink di thread daemon sendiri agar sink yang macet tidak menahan proses."""
+    future = Future()
+
+    def target():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(_run_sink(sink, df, started))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name=f'sink-{sink.name}', daemon=True).start()
+    return future
+
+
+def run_sinks(df, sinks):
+    """
+    Mengirim df ke semua sink secara paralel.
+
+    Returns:
+    - list SinkResult (urutan sama dengan sinks): success, rows, duration,
+      attempts dan error per sink. Sink yang melewati timeout dilaporkan
+      gagal dengan error 'timeout' tanpa menunggu sink tersebut selesai.
+    """
+    started = time.perf_counter()
+    futures = [_start_sink(sink, df, started) for sink in sinks]
+
+    results = []
+    for sink, future in zip(sinks, futures):
+        remaining = None if sink.timeout is None else max(0.0, sink.timeout - (time.perf_counter() - started))
+        try:
+            results.append(future.result(timeout=remaining))
+        except TimeoutError:
+            results.append(SinkResult(sink.name, False, 0, time.perf_counter() - started, None, 'timeout'))
+
+    for result in results:
+        incr(f'load.rows.{result.name}', result.rows)
+        incr(f'load.seconds.{result.name}', result.duration)
+        if not result.success:
+            incr(f'load.failed.{result.name}')
+        status = '✅' if result.success else '❌'
+        detail = f"{result.rows} baris" if result.success else result.error
+        print(f"{status} Sink '{result.name}': {detail} dalam {result.duration:.2f} s")
+    print(f"⏱️ Semua sink selesai dalam {time.perf_counter() - started:.2f} s.")
+    return results
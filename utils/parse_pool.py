@@ -0,0 +1,74 @@
+"""
+Parsing halaman katalog di banyak proses.
+
+Setelah fetching dibuat paralel, parsing HTML (BeautifulSoup/lxml) menjadi
+bottleneck karena terikat GIL. ParsePool mengirim bytes halaman mentah ke
+ProcessPoolExecutor; tiap proses mem-parsing dan mengekstrak kartu lalu
+mengembalikan tuple ringkas (bukan objek soup/dict) agar biaya pickling kecil.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.parser import FIELDS, get_backend, parse_page_with
+
+
+def parse_page_compact(content, backend):
+    """
+    Dijalankan di proses worker. Mengembalikan
+    (records sebagai tuple urut FIELDS, not_found, has_next, last_page).
+    """
+    page = parse_page_with(content, backend)
+    records = [tuple(record[field] for field in FIELDS) for record in page['records']]
+    return records, page['not_found'], page['has_next'], page['last_page']
+
+
+def expand_page(compact):
+    """Mengubah hasil parse_page_compact kembali ke format dict parse_page."""
+    records, not_found, has_next, last_page = compact
+    return {
+        'records': [dict(zip(FIELDS, record)) for record in records],
+        'not_found': not_found,
+        'has_next': has_next,
+        'last_page': last_page,
+    }
+
+
+class ParsePool:
+    """
+    Pool proses untuk parse_page.
+
+    Parameters:
+    - workers (int): Jumlah proses; None = jumlah core.
+    - chunksize (int): Jumlah halaman per tugas yang dikirim ke proses pada
+      map(); nilai lebih besar mengurangi overhead IPC untuk katalog besar.
+      Scraping paralel mem-parsing setiap batch halaman lewat map().
+    - backend (str): Backend parser, lihat utils.parser.get_backend.
+
+    Dapat diberikan sebagai argumen 'parser' pada scrape_web/parse_page.
+    """
+
+    def __init__(self, workers=None, chunksize=4, backend=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.backend = get_backend(backend)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def parse(self, content):
+        """Mem-parsing satu halaman (memblokir thread pemanggil, bukan GIL)."""
+        return expand_page(self._executor.submit(parse_page_compact, content, self.backend).result())
+
+    def map(self, contents, chunksize=None):
+        """Mem-parsing banyak halaman; hasil berurutan sesuai input."""
+        backends = [self.backend] * len(contents)
+        compact = self._executor.map(parse_page_compact, contents, backends,
+                                     chunksize=chunksize or self.chunksize)
+        return [expand_page(page) for page in compact]
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,278 @@
+"""
+Backend parser HTML untuk halaman katalog.
+
+Tersedia tiga backend dengan hasil yang identik:
+- 'selectolax' : selectolax (lexbor), tercepat, opsional.
+- 'lxml'       : lxml.html, opsional.
+- 'html.parser': BeautifulSoup + html.parser bawaan Python (fallback).
+
+Setiap kartu produk diekstrak dengan satu kali traversal elemen.
+"""
+import re
+
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml opsional
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax opsional
+    LexborHTMLParser = None
+
+FIELDS = ('title', 'price', 'rating', 'colors', 'size', 'gender')
+P_FIELDS = ('rating', 'colors', 'size', 'gender')
+ERROR_RECORD = dict.fromkeys(FIELDS, 'ERROR')
+# Field mentah (title, price, p_texts) untuk kartu yang gagal diekstrak; _build_record(*ERROR_FIELDS) == ERROR_RECORD
+ERROR_FIELDS = ('ERROR', 'ERROR', ['ERROR'] * len(P_FIELDS))
+PAGE_LINK_PATTERN = re.compile(r'page(\d+)\.html')
+
+
+def available_backends():
+    """Daftar backend yang bisa dipakai di environment ini, urut dari yang tercepat."""
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append('selectolax')
+    if lxml_html is not None:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+
+def get_backend(name=None):
+    """
+    Memilih backend parser. None atau 'auto' memilih backend tercepat yang
+    terpasang; nama backend yang tidak terpasang menimbulkan ValueError.
+    """
+    backends = available_backends()
+    if name in (None, 'auto'):
+        return backends[0]
+    if name not in backends:
+        raise ValueError(f"Backend parser '{name}' tidak tersedia. Pilihan: {backends}")
+    return name
+
+
+def _decode(content):
+    """Mengubah bytes menjadi str; UTF-8 lebih dulu, lalu deteksi encoding seperti bs4."""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(content).unicode_markup
+
+
+def _build_record(title, price, p_texts):
+    record = {
+        'title': title if title is not None else 'N/A',
+        'price': price if price is not None else 'N/A',
+    }
+    for index, field in enumerate(P_FIELDS):
+        record[field] = p_texts[index] if len(p_texts) > index else 'N/A'
+    return record
+
+
+def _last_page(numbers):
+    return max(numbers) if numbers else None
+
+
+def _page_numbers(text, href):
+    numbers = []
+    if text.isdigit():
+        numbers.append(int(text))
+    match = PAGE_LINK_PATTERN.search(href or '')
+    if match:
+        numbers.append(int(match.group(1)))
+    return numbers
+
+
+def _is_not_found(text):
+    return "Page Not Found" in text or "page not found" in text
+
+
+def _empty_page():
+    return {'records': [], 'not_found': True, 'has_next': False, 'last_page': None}
+
+
+def _collector(records, sink):
+    """Penampung field kartu: list dict (default) atau sink.append(title, price, p_texts)."""
+    if sink is not None:
+        return sink.append
+    return lambda title, price, p_texts: records.append(_build_record(title, price, p_texts))
+
+
+# html.parser (BeautifulSoup) ------------------------------------------------
+
+def card_fields_bs4(element):
+    """Field mentah (title, price, p_texts) satu kartu BeautifulSoup dalam satu traversal descendant."""
+    title = price = None
+    p_texts = []
+    for tag in element.find_all(True):
+        classes = tag.get('class') or ()
+        if title is None and 'product-title' in classes:
+            title = tag.text.strip()
+        if price is None and 'price' in classes:
+            price = tag.text.strip()
+        if tag.name == 'p':
+            p_texts.append(tag.text.strip())
+    return title, price, p_texts
+
+
+def extract_card_bs4(element):
+    """Ekstraksi satu kartu BeautifulSoup dalam satu traversal descendant."""
+    return _build_record(*card_fields_bs4(element))
+
+
+def _parse_page_bs4(content, sink=None):
+    soup = BeautifulSoup(content, "html.parser")
+    if _is_not_found(soup.text):
+        return _empty_page()
+
+    records = []
+    collect = _collector(records, sink)
+    for element in soup.find_all(class_='collection-card'):
+        try:
+            fields = card_fields_bs4(element)
+        except Exception as e:
+            print(f"Terjadi kesalahan saat mengekstrak elemen: {e}")
+            fields = ERROR_FIELDS
+        collect(*fields)
+
+    next_button = soup.find('li', class_='page-item next')
+    numbers = []
+    for link in soup.select('.pagination .page-link'):
+        numbers.extend(_page_numbers(link.get_text(strip=True), link.get('href')))
+
+    return {
+        'records': records,
+        'not_found': False,
+        'has_next': bool(next_button) and 'disabled' not in next_button.get('class', []),
+        'last_page': _last_page(numbers),
+    }
+
+
+# lxml -----------------------------------------------------------------------
+
+def card_fields_lxml(element):
+    """Field mentah (title, price, p_texts) satu kartu lxml dalam satu traversal descendant."""
+    title = price = None
+    p_texts = []
+    for tag in element.iterdescendants():
+        if not isinstance(tag.tag, str):
+            continue  # komentar / processing instruction
+        classes = (tag.get('class') or '').split()
+        if title is None and 'product-title' in classes:
+            title = tag.text_content().strip()
+        if price is None and 'price' in classes:
+            price = tag.text_content().strip()
+        if tag.tag == 'p':
+            p_texts.append(tag.text_content().strip())
+    return title, price, p_texts
+
+
+def extract_card_lxml(element):
+    """Ekstraksi satu kartu lxml dalam satu traversal descendant."""
+    return _build_record(*card_fields_lxml(element))
+
+
+def _parse_page_lxml(content, sink=None):
+    root = lxml_html.document_fromstring(_decode(content))
+    if _is_not_found(root.text_content()):
+        return _empty_page()
+
+    records = []
+    collect = _collector(records, sink)
+    for element in root.find_class('collection-card'):
+        try:
+            fields = card_fields_lxml(element)
+        except Exception as e:
+            print(f"Terjadi kesalahan saat mengekstrak elemen: {e}")
+            fields = ERROR_FIELDS
+        collect(*fields)
+
+    has_next = False
+    for item in root.iter('li'):
+        classes = (item.get('class') or '').split()
+        if 'page-item' in classes and 'next' in classes:
+            has_next = 'disabled' not in classes
+            break
+
+    numbers = []
+    for pagination in root.find_class('pagination'):
+        for link in pagination.find_class('page-link'):
+            numbers.extend(_page_numbers(link.text_content().strip(), link.get('href')))
+
+    return {'records': records, 'not_found': False, 'has_next': has_next, 'last_page': _last_page(numbers)}
+
+
+# selectolax -----------------------------------------------------------------
+
+def card_fields_selectolax(element):
+    """Field mentah (title, price, p_texts) satu kartu selectolax dalam satu traversal descendant."""
+    title = price = None
+    p_texts = []
+    nodes = element.traverse()
+    next(nodes)  # traverse() dimulai dari elemen itu sendiri
+    for tag in nodes:
+        classes = (tag.attributes.get('class') or '').split()
+        if title is None and 'product-title' in classes:
+            title = tag.text().strip()
+        if price is None and 'price' in classes:
+            price = tag.text().strip()
+        if tag.tag == 'p':
+            p_texts.append(tag.text().strip())
+    return title, price, p_texts
+
+
+def extract_card_selectolax(element):
+    """Ekstraksi satu kartu selectolax dalam satu traversal descendant."""
+    return _build_record(*card_fields_selectolax(element))
+
+
+def _parse_page_selectolax(content, sink=None):
+    tree = LexborHTMLParser(_decode(content))
+    if tree.root is None or _is_not_found(tree.root.text()):
+        return _empty_page()
+
+    records = []
+    collect = _collector(records, sink)
+    for element in tree.css('.collection-card'):
+        try:
+            fields = card_fields_selectolax(element)
+        except Exception as e:
+            print(f"Terjadi kesalahan saat mengekstrak elemen: {e}")
+            fields = ERROR_FIELDS
+        collect(*fields)
+
+    next_button = tree.css_first('li.page-item.next')
+    has_next = next_button is not None and 'disabled' not in (next_button.attributes.get('class') or '').split()
+
+    numbers = []
+    for link in tree.css('.pagination .page-link'):
+        numbers.extend(_page_numbers(link.text().strip(), link.attributes.get('href')))
+
+    return {'records': records, 'not_found': False, 'has_next': has_next, 'last_page': _last_page(numbers)}
+
+
+_PARSERS = {
+    'html.parser': _parse_page_bs4,
+    'lxml': _parse_page_lxml,
+    'selectolax': _parse_page_selectolax,
+}
+
+
+def parse_page_with(content, backend=None, sink=None):
+    """
+    Mem-parsing satu halaman katalog dengan backend tertentu.
+
+    Jika sink diberikan (misal utils.columnar.ColumnarBuilder), field mentah
+    setiap kartu dikirim ke sink.append(title, price, p_texts) alih-alih
+    dibuat menjadi dict, dan 'records' dikembalikan kosong.
+
+    Returns:
+    - dict berisi 'records', 'not_found', 'has_next' dan 'last_page'.
+    """
+    return _PARSERS[get_backend(backend)](content, sink)
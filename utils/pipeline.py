@@ -0,0 +1,238 @@
+"""
+Pipeline transformasi deklaratif dengan eksekusi lazy.
+
+Langkah-langkah hanya dicatat saat pipeline dibangun; sebelum dijalankan,
+rencana dioptimasi lalu dieksekusi sekali atas satu salinan DataFrame.
+Fungsi-fungsi di utils.transform tetap menjadi blok penyusunnya.
+
+Contoh:
+    pipeline = (
+        TransformPipeline()
+        .filter(deleteUnknownProduct, reads=['title'])
+        .filter(deletePriceUnavailable, reads=['price'], writes=['price'])
+        .parse()
+        .dedupe()
+        .convert_currency(16000)
+        .timestamp()
+    )
+    print(pipeline.explain())
+    df_clean = pipeline.execute(df_raw)
+"""
+from collections import namedtuple
+
+import pandas as pd
+
+from utils.transform import (
+    COLUMN_PARSERS, addScrapeTimestamp, convertPriceToRupiah, deleteDuplicate,
+    deletePriceUnavailable, deleteUnknownProduct
+)
+
+# kind: 'filter', 'parse', 'convert', 'timestamp' atau 'select'
+Step = namedtuple('Step', ['kind', 'name', 'func', 'reads', 'writes', 'params'])
+
+# Parser yang tidak mengubah kesamaan nilai, sehingga filter boleh mendahuluinya
+EQUALITY_PRESERVING_PARSERS = {'title'}
+
+
+class TransformPipeline:
+    """Pembangun rencana transformasi yang dieksekusi secara lazy."""
+
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+
+    def _add(self, step):
+        return TransformPipeline(self.steps + [step])
+
+    # Pembangun langkah --------------------------------------------------
+
+    def filter(self, func, reads, writes=(), name=None):
+        """
+        Menambahkan filter baris inplace, misal deleteUnknownProduct.
+        'reads'/'writes' adalah kolom yang dibaca/diubah filter, dipakai
+        optimizer untuk menentukan urutan yang aman.
+        """
+        return self._add(Step('filter', name or func.__name__, func, frozenset(reads), frozenset(writes), {}))
+
+    def parse(self, *columns):
+        """Mem-parse kolom dengan COLUMN_PARSERS; tanpa argumen = semua kolom (transformData)."""
+        pipeline = self
+        for column in columns or COLUMN_PARSERS:
+            if column not in COLUMN_PARSERS:
+                raise ValueError(f"Tidak ada parser untuk kolom '{column}'.")
+            pipeline = pipeline._add(Step(
+                'parse', f'parse_{column}', COLUMN_PARSERS[column],
+                frozenset([column]), frozenset([column]), {'column': column}
+            ))
+        return pipeline
+
+    def dedupe(self):
+        """Menghapus duplikat 'title' (deleteDuplicate)."""
+        return self.filter(deleteDuplicate, reads=['title'])
+
+    def convert_currency(self, exchangeRate=16000):
+        """Mengalikan harga dengan kurs (convertPriceToRupiah)."""
+        return self._add(Step(
+            'convert', 'convert_currency', convertPriceToRupiah,
+            frozenset(['price']), frozenset(['price']), {'exchangeRate': exchangeRate}
+        ))
+
+    def timestamp(self, timestamp=None):
+        """Menambahkan kolom 'scrape_timestamp' (addScrapeTimestamp)."""
+        return self._add(Step(
+            'timestamp', 'add_timestamp', addScrapeTimestamp,
+            frozenset(), frozenset(['scrape_timestamp']), {'timestamp': timestamp}
+        ))
+
+    def select(self, columns):
+        """Memilih kolom output; kolom lain beserta langkah parsing-nya dipangkas."""
+        return self._add(Step('select', 'select', None, frozenset(columns), frozenset(), {'columns': list(columns)}))
+
+    # Optimizer ------------------------------------------------------------
+
+    def optimize(self):
+        """Mengembalikan pipeline baru dengan rencana yang sudah dioptimasi."""
+        steps = _merge_conversions(self.steps)
+        steps = _prune_columns(steps)
+        steps = _push_down_filters(steps)
+        return TransformPipeline(steps)
+
+    def explain(self, optimize=True):
+        """Rencana eksekusi dalam bentuk teks, satu langkah per baris."""
+        steps = self.optimize().steps if optimize else self.steps
+        lines = []
+        for number, step in enumerate(steps, 1):
+            detail = ', '.join(f'{key}={value}' for key, value in step.params.items())
+            lines.append(f"{number}. {step.kind:<9} {step.name}" + (f" ({detail})" if detail else ''))
+        return '\n'.join(lines)
+
+    # Eksekusi ---------------------------------------------------------------
+
+    def execute(self, df, optimize=True):
+        """
+        Menjalankan rencana atas satu salinan df (input tidak diubah).
+
+        Catatan: karena filter dipindah sebelum parsing, dtype numerik hasil
+        inferensi (int vs float) ditentukan hanya dari baris yang lolos filter.
+
+        Returns:
+        - pd.DataFrame hasil transformasi, atau DataFrame kosong jika gagal.
+        """
+        try:
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError("Input bukan DataFrame.")
+
+            steps = self.optimize().steps if optimize else self.steps
+            parsed = set()
+
+            if steps and steps[0].kind == 'select':
+                df = df[[col for col in steps[0].params['columns'] if col in df.columns]].copy()
+                steps = steps[1:]
+            else:
+                df = df.copy()
+
+            for step in steps:
+                if step.kind == 'filter':
+                    step.func(df)
+                elif step.kind == 'parse':
+                    column = step.params['column']
+                    df[column] = step.func(df[column])
+                    parsed.add(column)
+                elif step.kind == 'convert':
+                    if 'price' in parsed:
+                        # Harga sudah numerik: cukup satu perkalian, tanpa regex ulang
+                        df['price'] = df['price'] * step.params['exchangeRate']
+                    else:
+                        step.func(df, step.params['exchangeRate'])
+                elif step.kind == 'timestamp':
+                    step.func(df, step.params['timestamp'])
+                elif step.kind == 'select':
+                    df = df[[col for col in step.params['columns'] if col in df.columns]]
+
+            return df
+
+        except TypeError as te:
+            print(f"❌ Tipe input tidak valid: {te}")
+        except Exception as e:
+            print(f"❌ Terjadi kesalahan saat menjalankan pipeline: {e}")
+        return pd.DataFrame()
+
+
+def default_pipeline(exchangeRate=16000, timestamp=None):
+    """Pipeline yang setara dengan urutan pembersihan di main()."""
+    return (
+        TransformPipeline()
+        .filter(deleteUnknownProduct, reads=['title'])
+        .filter(deletePriceUnavailable, reads=['price'], writes=['price'])
+        .parse()
+        .dedupe()
+        .convert_currency(exchangeRate)
+        .timestamp(timestamp)
+    )
+
+
+def _merge_conversions(steps):
+    """Menggabungkan beberapa konversi kurs menjadi satu perkalian."""
+    merged = []
+    conversion_index = None
+    for step in steps:
+        if step.kind == 'convert' and conversion_index is not None:
+            previous = merged[conversion_index]
+            rate = previous.params['exchangeRate'] * step.params['exchangeRate']
+            merged[conversion_index] = previous._replace(params={'exchangeRate': rate})
+            continue
+        if step.kind == 'convert':
+            conversion_index = len(merged)
+        elif 'price' in step.writes or 'price' in step.reads:
+            conversion_index = None  # harga dibaca/diubah di antaranya, jangan digabung
+        merged.append(step)
+    return merged
+
+
+def _prune_columns(steps):
+    """
+    Membuang langkah yang hasilnya tidak dipakai bila ada select(), lalu
+    memproyeksikan kolom yang dibutuhkan di awal agar salinan lebih kecil.
+    """
+    selects = [step for step in steps if step.kind == 'select']
+    if not selects:
+        return steps
+
+    needed = set(selects[-1].reads)
+    kept = []
+    for step in reversed(steps):
+        if step.kind in ('parse', 'convert', 'timestamp') and not (step.writes & needed):
+            continue
+        if step.kind == 'select' and step is not selects[-1]:
+            continue
+        needed |= step.reads
+        kept.append(step)
+    kept.reverse()
+
+    projection = Step('select', 'project', None, frozenset(needed), frozenset(), {'columns': sorted(needed)})
+    return [projection] + kept
+
+
+def _push_down_filters(steps):
+    """
+    Memindahkan filter baris sedini mungkin, melewati langkah parsing /
+    konversi yang tidak menulis kolom yang dibaca filter, sehingga regex
+    hanya berjalan pada baris yang lolos.
+    """
+    steps = list(steps)
+    for index in range(len(steps)):
+        if steps[index].kind != 'filter':
+            continue
+        position = index
+        while position > 0:
+            previous = steps[position - 1]
+            if previous.kind in ('filter', 'select'):
+                break
+            conflict = (previous.writes & (steps[position].reads | steps[position].writes)) or \
+                (steps[position].writes & previous.reads)
+            if conflict and not (previous.kind == 'parse'
+                                 and previous.params['column'] in EQUALITY_PRESERVING_PARSERS
+                                 and not steps[position].writes & previous.writes):
+                break
+            steps[position - 1], steps[position] = steps[position], previous
+            position -= 1
+    return steps
@@ -1,6 +1,61 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+from utils.currency import RateTable, convert_amounts, convertPriceMultiCurrency, parse_price_currency
+from utils.dedup import row_keys
+from utils.metrics import incr
+
+PRICE_SYMBOL_PATTERN = r'[\$,]'
+RATING_PATTERN = r'(\d+\.?\d*)'
+COLORS_PATTERN = r'(\d+)'
+GENDER_CATEGORIES = ('Men', 'Unisex', 'Women')
+GENDER_DTYPE = pd.CategoricalDtype(GENDER_CATEGORIES)
+
+
+def _parse_title(series):
+    return series.astype('string')
+
+
+def _parse_price(series):
+    if pd.api.types.is_string_dtype(series):
+        # Penggantian literal lebih cepat dari regex dengan hasil yang sama
+        series = series.str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+    else:
+        series = series.replace(PRICE_SYMBOL_PATTERN, '', regex=True)
+    return pd.to_numeric(series, errors='coerce')
+
+
+def _parse_rating(series):
+    return pd.to_numeric(series.astype(str).str.extract(RATING_PATTERN, expand=False), errors='coerce')
+
+
+def _parse_colors(series):
+    return pd.to_numeric(series.astype(str).str.extract(COLORS_PATTERN, expand=False), errors='coerce')
+
+
+def _parse_size(series):
+    return series.astype(str).str.replace('Size:', '', regex=False).str.strip().astype('string')
+
+
+def _parse_gender(series):
+    # Kategori tetap agar setiap micro-batch transform_stream memiliki dtype yang
+    # sama dengan jalur batch; label lain ('ERROR', 'N/A') menjadi NaN dan
+    # ditolak aturan validasi gender:not_null.
+    values = series.astype(str).str.replace('Gender:', '', regex=False).str.strip()
+    return values.where(values.isin(GENDER_CATEGORIES)).astype(GENDER_DTYPE)
+
+
+# Parser per kolom yang dipakai transformData dan convertPriceToRupiah
+COLUMN_PARSERS = {
+    'title': _parse_title,
+    'price': _parse_price,
+    'rating': _parse_rating,
+    'colors': _parse_colors,
+    'size': _parse_size,
+    'gender': _parse_gender,
+}
+
 def transform_to_DataFrame(data):
     """Mengubah data menjadi DataFrame dengan error handling."""
     try:
@@ -35,6 +90,7 @@ def deleteUnknownProduct(df):
         original_len = len(df)
         df.drop(df[df['title'].str.strip().str.lower() == 'unknown product'].index, inplace=True)
         removed = original_len - len(df)
+        incr('transform.dropped.unknown_product', removed)
         print(f"✅ {removed} baris dengan title 'Unknown Product' berhasil dihapus.")
 
     except TypeError as te:
@@ -63,6 +119,7 @@ def deletePriceUnavailable(df):
         original_len = len(df)
         df.drop(df[df['price'].str.strip().str.lower() == 'price unavailable'].index, inplace=True)
         removed = original_len - len(df)
+        incr('transform.dropped.price_unavailable', removed)
         print(f"✅ {removed} baris dengan 'Price Unavailable' berhasil dihapus.")
 
     except TypeError as te:
@@ -93,28 +150,8 @@ def transformData(df):
         if missing_columns:
             raise KeyError(f"Kolom yang hilang: {missing_columns}")
 
-        # title
-        df['title'] = df['title'].astype('string')
-
-        # price
-        df['price'] = df['price'].replace('[\$,]', '', regex=True)
-        df['price'] = pd.to_numeric(df['price'], errors='coerce')
-
-        # rating
-        df['rating'] = df['rating'].astype(str).str.extract(r'(\d+\.?\d*)')[0]
-        df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
-
-        # colors
-        df['colors'] = df['colors'].astype(str).str.extract(r'(\d+)')[0]
-        df['colors'] = pd.to_numeric(df['colors'], errors='coerce')
-
-        # size
-        df['size'] = df['size'].astype(str).str.replace('Size:', '', regex=False).str.strip()
-        df['size'] = df['size'].astype('string')
-
-        # gender
-        df['gender'] = df['gender'].astype(str).str.replace('Gender:', '', regex=False).str.strip()
-        df['gender'] = df['gender'].astype('category')
+        for column, parse in COLUMN_PARSERS.items():
+            df[column] = parse(df[column])
 
         print("✅ Transformasi data berhasil dilakukan.")
 
@@ -140,6 +177,7 @@ def deleteDuplicate(df):
         original_len = len(df)
         df.drop_duplicates(subset=['title'], keep='first', inplace=True)
         removed = original_len - len(df)
+        incr('transform.dropped.duplicate', removed)
         print(f"✅ {removed} duplikat berdasarkan 'title' berhasil dihapus.")
 
     except TypeError as te:
@@ -149,6 +187,34 @@ def deleteDuplicate(df):
     except Exception as e:
         print(f"❌ Terjadi kesalahan saat menghapus duplikat: {e}")
 
+def deleteIndexedDuplicate(df, dedup_index, add=True):
+    """
+    Menghapus baris yang kuncinya sudah tercatat di DedupIndex (dari batch atau
+    run sebelumnya) maupun duplikat di dalam df sendiri, lalu mencatat kunci
+    baris yang tersisa jika add=True. Dilengkapi dengan error handling.
+    """
+    try:
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Input bukan DataFrame.")
+
+        missing_columns = [col for col in dedup_index.key_columns if col not in df.columns]
+        if missing_columns:
+            raise KeyError(f"Kolom kunci yang hilang: {missing_columns}")
+
+        new = dedup_index.filter_new(df, add=add)
+        removed = int((~new).sum())
+        if removed:
+            df.drop(df.index[~new], inplace=True)
+        incr('transform.dropped.duplicate', removed)
+        print(f"✅ {removed} duplikat berdasarkan indeks {dedup_index.key_columns} berhasil dihapus.")
+
+    except TypeError as te:
+        print(f"❌ Tipe input tidak valid: {te}")
+    except KeyError as ke:
+        print(f"❌ Kolom tidak ditemukan: {ke}")
+    except Exception as e:
+        print(f"❌ Terjadi kesalahan saat menghapus duplikat: {e}")
+
 def convertPriceToRupiah(df, exchangeRate=16000):
     """
     Mengonversi harga dari dolar ke rupiah berdasarkan nilai tukar yang diberikan.
@@ -173,8 +239,7 @@ def convertPriceToRupiah(df, exchangeRate=16000):
             raise TypeError("exchangeRate harus berupa angka.")
 
         # Bersihkan simbol $ dan konversi ke numerik
-        df['price'] = df['price'].replace('[\$,]', '', regex=True)
-        df['price'] = pd.to_numeric(df['price'], errors='coerce')
+        df['price'] = _parse_price(df['price'])
 
         # Konversi ke rupiah
         df['price'] = df['price'] * exchangeRate
@@ -188,16 +253,17 @@ def convertPriceToRupiah(df, exchangeRate=16000):
         print(f"❌ Terjadi kesalahan saat mengonversi harga: {e}")
 
 
-def addScrapeTimestamp(df):
+def addScrapeTimestamp(df, timestamp=None):
     """
-    Menambahkan kolom 'scrape_timestamp' berisi waktu saat fungsi dijalankan.
+    Menambahkan kolom 'scrape_timestamp' berisi waktu saat fungsi dijalankan,
+    atau 'timestamp' jika diberikan (agar semua batch memakai waktu yang sama).
     Format waktu dalam datetime64[ns]. Dilengkapi dengan error handling.
     """
     try:
         if not isinstance(df, pd.DataFrame):
             raise TypeError("Input bukan DataFrame.")
 
-        timestamp = pd.to_datetime(datetime.now())
+        timestamp = pd.to_datetime(timestamp if timestamp is not None else datetime.now())
         df['scrape_timestamp'] = timestamp
         df['scrape_timestamp'] = df['scrape_timestamp'].astype('datetime64[ns]')
         
@@ -207,3 +273,174 @@ def addScrapeTimestamp(df):
         print(f"❌ Tipe input tidak valid: {te}")
     except Exception as e:
         print(f"❌ Terjadi kesalahan saat menambahkan timestamp: {e}")
+
+
+def _is_rate_table(exchangeRate):
+    return isinstance(exchangeRate, (RateTable, dict))
+
+
+def cleanDataFrame(df, exchangeRate=16000, timestamp=None):
+    """
+    Menjalankan seluruh tahap pembersihan secara berurutan (inplace):
+    deleteUnknownProduct, deletePriceUnavailable, transformData,
+    deleteDuplicate, convertPriceToRupiah dan addScrapeTimestamp.
+
+    exchangeRate boleh berupa angka (satu kurs untuk semua baris) atau
+    utils.currency.RateTable/dict kurs: mata uang tiap baris dideteksi dari
+    teks price (kolom 'currency' ditambahkan) lewat convertPriceMultiCurrency.
+    """
+    multi_currency = _is_rate_table(exchangeRate)
+    incr('transform.rows_in', len(df))
+    deleteUnknownProduct(df)
+    deletePriceUnavailable(df)
+    if multi_currency:
+        # Simbol mata uang harus dibaca sebelum transformData mem-parse price
+        convertPriceMultiCurrency(df, exchangeRate)
+    transformData(df)
+    deleteDuplicate(df)
+    if not multi_currency:
+        convertPriceToRupiah(df, exchangeRate)
+    addScrapeTimestamp(df, timestamp)
+    incr('transform.rows_out', len(df))
+    return df
+
+
+def memory_footprint(df):
+    """Total memori DataFrame dalam bytes (deep, termasuk isi string)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+NULLABLE_INT_LIMITS = (('Int8', 2**7), ('Int16', 2**15), ('Int32', 2**31), ('Int64', 2**63))
+
+
+def _compact_string_dtype():
+    """String berbasis Arrow jika pyarrow terpasang, selain itu StringDtype biasa."""
+    try:
+        import pyarrow  # noqa: F401
+        return pd.StringDtype('pyarrow')
+    except ImportError:
+        return pd.StringDtype()
+
+
+def convertToCompactSchema(df):
+    """
+    Mengubah DataFrame hasil transformData ke skema ringkas (opsional) untuk
+    frame historis berukuran besar (inplace):
+    - 'title': string berbasis Arrow (jika tersedia)
+    - 'size', 'gender': category
+    - 'colors': integer nullable terkecil yang cukup (Int8/Int16/...)
+    - 'rating': float32
+    - 'price': int64 dalam rupiah utuh (dibulatkan; Int64 nullable jika ada NaN)
+
+    Returns:
+    - dict berisi 'before' dan 'after' (bytes), atau None jika gagal.
+    """
+    try:
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Input bukan DataFrame.")
+
+        required_columns = ['title', 'price', 'rating', 'colors', 'size', 'gender']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            raise KeyError(f"Kolom yang hilang: {missing_columns}")
+
+        before = memory_footprint(df)
+
+        df['title'] = df['title'].astype(_compact_string_dtype())
+        df['size'] = df['size'].astype('category')
+        df['gender'] = df['gender'].astype('category')
+
+        colors = pd.to_numeric(df['colors'], errors='coerce').round()
+        largest = colors.abs().max()
+        df['colors'] = colors.astype(next(
+            dtype for dtype, limit in NULLABLE_INT_LIMITS if pd.isna(largest) or largest < limit
+        ))
+
+        df['rating'] = pd.to_numeric(df['rating'], errors='coerce').astype('float32')
+        price = pd.to_numeric(df['price'], errors='coerce').round()
+        df['price'] = price.astype('Int64' if price.isna().any() else 'int64')
+
+        after = memory_footprint(df)
+        print(f"✅ Skema ringkas diterapkan: {before / 2**20:.2f} MiB → {after / 2**20:.2f} MiB.")
+        return {'before': before, 'after': after}
+
+    except TypeError as te:
+        print(f"❌ Tipe input tidak valid: {te}")
+    except KeyError as ke:
+        print(f"❌ Kolom tidak ditemukan: {ke}")
+    except Exception as e:
+        print(f"❌ Terjadi kesalahan saat menerapkan skema ringkas: {e}")
+    return None
+
+
+def iter_micro_batches(pages, batch_size=500):
+    """
+    Mengelompokkan ulang aliran record per halaman (misal dari iter_scrape_web)
+    menjadi list record berukuran maksimal batch_size.
+    """
+    batch = []
+    for records in pages:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def transform_stream(pages, batch_size=500, exchangeRate=16000, timestamp=None, dedup_index=None):
+    """
+    Versi streaming dari transform_to_DataFrame + cleanDataFrame.
+
+    Setiap micro-batch dibersihkan terpisah sehingga memori tetap konstan.
+    Duplikat 'title' antar batch dihapus dengan himpunan judul yang sudah
+    terlihat, dan index baris melanjutkan batch sebelumnya, sehingga hasil
+    gabungan semua batch sama dengan jalur batch biasa.
+
+    Jika dedup_index (utils.dedup.DedupIndex) diberikan, duplikat dicek
+    terhadap indeks persisten tersebut (kolom kuncinya sendiri) sehingga baris
+    yang sudah dimuat pada run sebelumnya juga dibuang. Indeks tidak diubah di
+    sini: pemanggil mencatat kunci batch dengan dedup_index.add(batch) setelah
+    batch berhasil dimuat (misal load_batches(..., on_loaded=dedup_index.add)),
+    agar produk dari batch yang gagal dimuat tidak dianggap sudah ada pada run
+    berikutnya. Duplikat antar batch dalam run yang sama dicek dengan himpunan
+    kunci run ini.
+
+    Yields:
+    - pd.DataFrame bersih per micro-batch (batch yang habis terfilter dilewati).
+    """
+    timestamp = pd.to_datetime(timestamp if timestamp is not None else datetime.now())
+    seen_titles = set()
+    offset = 0
+
+    for records in iter_micro_batches(pages, batch_size):
+        df = transform_to_DataFrame(records)
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        offset += len(df)
+
+        cleanDataFrame(df, exchangeRate, timestamp)
+
+        if dedup_index is not None:
+            rows = len(df)
+            deleteIndexedDuplicate(df, dedup_index, add=False)
+            keys = row_keys(df, dedup_index.key_columns)
+            duplicated = np.fromiter((key in seen_titles for key in keys), dtype=bool, count=len(df))
+            if duplicated.any():
+                df.drop(df.index[duplicated], inplace=True)
+                incr('transform.dropped.duplicate', int(duplicated.sum()))
+            seen_titles.update(keys[~duplicated])
+            incr('transform.rows_out', len(df) - rows)
+        else:
+            # Duplikat lintas batch: pertahankan kemunculan pertama seperti deleteDuplicate
+            # Lookup per judul di set: Series.isin(set) menyalin seluruh set setiap
+            # batch sehingga biayanya tumbuh kuadratik terhadap jumlah batch
+            duplicated = np.fromiter((title in seen_titles for title in df['title']), dtype=bool, count=len(df))
+            if duplicated.any():
+                df.drop(df.index[duplicated], inplace=True)
+                incr('transform.dropped.duplicate', int(duplicated.sum()))
+                incr('transform.rows_out', -int(duplicated.sum()))
+            seen_titles.update(df['title'])
+
+        if not df.empty:
+            yield df
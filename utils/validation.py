@@ -0,0 +1,216 @@
+"""
+Validasi baris deklaratif dengan evaluasi mask vektor dan output karantina.
+
+Aturan (Rule) didefinisikan sekali, lalu Validator mengevaluasi semuanya
+sebagai mask boolean numpy dalam satu pass atas DataFrame bersih. Baris yang
+gagal minimal satu aturan dipisahkan ke DataFrame karantina beserta kolom
+alasan (nama aturan yang gagal, dipisah '; '), sehingga kartu yang gagal
+diekstrak ('ERROR' -> NaN) atau nilai di luar rentang tidak lolos diam-diam.
+
+Jenis aturan:
+- not_null : nilai tidak boleh NaN/None.
+- range    : nilai numerik di dalam [min, max] (batas None = tanpa batas).
+- regex    : teks cocok penuh dengan pola.
+- enum     : nilai termasuk himpunan yang diizinkan.
+Aturan range, regex dan enum meloloskan nilai null; gunakan not_null untuk
+mewajibkan nilai, sehingga satu masalah tidak dilaporkan dua kali.
+
+Contoh:
+    validator = Validator(DEFAULT_RULES)
+    result = validator.validate(df_clean)
+    export_to_csv(result.quarantine, 'quarantine.csv', append=True)
+    df_clean = result.valid
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import incr
+
+Rule = namedtuple('Rule', ['name', 'kind', 'column', 'params'])
+ValidationResult = namedtuple('ValidationResult', ['valid', 'quarantine', 'failures'])
+
+RULE_KINDS = ('not_null', 'range', 'regex', 'enum')
+REASON_COLUMN = 'quarantine_reason'
+
+
+def not_null_rule(column, name=None):
+    return Rule(name or f'{column}:not_null', 'not_null', column, {})
+
+
+def range_rule(column, min=None, max=None, name=None):
+    bounds = f"[{'' if min is None else min},{'' if max is None else max}]"
+    return Rule(name or f'{column}:range{bounds}', 'range', column, {'min': min, 'max': max})
+
+
+def regex_rule(column, pattern, name=None):
+    return Rule(name or f'{column}:regex', 'regex', column, {'pattern': pattern})
+
+
+def enum_rule(column, values, name=None):
+    return Rule(name or f'{column}:enum', 'enum', column, {'values': frozenset(values)})
+
+
+_BUILDERS = {
+    'not_null': not_null_rule,
+    'range': range_rule,
+    'regex': regex_rule,
+    'enum': enum_rule,
+}
+
+
+def rules_from_config(specs):
+    """
+    Membuat aturan dari list dict (misal bagian config JSON), contoh:
+    [{"kind": "range", "column": "rating", "min": 0, "max": 5},
+     {"kind": "enum", "column": "gender", "values": ["Men", "Women", "Unisex"]}]
+    """
+    rules = []
+    for spec in specs:
+        spec = dict(spec)
+        kind = spec.pop('kind', None)
+        if kind not in _BUILDERS:
+            raise ValueError(f"Jenis aturan tidak dikenal: {kind}. Pilihan: {list(RULE_KINDS)}")
+        rules.append(_BUILDERS[kind](**spec))
+    return rules
+
+
+# Aturan untuk output cleanDataFrame katalog fashion-studio. Kartu 'ERROR'
+# tertangkap oleh not_null pada price/rating/colors (hasil parse-nya NaN);
+# gender di luar kategori tetap juga menjadi NaN saat parsing (gender:not_null).
+# Pola regex dijaga kompatibel RE2 (tanpa lookahead) agar dieksekusi Arrow,
+# bukan modul re per baris.
+DEFAULT_RULES = [
+    not_null_rule('title'),
+    regex_rule('title', r'\S.*'),
+    not_null_rule('price'),
+    range_rule('price', min=0),
+    not_null_rule('rating'),
+    range_rule('rating', min=0, max=5),
+    not_null_rule('colors'),
+    range_rule('colors', min=1),
+    enum_rule('size', ['XS', 'S', 'M', 'L', 'XL', 'XXL', 'XXXL']),
+    not_null_rule('gender'),
+    enum_rule('gender', ['Men', 'Women', 'Unisex']),
+]
+
+
+def _passes(rule, series):
+    """Mask boolean numpy: True untuk baris yang lolos aturan."""
+    if rule.kind == 'not_null':
+        return series.notna().to_numpy()
+
+    present = series.notna().to_numpy()
+    if rule.kind == 'range':
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        ok = ~np.isnan(values)
+        if rule.params['min'] is not None:
+            ok &= values >= rule.params['min']
+        if rule.params['max'] is not None:
+            ok &= values <= rule.params['max']
+    elif rule.kind == 'regex':
+        ok = series.astype('string').str.fullmatch(rule.params['pattern']).fillna(False).to_numpy(dtype=bool)
+    elif rule.kind == 'enum':
+        ok = series.isin(rule.params['values']).to_numpy()
+    else:
+        raise ValueError(f"Jenis aturan tidak dikenal: {rule.kind}")
+    return ok | ~present
+
+
+class Validator:
+    """
+    Pengevaluasi sekumpulan aturan.
+
+    Parameters:
+    - rules (list of Rule): Misal DEFAULT_RULES atau rules_from_config(...).
+    - reason_column (str): Nama kolom alasan di DataFrame karantina.
+    """
+
+    def __init__(self, rules=None, reason_column=REASON_COLUMN):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.reason_column = reason_column
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Nama aturan harus unik.")
+
+    def evaluate(self, df):
+        """
+        Matriks kegagalan (baris x aturan) bertipe bool; True = baris gagal aturan.
+        Kolom yang tidak ada di df menimbulkan KeyError.
+        """
+        missing = sorted({rule.column for rule in self.rules if rule.column not in df.columns})
+        if missing:
+            raise KeyError(f"Kolom yang hilang untuk validasi: {missing}")
+        failures = np.empty((len(df), len(self.rules)), dtype=bool)
+        for position, rule in enumerate(self.rules):
+            failures[:, position] = ~_passes(rule, df[rule.column])
+        return failures
+
+    def reasons(self, failures):
+        """Teks alasan per baris; dibangun sekali per kombinasi kegagalan unik, bukan per baris."""
+        if not len(failures):
+            return np.array([], dtype=object)
+        patterns, inverse = np.unique(np.packbits(failures, axis=1), axis=0, return_inverse=True)
+        names = np.array([rule.name for rule in self.rules], dtype=object)
+        bits = np.unpackbits(patterns, axis=1, count=len(self.rules)).astype(bool)
+        labels = np.array(['; '.join(names[row]) for row in bits], dtype=object)
+        return labels[inverse.reshape(-1)]
+
+    def validate(self, df):
+        """
+        Memisahkan baris valid dan baris karantina.
+
+        Returns:
+        - ValidationResult(valid, quarantine, failures): 'valid' baris yang lolos
+          semua aturan; 'quarantine' baris yang gagal beserta kolom alasan;
+          'failures' dict nama aturan -> jumlah baris yang gagal.
+        """
+        failures = self.evaluate(df)
+        bad = failures.any(axis=1)
+        counts = dict(zip((rule.name for rule in self.rules), failures.sum(axis=0).tolist()))
+
+        quarantine = df[bad].copy()
+        quarantine[self.reason_column] = self.reasons(failures[bad])
+        valid = df[~bad]
+
+        for name, count in counts.items():
+            if count:
+                incr(f'validation.failed.{name}', count)
+        incr('validation.quarantined', int(bad.sum()))
+        return ValidationResult(valid, quarantine, counts)
+
+
+def validateDataFrame(df, validator=None):
+    """
+    Menjalankan validasi dengan error handling seperti fungsi transform.
+
+    Returns:
+    - (df valid, df karantina); jika validasi gagal dijalankan, tidak ada
+      baris yang dianggap valid: seluruh df masuk karantina dengan alasan
+      'validation_error'.
+    """
+    validator = validator or Validator()
+    try:
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Input bukan DataFrame.")
+
+        result = validator.validate(df)
+        failed = {name: count for name, count in result.failures.items() if count}
+        print(f"✅ Validasi: {len(result.valid)} baris valid, {len(result.quarantine)} baris dikarantina."
+              + (f" Gagal per aturan: {failed}" if failed else ""))
+        return result.valid, result.quarantine
+
+    except TypeError as te:
+        print(f"❌ Tipe input tidak valid: {te}")
+    except KeyError as ke:
+        print(f"❌ Kolom tidak ditemukan: {ke}")
+    except Exception as e:
+        print(f"❌ Terjadi kesalahan saat validasi data: {e}")
+
+    if not isinstance(df, pd.DataFrame):
+        return pd.DataFrame(), pd.DataFrame()
+    quarantine = df.copy()
+    quarantine[validator.reason_column] = 'validation_error'
+    incr('validation.quarantined', len(quarantine))
+    return df.iloc[0:0], quarantine